@@ -1,7 +1,10 @@
 """
 This script starts up our game
 """
-from game_window import main
+import startup_timing
+
+with startup_timing.timed("import game_window"):
+    from game_window import main
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,100 @@
+"""
+Things for the game engine to do, queued up by the engine, the window and
+the entities. GameEngine.process_action_queue looks up the handler for each
+one by its class.
+"""
+
+
+class Action:
+    """ Base class for everything that can go in the action queue. """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        fields = ", ".join(repr(getattr(self, name)) for name in self.__slots__)
+        return f"{self.__class__.__name__}({fields})"
+
+
+class EnemyTurn(Action):
+    """ Let the monsters move. """
+
+    __slots__ = ()
+
+
+class Message(Action):
+    """ Show a message to the player. """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class Dying(Action):
+    """ An entity has run out of hit points. """
+
+    __slots__ = ("target",)
+
+    def __init__(self, target):
+        self.target = target
+
+
+class Dead(Action):
+    """ Turn a dying entity into a body. """
+
+    __slots__ = ("target",)
+
+    def __init__(self, target):
+        self.target = target
+
+
+class Delay(Action):
+    """ Run another action after some time, in seconds. """
+
+    __slots__ = ("time", "action")
+
+    def __init__(self, time: float, action: Action):
+        self.time = time
+        self.action = action
+
+
+class PlaySound(Action):
+    """ Play one of the game engine's sounds, by name. """
+
+    __slots__ = ("sound",)
+
+    def __init__(self, sound: str):
+        self.sound = sound
+
+
+class Pickup(Action):
+    """ Pick up an item where the player is standing. """
+
+    __slots__ = ()
+
+
+class SelectItem(Action):
+    """ Select an inventory slot, numbered from 1. """
+
+    __slots__ = ("number",)
+
+    def __init__(self, number: int):
+        self.number = number
+
+
+class UseItem(Action):
+    """ Use the selected inventory item. """
+
+    __slots__ = ()
+
+
+class DropItem(Action):
+    """ Drop the selected inventory item. """
+
+    __slots__ = ()
+
+
+class UseStairs(Action):
+    """ Go down the stairs the player is standing on. """
+
+    __slots__ = ()
@@ -0,0 +1,190 @@
+"""
+One shared copy of each sound and texture the game uses
+"""
+import os
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+import arcade
+import PIL.Image
+
+from startup_timing import timed
+
+AssetPath = Union[str, Path]
+
+
+# Set DUNGEON_CRAWLER_HEADLESS=1 to run with no sound and blank textures,
+# like on a server with no audio device or display
+HEADLESS = os.environ.get("DUNGEON_CRAWLER_HEADLESS", "") not in ("", "0")
+
+
+class NullSound:
+    """ Sound that plays nothing, for running headless. """
+
+    __slots__ = ()
+
+    def play(self, *args, **kwargs):
+        return None
+
+    def get_length(self) -> float:
+        return 0.0
+
+
+class LazySound:
+    """
+    Stands in for a sound that may not be decoded yet. Can be passed to
+    arcade.play_sound, and decodes the sound then if nothing has already.
+    """
+
+    __slots__ = ("cache", "path")
+
+    def __init__(self, cache: "AssetCache", path: str):
+        self.cache = cache
+        self.path = path
+
+    def play(self, *args, **kwargs):
+        return self.cache.sound(self.path).play(*args, **kwargs)
+
+    def get_length(self) -> float:
+        return self.cache.sound(self.path).get_length()
+
+
+class AssetCache:
+    """
+    Loads each sound and texture once, and hands out the same object every
+    time after that.
+
+    Groups of assets, like a theme's textures, can be loaded ahead of time
+    with preload and let go with unload. Each asset counts the groups holding
+    it, and is dropped when the last one unloads. Anything fetched without
+    being preloaded stays cached until clear.
+
+    Sounds can also be handed out as LazySound placeholders, and decoded on
+    a background thread, so they don't hold up the first frame.
+
+    Headless, nothing is read from disk. Every sound is a NullSound and
+    every texture is the same blank one.
+    """
+
+    def __init__(self, headless: bool = False):
+        self.headless = headless
+        self.null_sound = NullSound()
+        self.null_texture = arcade.Texture("null", PIL.Image.new("RGBA", (1, 1)), hit_box_algorithm="None")
+        self.sounds: Dict[str, arcade.Sound] = {}
+        self.textures: Dict[str, arcade.Texture] = {}
+        self.ref_counts: Dict[str, int] = {}
+        self.groups: Dict[str, List[str]] = {}
+        # Sounds being decoded on the loader thread. Only the main thread
+        # touches the dicts, the loader thread just returns what it decoded.
+        self.pending: Dict[str, Future] = {}
+        self.loader: Optional[ThreadPoolExecutor] = None
+        # Every sound a placeholder has been handed out for
+        self.lazy_sounds: Set[str] = set()
+
+    def sound(self, path: AssetPath) -> arcade.Sound:
+        if self.headless:
+            return self.null_sound
+        key = str(path)
+        sound = self.sounds.get(key)
+        if sound is None:
+            future = self.pending.pop(key, None)
+            if future is not None:
+                # Waits for the loader if it isn't done yet
+                sound = future.result()
+            else:
+                sound = self._load_sound(key)
+            self.sounds[key] = sound
+        return sound
+
+    def lazy_sound(self, path: AssetPath) -> LazySound:
+        """ Placeholder for a sound, that is decoded in the background or on first use. """
+        key = str(path)
+        self.lazy_sounds.add(key)
+        return LazySound(self, key)
+
+    def load_in_background(self, sounds: Iterable[AssetPath]):
+        """ Start decoding sounds on the loader thread. """
+        if self.headless:
+            return
+        for path in sounds:
+            key = str(path)
+            if key in self.sounds or key in self.pending:
+                continue
+            if self.loader is None:
+                self.loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asset_loader")
+            self.pending[key] = self.loader.submit(self._load_sound, key)
+
+    def texture(self, path: AssetPath) -> arcade.Texture:
+        if self.headless:
+            return self.null_texture
+        key = str(path)
+        texture = self.textures.get(key)
+        if texture is None:
+            with timed(f"texture {key}"):
+                texture = arcade.load_texture(key)
+            self.textures[key] = texture
+        return texture
+
+    @staticmethod
+    def _load_sound(key: str) -> arcade.Sound:
+        with timed(f"sound {key}"):
+            return arcade.load_sound(key)
+
+    def preload(self, group: str, sounds: Iterable[AssetPath] = (), textures: Iterable[AssetPath] = ()):
+        """
+        Load a group of assets now, and hold on to them until the group is unloaded.
+
+        :param group: Name to unload them by, like the theme's name
+        :param sounds: Sound files
+        :param textures: Image files
+        """
+        if group in self.groups:
+            raise ValueError(f"Error, asset group {group} is already loaded.")
+
+        keys = []
+        for path in sounds:
+            self.sound(path)
+            keys.append(str(path))
+        for path in textures:
+            self.texture(path)
+            keys.append(str(path))
+
+        for key in keys:
+            self.ref_counts[key] = self.ref_counts.get(key, 0) + 1
+        self.groups[group] = keys
+
+    def unload(self, group: str):
+        """ Let go of a preloaded group. Assets no other group holds are dropped. """
+        if group not in self.groups:
+            raise ValueError(f"Error, asset group {group} is not loaded.")
+
+        for key in self.groups.pop(group):
+            self.ref_counts[key] -= 1
+            if self.ref_counts[key] == 0:
+                del self.ref_counts[key]
+                self.sounds.pop(key, None)
+                if self.textures.pop(key, None) is not None:
+                    self._forget_arcade_texture(key)
+
+    def clear(self):
+        """ Drop everything, preloaded or not. """
+        for key in self.textures:
+            self._forget_arcade_texture(key)
+        self.sounds = {}
+        self.textures = {}
+        self.ref_counts = {}
+        self.groups = {}
+        self.pending = {}
+
+    @staticmethod
+    def _forget_arcade_texture(key: str):
+        # arcade.load_texture keeps its own cache, keyed by the file name
+        texture_cache = getattr(arcade.load_texture, "texture_cache", {})
+        for cache_name in [name for name in texture_cache if name.startswith(key)]:
+            del texture_cache[cache_name]
+
+
+# Shared by the whole game
+assets = AssetCache(headless=HEADLESS)
@@ -0,0 +1,162 @@
+"""
+Pick wall textures from the shape of the floor around each wall.
+"""
+import operator
+from array import array
+
+from themes.current_theme import *
+
+from load_map.dungeon_map import DungeonMap
+
+# Bit for each neighbor in a wall's neighbor mask
+LEFT = 1
+RIGHT = 2
+ABOVE = 4
+BELOW = 8
+NW = 16
+NE = 32
+SW = 64
+SE = 128
+
+
+def get_empty_cells(game_map: DungeonMap) -> bytearray:
+    """
+    1 for each open floor grid location (room or corridor, not a door), in
+    row-major order with a border of 0s all the way around. The border lets
+    the wall picker look at neighbors without checking the map edges.
+    """
+    width = game_map.map_width
+    padded_width = width + 2
+    # Fields are 0 or 1, so "corridor or room, and not door" is (corridor | room) > door
+    open_floor = bytes(
+        map(
+            operator.gt,
+            map(operator.or_, game_map.fields["corridor"], game_map.fields["room"]),
+            game_map.fields["door"],
+        )
+    )
+    empty = bytearray(padded_width)
+    for row in range(game_map.map_height):
+        empty += b"\0" + open_floor[row * width:(row + 1) * width] + b"\0"
+    empty += bytes(padded_width)
+    return empty
+
+
+def choose_wall_texture(mask: int) -> int:
+    """
+    Texture for a wall, given a mask of which of its neighbors are open floor.
+    Only used to fill in WALL_TEXTURE_TABLE.
+    """
+    left_empty = mask & LEFT
+    right_empty = mask & RIGHT
+    above_empty = mask & ABOVE
+    below_empty = mask & BELOW
+    nw_empty = mask & NW
+    ne_empty = mask & NE
+    sw_empty = mask & SW
+    se_empty = mask & SE
+
+    if not left_empty and not right_empty and not above_empty and sw_empty and se_empty and ne_empty and nw_empty:
+        return CENTER_WALL_CROSS
+    elif not below_empty and left_empty and right_empty and sw_empty and se_empty and above_empty:
+        return TOP_CAP
+    elif nw_empty and ne_empty and not above_empty and right_empty and not left_empty and below_empty:
+        return WALL_RIGHT_CORNER
+    elif left_empty and not right_empty and above_empty and below_empty:
+        return LEFT_SHORT_WALL
+    elif below_empty and not right_empty and not left_empty and above_empty:
+        return WALL_SHORT
+    elif not below_empty and above_empty and sw_empty and se_empty and not right_empty and not left_empty:
+        return WALL_SHORT
+    # elif below_empty and not right_empty and left_empty and not above_empty and not ne_empty:
+    #     return BOTTOM_LEFT_CORNER_FILLED
+    elif below_empty and not right_empty and left_empty and not above_empty and ne_empty:
+        return BOTTOM_LEFT_CORNER_HOLLOW
+    elif not right_empty and left_empty and nw_empty and ne_empty and not above_empty and se_empty:
+        return BOTTOM_LEFT_CORNER_HOLLOW
+    elif below_empty and right_empty and not left_empty and above_empty:
+        return WALL_SHORT_RIGHT
+    elif not below_empty and not above_empty and left_empty and right_empty:
+        return WALL_MID_ID
+    elif not below_empty and not above_empty and not left_empty and right_empty and nw_empty and sw_empty:
+        return WALL_RIGHT_CORNER
+    elif left_empty and above_empty and se_empty:
+        return LEFT_SHORT_WALL
+    elif not left_empty and above_empty and right_empty and (below_empty or sw_empty):
+        return WALL_SHORT_RIGHT
+    elif left_empty and right_empty and not above_empty and below_empty and ne_empty and nw_empty:
+        return BOTTOM_END_CAP
+    elif above_empty and not below_empty and not left_empty and not right_empty and not se_empty and not sw_empty:
+        return TOP_WALL
+    elif above_empty and not below_empty and not left_empty and right_empty:
+        return TOP_WALL_RIGHT_CORNER
+    elif above_empty and not below_empty and left_empty and not right_empty:
+        return TOP_WALL_LEFT_CORNER
+    elif not above_empty and not right_empty and left_empty:
+        return LEFT_EDGE_WALL
+    elif not left_empty and not right_empty and nw_empty and not ne_empty and sw_empty:
+        return LEFT_EDGE_WALL
+    elif not above_empty and right_empty and not left_empty:
+        return RIGHT_EDGE_WALL
+    elif not above_empty and ne_empty and not right_empty and se_empty and not left_empty:
+        return RIGHT_EDGE_WALL
+    return WALL_TEXTURE_ID
+
+
+# Wall texture for each of the 256 possible neighbor masks. Texture ids are
+# kept as unsigned shorts, like DungeonMap.wall_textures.
+WALL_TEXTURE_TABLE = array("H", [choose_wall_texture(mask) for mask in range(256)])
+
+# 1 for 0, 0 for anything else, for bytes.translate
+_IS_ZERO = bytes([1]) + bytes(255)
+
+
+def get_neighbor_masks(empty: bytearray, padded_width: int) -> bytes:
+    """
+    Neighbor mask for every position in a padded map from get_empty_cells.
+    Only positions inside the border are meaningful.
+
+    The whole map is handled at once by treating it as one big integer, a
+    byte per position. Shifting that integer by a neighbor's offset lines
+    every position up with its neighbor, and since each byte is 0 or 1,
+    multiplying by the neighbor's bit can't carry into the next byte.
+    """
+    size = len(empty)
+    value = int.from_bytes(empty, "little")
+    masks = 0
+    for offset, bit in (
+        (-1, LEFT),
+        (1, RIGHT),
+        (-padded_width, ABOVE),
+        (padded_width, BELOW),
+        (-padded_width - 1, NW),
+        (-padded_width + 1, NE),
+        (padded_width - 1, SW),
+        (padded_width + 1, SE),
+    ):
+        if offset > 0:
+            masks |= (value >> (8 * offset)) * bit
+        else:
+            masks |= (value << (-8 * offset)) * bit
+    masks &= (1 << (8 * size)) - 1
+    return masks.to_bytes(size, "little")
+
+
+def get_wall_textures(game_map: DungeonMap) -> array:
+    """
+    Wall texture for every grid location, in row-major order. Locations that
+    aren't walls get 0.
+    """
+    empty = get_empty_cells(game_map)
+    width = game_map.map_width
+    padded_width = width + 2
+    masks = get_neighbor_masks(empty, padded_width)
+
+    # Drop the border
+    starts = range(padded_width + 1, (game_map.map_height + 1) * padded_width, padded_width)
+    inner_masks = b"".join(masks[start:start + width] for start in starts)
+    inner_empty = b"".join(empty[start:start + width] for start in starts)
+
+    # Walls are whatever isn't open floor or a door
+    is_wall = bytes(map(operator.or_, inner_empty, game_map.fields["door"])).translate(_IS_ZERO)
+    return array("H", map(operator.mul, map(WALL_TEXTURE_TABLE.__getitem__, inner_masks), is_wall))
@@ -0,0 +1,137 @@
+"""
+Sprite list split into square chunks of the map, so only what the camera
+can see gets drawn.
+"""
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import arcade
+
+from constants import SPRITE_CHUNK_SIZE
+from indexed_sprite_list import IndexedSpriteList
+
+Chunk = Tuple[int, int]
+
+
+class _ChunkSpriteList(IndexedSpriteList):
+    """ One chunk. Hands sprites that walk out of it back to its owner. """
+
+    def __init__(self, owner: "ChunkedSpriteList", key: Chunk, lazy: bool):
+        super().__init__(lazy=lazy)
+        self.owner = owner
+        self.key = key
+
+    def update_cell(self, sprite: arcade.Sprite):
+        if self.owner.chunk_key(sprite.x, sprite.y) == self.key:
+            super().update_cell(sprite)
+        else:
+            self.remove(sprite)
+            self.owner.append(sprite)
+
+
+class ChunkedSpriteList:
+    """
+    Holds sprites in one IndexedSpriteList per chunk of the map. Supports the
+    same grid lookups as IndexedSpriteList, and can draw just the chunks that
+    overlap a rectangle of grid locations.
+    """
+
+    def __init__(self, chunk_size: int = SPRITE_CHUNK_SIZE, lazy: bool = False):
+        """
+        :param chunk_size: Width and height of a chunk, in grid locations
+        :param lazy: Don't create OpenGL resources for the chunks until they
+                     are first drawn
+        """
+        self.chunk_size = chunk_size
+        self.lazy = lazy
+        self.chunks: Dict[Chunk, _ChunkSpriteList] = {}
+
+    def chunk_key(self, x: int, y: int) -> Chunk:
+        return x // self.chunk_size, y // self.chunk_size
+
+    def __len__(self) -> int:
+        return sum(len(chunk) for chunk in self.chunks.values())
+
+    def __iter__(self) -> Iterator[arcade.Sprite]:
+        return chain.from_iterable(list(self.chunks.values()))
+
+    def __contains__(self, sprite: arcade.Sprite) -> bool:
+        chunk = self.chunks.get(self.chunk_key(sprite.x, sprite.y))
+        return chunk is not None and sprite in chunk.sprite_slot
+
+    def append(self, sprite: arcade.Sprite):
+        key = self.chunk_key(sprite.x, sprite.y)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = _ChunkSpriteList(self, key, self.lazy)
+            self.chunks[key] = chunk
+        chunk.append(sprite)
+
+    def extend(self, sprites: Iterable[arcade.Sprite]):
+        for sprite in sprites:
+            self.append(sprite)
+
+    def remove(self, sprite: arcade.Sprite):
+        for sprite_list in sprite.sprite_lists:
+            if isinstance(sprite_list, _ChunkSpriteList) and sprite_list.owner is self:
+                sprite_list.remove(sprite)
+                return
+        raise ValueError("Error, sprite is not in this list.")
+
+    def clear(self):
+        for chunk in self.chunks.values():
+            chunk.clear()
+        self.chunks = {}
+
+    def at(self, x: int, y: int) -> List[arcade.Sprite]:
+        """ Sprites at a grid location. """
+        return list(self.iter_at(x, y))
+
+    def iter_at(self, x: int, y: int) -> Iterable[arcade.Sprite]:
+        """
+        Sprites at a grid location, without making a copy. Don't add, remove
+        or move sprites in this list while looping over the result.
+        """
+        chunk = self.chunks.get(self.chunk_key(x, y))
+        if chunk is None:
+            return ()
+        return chunk.iter_at(x, y)
+
+    def chunks_in_rect(self, left: int, bottom: int, right: int, top: int) -> List[_ChunkSpriteList]:
+        """ Chunks that overlap a rectangle of grid locations, edges included. """
+        if left > right or bottom > top:
+            return []
+        left_chunk, bottom_chunk = self.chunk_key(left, bottom)
+        right_chunk, top_chunk = self.chunk_key(right, top)
+        result = []
+        for chunk_x in range(left_chunk, right_chunk + 1):
+            for chunk_y in range(bottom_chunk, top_chunk + 1):
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if chunk is not None:
+                    result.append(chunk)
+        return result
+
+    def in_rect(self, left: int, bottom: int, right: int, top: int) -> List[arcade.Sprite]:
+        """ Sprites inside a rectangle of grid locations, edges included. """
+        result = []
+        for chunk in self.chunks_in_rect(left, bottom, right, top):
+            result.extend(chunk.in_rect(left, bottom, right, top))
+        return result
+
+    def in_radius(self, x: int, y: int, radius: float) -> List[arcade.Sprite]:
+        """ Sprites within a distance of a grid location. """
+        reach = int(radius)
+        result = []
+        for chunk in self.chunks_in_rect(x - reach, y - reach, x + reach, y + reach):
+            result.extend(chunk.in_radius(x, y, radius))
+        return result
+
+    def draw(self, **kwargs):
+        """ Draw every chunk. Takes the same arguments as SpriteList.draw. """
+        for chunk in self.chunks.values():
+            chunk.draw(**kwargs)
+
+    def draw_in_rect(self, left: int, bottom: int, right: int, top: int, **kwargs):
+        """ Draw only the chunks that overlap a rectangle of grid locations. """
+        for chunk in self.chunks_in_rect(left, bottom, right, top):
+            chunk.draw(**kwargs)
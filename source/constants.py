@@ -12,6 +12,38 @@ SCREEN_WIDTH = int(SPRITE_WIDTH * MAP_WIDTH * SPRITE_SCALE)
 SCREEN_HEIGHT = int(SPRITE_HEIGHT * MAP_HEIGHT * SPRITE_SCALE + STATUS_PANEL_HEIGHT) + 20
 
 FOV_RADIUS = 10
+# Either "shadowcasting" or "raycasting"
+FOV_ALGORITHM = "shadowcasting"
+
+# How many grid locations A* may expand before giving up on a path
+ASTAR_NODE_BUDGET = 2000
+# How many steps out from the player monsters share one distance map
+FLOW_FIELD_RANGE = 3 * FOV_RADIUS
+# Most grid locations in one corridor region of the room graph. Keeps each
+# hop A* fills in between entrances short, however long the corridor.
+CORRIDOR_REGION_SIZE = 24
+
+# Width and height, in grid locations, of each separately drawn part of the map
+SPRITE_CHUNK_SIZE = 16
+
+# Only create terrain sprites once the player has seen them. Saves time and
+# memory on big levels, but unexplored parts of the map are not drawn.
+LAZY_TERRAIN_SPRITES = False
+
+# Load the next dungeon level in the background while this one is played
+PREFETCH_NEXT_LEVEL = True
+
+# Decode sounds on a background thread at start-up, instead of the first
+# time each one plays
+BACKGROUND_SOUND_LOADING = True
+
+# Print how long start-up took, step by step, once the first frame is drawn
+STARTUP_REPORT = False
+
+# File to record the player's inputs to, for replaying with simulate.py,
+# or None to not record
+RECORD_REPLAY = None
+
 DEATH_DELAY = 0.5
 
 REPEAT_MOVEMENT_DELAY = 0.25
@@ -1,6 +1,5 @@
-from typing import List
-import random
-import arcade
+from typing import Iterable, List, Optional, Tuple, Union
+from random import Random
 
 from constants import *
 from themes.current_theme import *
@@ -10,193 +9,167 @@ from entities.lightning_scroll import LightningScroll
 from entities.fireball_scroll import FireballScroll
 from entities.potion import Potion
 from entities.stairs import Stairs
+from entities.tile import Door
+from entities.tile import Floor
+from entities.tile import Tile
+from entities.tile import Wall
 from entities.creature_factory import get_random_monster_by_challenge
 from entities.creature_factory import make_monster_sprite
 from load_map.dungeon_map import DungeonMap
-
-
-def dungeon_map_to_sprites(game_map: DungeonMap) -> arcade.SpriteList:
-    """ Take a grid of numbers and convert to sprites. """
-    sprite_list = arcade.SpriteList(use_spatial_hash=True, spatial_hash_cell_size=16)
-
-    # Take the tiles and make sprites out of them
-    for row in range(game_map.map_height):
-        for column in range(game_map.map_width):
-            sprite = None
-            reversed_row = game_map.map_height - row
-            #
-            # if reversed_row == 13 and column == 34:
-            #     print("Ping")
-
-            is_empty = False
-            tile = game_map.tiles[row][column]
-            if (tile.corridor or tile.room) and not tile.door:
-                is_empty = True
-
-            left_empty = False
-            if column > 0:
-                tile = game_map.tiles[row][column - 1]
-                if (tile.corridor or tile.room) and not tile.door:
-                    left_empty = True
-
-            right_empty = False
-            if column < game_map.map_width - 1:
-                tile = game_map.tiles[row][column + 1]
-                if (tile.corridor or tile.room) and not tile.door:
-                    right_empty = True
-
-            below_empty = False
-            if row < game_map.map_height - 1:
-                tile = game_map.tiles[row + 1][column]
-                if (tile.corridor or tile.room) and not tile.door:
-                    below_empty = True
-
-            above_empty = False
-            if row > 0:
-                tile = game_map.tiles[row - 1][column]
-                if (tile.corridor or tile.room) and not tile.door:
-                    above_empty = True
-
-            nw_empty = False
-            if row > 0 and column > 0:
-                tile = game_map.tiles[row - 1][column - 1]
-                if (tile.corridor or tile.room) and not tile.door:
-                    nw_empty = True
-
-            ne_empty = False
-            if row > 0 and column < game_map.map_width - 1:
-                tile = game_map.tiles[row - 1][column + 1]
-                if (tile.corridor or tile.room) and not tile.door:
-                    ne_empty = True
-
-            sw_empty = False
-            if row < game_map.map_height - 1 and column > 0:
-                tile = game_map.tiles[row + 1][column - 1]
-                if (tile.corridor or tile.room) and not tile.door:
-                    sw_empty = True
-
-            se_empty = False
-            if row < game_map.map_height - 1 and column < game_map.map_width - 1:
-                tile = game_map.tiles[row + 1][column + 1]
-                if (tile.corridor or tile.room) and not tile.door:
-                    se_empty = True
-
-            if reversed_row == 13 and column == 34:
-                print()
-                print(nw_empty, above_empty, ne_empty)
-                print(left_empty, is_empty, right_empty)
-                print(sw_empty, below_empty, se_empty)
-
-            # if reversed_row == 13 and column == 34:
-            #     print("Ping")
-            #     texture_id = 2
-            #     sprite = Entity(row=reversed_row, column=column, texture_id=texture_id, color=colors['transparent'])
-            #     sprite.block_sight = True
-            #     sprite.blocks = False
-            #     sprite.visible_color = colors["light_wall"]
-            #     sprite.not_visible_color = colors["dark_wall"]
-            if game_map.tiles[row][column].door:
-                texture_id = DOOR_NS_CLOSED
-                sprite = Entity(row=reversed_row, column=column, texture_id=texture_id, color=colors['transparent'])
-                sprite.name = "Door NS Closed"
-                sprite.block_sight = True
-                sprite.blocks = False
-                sprite.visible_color = colors["light_wall"]
-                sprite.not_visible_color = colors["dark_wall"]
-            elif not is_empty:
-                texture_id = WALL_TEXTURE_ID
-
-                if not left_empty and not right_empty and not above_empty and sw_empty and se_empty and ne_empty and nw_empty:
-                    texture_id = CENTER_WALL_CROSS
-                elif not below_empty and left_empty and right_empty and sw_empty and se_empty and above_empty:
-                    texture_id = TOP_CAP
-                elif nw_empty and ne_empty and not above_empty and right_empty and not left_empty and below_empty:
-                    texture_id = WALL_RIGHT_CORNER
-                elif left_empty and not right_empty and above_empty and below_empty:
-                    texture_id = LEFT_SHORT_WALL
-                elif below_empty and not right_empty and not left_empty and above_empty:
-                    texture_id = WALL_SHORT
-                elif not below_empty and above_empty and sw_empty and se_empty and not right_empty and not left_empty:
-                    texture_id = WALL_SHORT
-                # elif below_empty and not right_empty and left_empty and not above_empty and not ne_empty:
-                #     texture_id = BOTTOM_LEFT_CORNER_FILLED
-                elif below_empty and not right_empty and left_empty and not above_empty and ne_empty:
-                    texture_id = BOTTOM_LEFT_CORNER_HOLLOW
-                elif not right_empty and left_empty and nw_empty and ne_empty and not above_empty and se_empty:
-                    texture_id = BOTTOM_LEFT_CORNER_HOLLOW
-                elif below_empty and right_empty and not left_empty and above_empty:
-                    texture_id = WALL_SHORT_RIGHT
-                elif not below_empty and not above_empty and left_empty and right_empty:
-                    texture_id = WALL_MID_ID
-                elif not below_empty and not above_empty and not left_empty and right_empty and nw_empty and sw_empty:
-                    texture_id = WALL_RIGHT_CORNER
-                elif left_empty and above_empty and se_empty:
-                    texture_id = LEFT_SHORT_WALL
-                elif not left_empty and above_empty and right_empty and (below_empty or sw_empty):
-                    texture_id = WALL_SHORT_RIGHT
-                elif left_empty and right_empty and not above_empty and below_empty and ne_empty and nw_empty:
-                    texture_id = BOTTOM_END_CAP
-                elif above_empty and not below_empty and not left_empty and not right_empty and not se_empty and not sw_empty:
-                    texture_id = TOP_WALL
-                elif above_empty and not below_empty and not left_empty and right_empty:
-                    texture_id = TOP_WALL_RIGHT_CORNER
-                elif above_empty and not below_empty and left_empty and not right_empty:
-                    texture_id = TOP_WALL_LEFT_CORNER
-                elif not above_empty and not right_empty and left_empty:
-                    texture_id = LEFT_EDGE_WALL
-                elif not left_empty and not right_empty and nw_empty and not ne_empty and sw_empty:
-                    texture_id = LEFT_EDGE_WALL
-                elif not above_empty and right_empty and not left_empty:
-                    texture_id = RIGHT_EDGE_WALL
-                elif not above_empty and ne_empty and not right_empty and se_empty and not left_empty:
-                    texture_id = RIGHT_EDGE_WALL
-
-                sprite = Entity(row=reversed_row, column=column, texture_id=texture_id, color=colors['transparent'])
-                sprite.name = "Wall"
-                sprite.block_sight = True
-                sprite.blocks = True
-                sprite.visible_color = colors["light_wall"]
-                sprite.not_visible_color = colors["dark_wall"]
-            elif game_map.tiles[row][column].corridor or game_map.tiles[row][column].room:
-                texture_id = FLOOR_TEXTURE_ID
-                if not above_empty:
-                    if random.randrange(10) == 0:
-                        texture_id = SHADOW_VARIATION
-                    else:
-                        texture_id = FLOOR_SHADOWED_ID
-                elif random.randrange(15) == 0:
-                    texture_id = FLOOR_VARIATION_1
-                elif random.randrange(35) == 0:
-                    texture_id = FLOOR_VARIATION_2
-                sprite = Entity(row=reversed_row, column=column, texture_id=texture_id, color=colors['transparent'])
-                sprite.name = "Ground"
-                sprite.block_sight = False
-                sprite.visible_color = colors["light_ground"]
-                sprite.not_visible_color = colors["dark_ground"]
-            elif game_map.tiles[row][column].stair_down:
-                sprite = Stairs(row=reversed_row, column=column, texture_id=STAIRS_DOWN_TEXTURE_ID, color=colors['transparent'])
-                sprite.name = "Stairs Down"
-                sprite.block_sight = False
-                sprite.visible_color = colors["light_ground"]
-                sprite.not_visible_color = colors["dark_ground"]
-            # elif game_map.tiles[row][column] == TILE.HEALING_POTION:
-            #     sprite = Potion(column, row)
-            # elif game_map.tiles[row][column] == TILE.LIGHTNING_SCROLL:
-            #     sprite = LightningScroll(column, row)
-            # elif game_map.tiles[row][column] == TILE.FIREBALL_SCROLL:
-            #     sprite = FireballScroll(column, row)
-            # elif game_map.tiles[row][column]:
-            #     raise ValueError(f"Unknown number in map: {game_map[column][row]}")
-
-            if sprite:
-                sprite_list.append(sprite)
-
+from level_grid import LevelGrid
+from indexed_sprite_list import IndexedSpriteList
+from chunked_sprite_list import ChunkedSpriteList
+from autotile import get_empty_cells
+from autotile import get_wall_textures
+from random_streams import rng
+
+
+class TerrainFactory:
+    """
+    Makes the terrain sprite, and works out the terrain's grid flags, for any
+    grid location of a DungeonMap. Lets a level create terrain sprites only
+    when they are first seen.
+    """
+
+    def __init__(self, game_map: DungeonMap, random: Optional[Random] = None):
+        """
+        :param game_map: Map to make terrain for
+        :param random: Where to get the floor variations from. Give each level
+                       its own, so the level looks the same however the
+                       loading threads interleave.
+        """
+        self.game_map = game_map
+        self.random = random if random is not None else rng.stream("terrain")
+        self.empty = get_empty_cells(game_map)
+        self.padded_width = game_map.map_width + 2
+        # Levels loaded from the cache already know their wall textures
+        self.wall_textures = game_map.wall_textures or get_wall_textures(game_map)
+        # 1 for each grid location that make_sprite has been called for
+        self.made = bytearray(game_map.map_width * game_map.map_height)
+
+    def make_sprite(self, row: int, column: int) -> Optional[Union[Tile, Stairs]]:
+        """ Create the terrain sprite for a row and column of the map, if there is one. """
+        game_map = self.game_map
+        fields = game_map.fields
+        cell_index = game_map.index(row, column)
+        self.made[cell_index] = 1
+        sprite = None
+        reversed_row = game_map.map_height - row
+        #
+        # if reversed_row == 13 and column == 34:
+        #     print("Ping")
+
+        is_empty = self.empty[(row + 1) * self.padded_width + column + 1]
+        above_empty = self.empty[row * self.padded_width + column + 1]
+
+        # if reversed_row == 13 and column == 34:
+        #     print("Ping")
+        #     texture_id = 2
+        #     sprite = Entity(row=reversed_row, column=column, texture_id=texture_id, color=colors['transparent'])
+        #     sprite.block_sight = True
+        #     sprite.blocks = False
+        #     sprite.visible_color = colors["light_wall"]
+        #     sprite.not_visible_color = colors["dark_wall"]
+        if fields["door"][cell_index]:
+            sprite = Door(column, reversed_row, DOOR_NS_CLOSED)
+        elif not is_empty:
+            sprite = Wall(column, reversed_row, self.wall_textures[cell_index])
+        elif fields["corridor"][cell_index] or fields["room"][cell_index]:
+            texture_id = FLOOR_TEXTURE_ID
+            if not above_empty:
+                if self.random.randrange(10) == 0:
+                    texture_id = SHADOW_VARIATION
+                else:
+                    texture_id = FLOOR_SHADOWED_ID
+            elif self.random.randrange(15) == 0:
+                texture_id = FLOOR_VARIATION_1
+            elif self.random.randrange(35) == 0:
+                texture_id = FLOOR_VARIATION_2
+            sprite = Floor(column, reversed_row, texture_id)
+        elif fields["stair_down"][cell_index]:
+            sprite = Stairs(row=reversed_row, column=column, texture_id=STAIRS_DOWN_TEXTURE_ID, color=colors['transparent'])
+            sprite.name = "Stairs Down"
+            sprite.block_sight = False
+            sprite.visible_color = colors["light_ground"]
+            sprite.not_visible_color = colors["dark_ground"]
+        # elif game_map.tiles[row][column] == TILE.HEALING_POTION:
+        #     sprite = Potion(column, row)
+        # elif game_map.tiles[row][column] == TILE.LIGHTNING_SCROLL:
+        #     sprite = LightningScroll(column, row)
+        # elif game_map.tiles[row][column] == TILE.FIREBALL_SCROLL:
+        #     sprite = FireballScroll(column, row)
+        # elif game_map.tiles[row][column]:
+        #     raise ValueError(f"Unknown number in map: {game_map[column][row]}")
+
+        return sprite
+
+    def terrain_flags(self, row: int, column: int) -> int:
+        """ LevelGrid flags for the sprite make_sprite would create here. """
+        fields = self.game_map.fields
+        cell_index = self.game_map.index(row, column)
+        if fields["door"][cell_index]:
+            return LevelGrid.BLOCK_SIGHT | LevelGrid.WALKABLE
+        if not self.empty[(row + 1) * self.padded_width + column + 1]:
+            return LevelGrid.BLOCKS | LevelGrid.BLOCK_SIGHT
+        if fields["corridor"][cell_index] or fields["room"][cell_index] or fields["stair_down"][cell_index]:
+            return LevelGrid.WALKABLE
+        return 0
+
+    def make_grid(self) -> LevelGrid:
+        """
+        Grid with the terrain flags for the whole map, made without creating
+        any sprites. Sized and flipped the same way as the sprites.
+        """
+        game_map = self.game_map
+        grid = LevelGrid(game_map.map_width, game_map.map_height + 1)
+        for row in range(game_map.map_height):
+            for column in range(game_map.map_width):
+                grid.set_terrain(column, game_map.map_height - row, self.terrain_flags(row, column))
+        return grid
+
+    def make_visible_sprites(self, cells: Iterable[Tuple[int, int]], sprite_list: ChunkedSpriteList):
+        """
+        Add the terrain sprites for any of the grid locations that haven't had
+        one made yet.
+        """
+        game_map = self.game_map
+        for x, y in cells:
+            row = game_map.map_height - y
+            if 0 <= row < game_map.map_height and 0 <= x < game_map.map_width:
+                if not self.made[game_map.index(row, x)]:
+                    sprite = self.make_sprite(row, x)
+                    if sprite:
+                        sprite_list.append(sprite)
+
+    def make_all_sprites(self, sprite_list: ChunkedSpriteList):
+        """ Add every terrain sprite that hasn't been made yet. """
+        game_map = self.game_map
+        for row in range(game_map.map_height):
+            for column in range(game_map.map_width):
+                if not self.made[game_map.index(row, column)]:
+                    sprite = self.make_sprite(row, column)
+                    if sprite:
+                        sprite_list.append(sprite)
+
+
+def dungeon_map_to_sprites(game_map: DungeonMap, lazy: bool = False,
+                           random: Optional[Random] = None) -> ChunkedSpriteList:
+    """
+    Take a grid of numbers and convert to sprites.
+
+    :param game_map: Map to convert
+    :param lazy: Don't create OpenGL resources for the list yet. Needed when
+                 called off the main thread.
+    :param random: Where to get the floor variations from
+    """
+    sprite_list = ChunkedSpriteList(lazy=lazy)
+    TerrainFactory(game_map, random).make_all_sprites(sprite_list)
     return sprite_list
 
 
-def creatures_to_sprites(game_map: DungeonMap) -> arcade.SpriteList:
+def creatures_to_sprites(game_map: DungeonMap, lazy: bool = False) -> IndexedSpriteList:
     """ Take a grid of numbers and convert to sprites. """
-    sprite_list = arcade.SpriteList(use_spatial_hash=True, spatial_hash_cell_size=16)
+    sprite_list = IndexedSpriteList(lazy=lazy)
 #
 #     # Take the tiles and make sprites out of them
 #     for y in range(len(game_map[0])):
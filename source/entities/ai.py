@@ -3,8 +3,12 @@ Logic for the monster's turn.
 Basic artificial intelligence for monsters.
 Ok, it isn't real AI, more like a placeholder.
 """
+from actions import Delay, PlaySound
 from entities.astar import astar
-import random
+from entities.flow_field import UNREACHABLE
+from random_streams import rng
+
+_random = rng.stream("sound_delays")
 
 
 class BasicMonster:
@@ -12,9 +16,14 @@ class BasicMonster:
         # The owner is a link-back to the monster
         self.owner = None
 
-    def take_turn(self, target, sprite_lists):
+    def take_turn(self, target, grid, flow_field=None, room_graph=None):
         """
         Run monster's turn
+
+        :param target: Entity to go after
+        :param grid: Flags for the level, used to see what is blocked
+        :param flow_field: Optional shared distance map toward the target
+        :param room_graph: Optional room graph, for planning paths from far away
         """
         results = []
 
@@ -23,24 +32,36 @@ class BasicMonster:
         if monster.is_visible and not monster.is_dead:
             # Do we need to get closer?
             if monster.distance_to(target) >= 2:
-                # Use the A-star algorithm to find a path to the player.
-                result = astar(
-                    sprite_lists, (monster.x, monster.y), (target.x, target.y)
-                )
-                # print(
-                #     f"Path from ({monster.x}, {monster.y}) to ({target.x}, {target.y})",
-                #     result,
-                # )
+                point = None
+                if flow_field is not None and flow_field.distance(monster.x, monster.y) != UNREACHABLE:
+                    # Step down the shared distance map toward the player.
+                    point = flow_field.next_step(monster.x, monster.y)
+                else:
+                    if room_graph is not None:
+                        # Too far for the distance map. Plan the route room by
+                        # room and only fill in the first stretch of it.
+                        result = room_graph.find_path(
+                            grid, (monster.x, monster.y), (target.x, target.y), legs=1
+                        )
+                    else:
+                        # Use the A-star algorithm to find a path to the player.
+                        result = astar(
+                            grid, (monster.x, monster.y), (target.x, target.y)
+                        )
+                    # print(
+                    #     f"Path from ({monster.x}, {monster.y}) to ({target.x}, {target.y})",
+                    #     result,
+                    # )
+                    if result:
+                        point = result[1]
 
                 # If there is a path, move towards the user
-                if result:
-                    monster_delay_sound = random.randrange(20) * 0.01 + 0.05
-                    point = result[1]
+                if point:
+                    monster_delay_sound = _random.randrange(20) * 0.01 + 0.05
                     x, y = point
-                    monster.x = x
-                    monster.y = y
+                    monster.set_cell(x, y)
                     # print(f"Move to ({x}, {y})")
-                    results.append({"delay": {"time": monster_delay_sound, "action": {"play_sound": "monster_walk"}}})
+                    results.append(Delay(monster_delay_sound, PlaySound("monster_walk")))
             elif target.fighter.hp > 0:
                 # We are next to the user, fight them.
                 attack_results = monster.fighter.attack(target)
@@ -1,140 +1,98 @@
 """
 Classic A-star algorithm for path finding.
 """
-
-from constants import *
-from get_blocking_sprites import get_blocking_sprites
-
-
-class Node:
-    """A node class for A* Path-finding"""
-
-    def __init__(self, parent=None, position=None):
-        self.parent = parent
-        self.position = position
-
-        self.g = 0
-        self.h = 0
-        self.f = 0
-
-    def __eq__(self, other):
-        return self.position == other.position
-
-
-def spot_is_blocked(x, y, sprite_lists):
-
-    if x < 0 or y < 0 or x >= MAP_WIDTH or y >= MAP_HEIGHT:
-        return True
-
-    for sprite_list in sprite_lists:
-        if get_blocking_sprites(x, y, sprite_list):
-            return True
-    return False
-
-
-def astar(sprite_lists, start, end):
-    """Returns a list of tuples as a path from the given start to the given end in the given maze"""
-
-    # Create start and end node
-    start_node = Node(None, start)
-    start_node.g = start_node.h = start_node.f = 0
-    end_node = Node(None, end)
-    end_node.g = end_node.h = end_node.f = 0
-
-    # Initialize both open and closed list
-    open_list = []
-    closed_list = []
-
-    # Add the start node
-    open_list.append(start_node)
-
-    # Loop counter used to break out if we work too hard
-    loop_count = 0
-    # Loop until you find the end or we've worked too hard
-    while len(open_list) > 0:
-        loop_count += 1
-        if loop_count > 50:
-            # Ok, this is too hard. Give up.
-            # print("BREAK!")
-            return None
-
-        # Get the current node
-        current_node = open_list[0]
-        current_index = 0
-        for index, item in enumerate(open_list):
-            if item.f < current_node.f:
-                current_node = item
-                current_index = index
-
-        # Pop current off open list, add to closed list
-        open_list.pop(current_index)
-        closed_list.append(current_node)
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+
+from constants import ASTAR_NODE_BUDGET
+from level_grid import LevelGrid
+
+DIAGONAL_COST = math.sqrt(2)
+
+# Adjacent squares, and the cost to step onto them
+NEIGHBORS = [
+    (0, -1, 1),
+    (0, 1, 1),
+    (-1, 0, 1),
+    (1, 0, 1),
+    (-1, -1, DIAGONAL_COST),
+    (-1, 1, DIAGONAL_COST),
+    (1, -1, DIAGONAL_COST),
+    (1, 1, DIAGONAL_COST),
+]
+
+
+def spot_is_blocked(x, y, grid: LevelGrid):
+    return grid.is_blocked(x, y)
+
+
+def octile_distance(start: Tuple[int, int], end: Tuple[int, int]) -> float:
+    """ Distance between two grid locations when moving in eight directions. """
+    dx = abs(start[0] - end[0])
+    dy = abs(start[1] - end[1])
+    return max(dx, dy) + (DIAGONAL_COST - 1) * min(dx, dy)
+
+
+def astar(
+    grid: LevelGrid,
+    start: Tuple[int, int],
+    end: Tuple[int, int],
+    max_nodes: int = ASTAR_NODE_BUDGET,
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    Returns a list of tuples as a path from the given start to the given end,
+    or None if there isn't one.
+
+    :param grid: Flags for the level, used to see what is blocked
+    :param start: Starting grid location
+    :param end: Grid location to get to
+    :param max_nodes: Give up after expanding this many grid locations
+    """
+    g_score: Dict[Tuple[int, int], float] = {start: 0}
+    parents: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
+    closed = set()
+
+    # Entries are (f, h, position), so ties go to whichever is closer to the end
+    start_h = octile_distance(start, end)
+    open_heap = [(start_h, start_h, start)]
+
+    while open_heap:
+        _, _, current = heapq.heappop(open_heap)
+        if current in closed:
+            # Stale entry, we already found a cheaper way here
+            continue
 
         # Found the goal
-        if current_node == end_node:
+        if current == end:
             path = []
-            current = current_node
             while current is not None:
-                path.append(current.position)
-                current = current.parent
+                path.append(current)
+                current = parents[current]
             return path[::-1]  # Return reversed path
 
-        # Generate children
-        children = []
-        for new_position in [
-            (0, -1),
-            (0, 1),
-            (-1, 0),
-            (1, 0),
-            (-1, -1),
-            (-1, 1),
-            (1, -1),
-            (1, 1),
-        ]:  # Adjacent squares
-
-            # Get node position
-            node_position = (
-                current_node.position[0] + new_position[0],
-                current_node.position[1] + new_position[1],
-            )
-
-            # Make sure within range
-            # if node_position[0] > (len(maze) - 1)
-            #   or node_position[0] < 0
-            #   or node_position[1] > (len(maze[len(maze)-1]) -1)
-            #   or node_position[1] < 0:
-            #     continue
-
-            # Make sure walkable terrain
+        closed.add(current)
+        if len(closed) > max_nodes:
+            # Ok, this is too hard. Give up.
+            return None
 
-            if spot_is_blocked(node_position[0], node_position[1], sprite_lists):
+        current_g = g_score[current]
+        for dx, dy, cost in NEIGHBORS:
+            child = (current[0] + dx, current[1] + dy)
+            if child in closed:
                 continue
 
-            # Create new node
-            new_node = Node(current_node, node_position)
-
-            # Append
-            children.append(new_node)
-
-        # Loop through children
-        for child in children:
-
-            # Child is on the closed list
-            for closed_child in closed_list:
-                if child == closed_child:
-                    continue
+            # Make sure walkable terrain
+            if spot_is_blocked(child[0], child[1], grid):
+                continue
 
-            # Create the f, g, and h values
-            child.g = current_node.g + 1
-            child.h = ((child.position[0] - end_node.position[0]) ** 2) + (
-                (child.position[1] - end_node.position[1]) ** 2
-            )
-            child.f = child.g + child.h
+            child_g = current_g + cost
+            if child_g >= g_score.get(child, math.inf):
+                continue
 
-            # Child is already in the open list
-            for open_node in open_list:
-                if child == open_node and child.g > open_node.g:
-                    continue
+            g_score[child] = child_g
+            parents[child] = current
+            child_h = octile_distance(child, end)
+            heapq.heappush(open_heap, (child_g + child_h, child_h, child))
 
-            # Add the child to the open list
-            open_list.append(child)
+    return None
@@ -1,45 +1,96 @@
 from pathlib import Path
-import random
 import csv
+from typing import Dict, List, Optional
 from themes.current_theme import colors
 from entities.entity import Entity
-from arcade import load_texture
+from asset_cache import assets
 from entities.ai import BasicMonster
 from entities.fighter import Fighter
+from entities.fighter import FighterStore
+from random_streams import rng
 
+_random = rng.stream("creatures")
 
-def load_creatures(monsters_path: Path):
+
+class CreatureTemplate:
+    """ One row of creatures.tsv, with the numbers already parsed. """
+
+    __slots__ = ("name", "attack", "defense", "hp", "xp", "challenge", "texture", "weight")
+
+    def __init__(self, row: Dict[str, str]):
+        self.name: str = row['Name']
+        self.attack: int = int(row['Attack'])
+        self.defense: int = int(row['Defense'])
+        self.hp: int = int(row['HP'])
+        self.xp: int = int(row['XP'])
+        self.challenge: int = int(row['Challenge'])
+        self.texture: str = row['Texture']
+        # How likely this creature is, against others of the same challenge
+        self.weight: float = float(row.get('Weight') or 1)
+
+
+class ChallengeBucket:
+    """ The creatures for one challenge level, ready to pick from by weight. """
+
+    def __init__(self):
+        self.templates: List[CreatureTemplate] = []
+        self.cumulative_weights: List[float] = []
+
+    def add(self, template: CreatureTemplate):
+        total = self.cumulative_weights[-1] if self.cumulative_weights else 0.0
+        self.templates.append(template)
+        self.cumulative_weights.append(total + template.weight)
+
+    def choose(self) -> CreatureTemplate:
+        return _random.choices(self.templates, cum_weights=self.cumulative_weights)[0]
+
+
+def load_creatures(monsters_path: Path) -> List[CreatureTemplate]:
     with open(monsters_path) as input_file:
         reader = csv.DictReader(input_file, delimiter='\t')
-        return [creature for creature in reader]
+        return [CreatureTemplate(row) for row in reader]
+
+
+def bucket_by_challenge(templates: List[CreatureTemplate]) -> Dict[int, ChallengeBucket]:
+    buckets: Dict[int, ChallengeBucket] = {}
+    for template in templates:
+        buckets.setdefault(template.challenge, ChallengeBucket()).add(template)
+    return buckets
 
 
 monsters_path = Path(__file__).resolve().parent / "creatures.tsv"
 monsters = load_creatures(monsters_path)
+monsters_by_challenge = bucket_by_challenge(monsters)
 
 
-def get_random_monster_by_challenge(challenge):
-    filtered_monsters = [monster for monster in monsters if int(monster['Challenge']) == challenge]
-    if len(filtered_monsters) == 0:
+def get_random_monster_by_challenge(challenge) -> CreatureTemplate:
+    bucket = monsters_by_challenge.get(challenge)
+    if bucket is None:
         raise ValueError(f"Error, no creatures for challenge level {challenge}.")
-    m1 = random.choice(filtered_monsters)
-    return m1
-
-
-def make_monster_sprite(monster_dict):
-    sprite = Entity()
-    sprite.texture = load_texture(monster_dict['Texture'])
-    sprite.ai = BasicMonster()
-    sprite.ai.owner = sprite
-    sprite.fighter = Fighter()
-    sprite.fighter.owner = sprite
-    sprite.fighter.hp = int(monster_dict['HP'])
-    sprite.fighter.power = int(monster_dict['Attack'])
-    sprite.fighter.defense = int(monster_dict['Defense'])
-    sprite.fighter.xp_reward = int(monster_dict['XP'])
-    sprite.not_visible_color = colors['transparent']
-    sprite.blocks = True
-    sprite.name = monster_dict['Name']
+    return bucket.choose()
+
+
+def make_monster_sprite(template: CreatureTemplate, store: Optional[FighterStore] = None):
+    """
+    Create a monster from its template.
+
+    :param template: What kind of monster
+    :param store: Where to keep its fighter stats, like the level's store
+    """
+    sprite = Entity(
+        name=template.name,
+        blocks=True,
+        not_visible_color=colors['transparent'],
+        ai=BasicMonster(),
+        fighter=Fighter(
+            hp=template.hp,
+            power=template.attack,
+            defense=template.defense,
+            xp_reward=template.xp,
+            store=store,
+        ),
+    )
+    sprite.texture = assets.texture(template.texture)
     return sprite
 
 # m = get_random_monster_by_challenge(1)
@@ -5,12 +5,30 @@ the game
 import math
 from constants import *
 from themes.current_theme import textures
+from indexed_sprite_list import IndexedSpriteList
 from util import char_to_pixel
 
 
 class Entity(arcade.Sprite):
     """ On-screen sprite """
 
+    __slots__ = (
+        "_x",
+        "_y",
+        "_texture_id",
+        "visible_color",
+        "not_visible_color",
+        "name",
+        "blocks",
+        "block_sight",
+        "is_visible",
+        "is_dead",
+        "item",
+        "inventory",
+        "fighter",
+        "ai",
+    )
+
     def __init__(
         self,
         column: int = 0,
@@ -34,8 +52,7 @@ class Entity(arcade.Sprite):
         self._y = 0
         self._texture_id = 0
 
-        self.x = column
-        self.y = row
+        self.set_cell(column, row)
         self.texture_id = texture_id
 
         self.color = color
@@ -85,18 +102,20 @@ class Entity(arcade.Sprite):
 
         return result
 
-    def restore_from_dict(self, result):
+    def restore_from_dict(self, result, fighters=None):
         """
         Fill in the fields for this entity based on a dict. Used in serializing
         the object to disk or over a network.
+
+        :param fighters: FighterStore to keep a restored fighter's stats in,
+                         like the level's store
         """
         from entities.fighter import Fighter
         from entities.ai import BasicMonster
         from entities.item import Item
         from entities.inventory import Inventory
 
-        self.x = result['x']
-        self.y = result['y']
+        self.set_cell(result['x'], result['y'])
         self.visible_color = result['visible_color']
         self.not_visible_color = result['not_visible_color']
         self.color = result['color']
@@ -115,7 +134,7 @@ class Entity(arcade.Sprite):
             self.ai.owner = self
         self.inventory = None
         if 'fighter' in result:
-            self.fighter = Fighter()
+            self.fighter = Fighter(store=fighters)
             self.fighter.owner = self
             self.fighter.restore_from_dict(result['fighter'])
         if 'inventory' in result:
@@ -124,8 +143,7 @@ class Entity(arcade.Sprite):
 
     def move(self, delta_x, delta_y):
         # Move the entity by a given amount
-        self.x += delta_x
-        self.y += delta_y
+        self.set_cell(self._x + delta_x, self._y + delta_y)
 
     def distance_to(self, other):
         """
@@ -151,9 +169,7 @@ class Entity(arcade.Sprite):
 
     @x.setter
     def x(self, value):
-        self._x = value
-        self.center_x, self.center_y = char_to_pixel(self._x, self._y)
-        # self.center_x = self._x * SPRITE_WIDTH * SCALE + SPRITE_WIDTH / 2 * SCALE
+        self.set_cell(value, self._y)
 
     @property
     def y(self):
@@ -161,6 +177,21 @@ class Entity(arcade.Sprite):
 
     @y.setter
     def y(self, value):
-        self._y = value
-        self.center_x, self.center_y = char_to_pixel(self._x, self._y)
-        # self.center_y = self._y * SPRITE_HEIGHT * SCALE + SPRITE_HEIGHT / 2 * SCALE
+        self.set_cell(self._x, value)
+
+    def set_cell(self, x: int, y: int):
+        """
+        Move to a grid location. Use this rather than setting x and y one at a
+        time, so the sprite and any sprite lists are only updated once.
+        """
+        self._x = x
+        self._y = y
+        self.position = char_to_pixel(x, y)
+        self._update_sprite_list_cells()
+
+    def _update_sprite_list_cells(self):
+        """ Let any grid-indexed sprite lists we are in know we moved. """
+        # Copy, as a chunked list may move us to another chunk
+        for sprite_list in list(self.sprite_lists):
+            if isinstance(sprite_list, IndexedSpriteList):
+                sprite_list.update_cell(self)
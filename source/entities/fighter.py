@@ -1,24 +1,167 @@
 """
 Fighter class manages any entity, including the player, that can fight.
 """
-from typing import Optional
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from actions import Delay, Dying, Message, PlaySound
 from entities.entity import Entity
-import random
+from random_streams import rng
+
+_random = rng.stream("sound_delays")
+
+FIGHTER_FIELDS = (
+    "max_hp",
+    "hp",
+    "defense",
+    "power",
+    "xp_reward",
+    "current_xp",
+    "level",
+    "ability_points",
+)
+
+
+class FighterStore:
+    """
+    Stats for many fighters, kept in one typed array per field and indexed
+    by slot. Each Fighter is a view of one slot. A level keeps its monsters
+    in one store, so damage, death checks and snapshots can work on all of
+    them at once instead of object by object.
+    """
+
+    def __init__(self):
+        self.columns: Dict[str, array] = {name: array("l") for name in FIGHTER_FIELDS}
+        self.fighters: List[Optional["Fighter"]] = []
+        self.free_slots: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.fighters) - len(self.free_slots)
+
+    def __iter__(self) -> Iterator["Fighter"]:
+        return (fighter for fighter in self.fighters if fighter is not None)
+
+    def __contains__(self, fighter: "Fighter") -> bool:
+        return fighter.store is self
+
+    def add(self, fighter: "Fighter"):
+        """ Move a fighter's stats into this store, out of the one it was in. """
+        if fighter.store is self:
+            return
+        old_store, old_index = fighter.store, fighter.index
+        self._attach(fighter, [old_store.columns[name][old_index] for name in FIGHTER_FIELDS])
+        old_store._detach(old_index)
+
+    def extend(self, fighters: Iterable["Fighter"]):
+        for fighter in fighters:
+            self.add(fighter)
+
+    def remove(self, fighter: "Fighter"):
+        """ Move a fighter's stats out of this store, into one of its own. """
+        if fighter.store is not self:
+            raise ValueError("Error, fighter is not in this store.")
+        FighterStore().add(fighter)
+
+    def _attach(self, fighter: "Fighter", values: List[int]):
+        if self.free_slots:
+            index = self.free_slots.pop()
+            for name, value in zip(FIGHTER_FIELDS, values):
+                self.columns[name][index] = value
+            self.fighters[index] = fighter
+        else:
+            index = len(self.fighters)
+            for name, value in zip(FIGHTER_FIELDS, values):
+                self.columns[name].append(value)
+            self.fighters.append(fighter)
+        fighter.store = self
+        fighter.index = index
+
+    def _detach(self, index: int):
+        self.fighters[index] = None
+        self.free_slots.append(index)
+
+    def living(self) -> List["Fighter"]:
+        """ Fighters with hit points left, in the order they were added. """
+        hp = self.columns["hp"]
+        return [fighter for index, fighter in enumerate(self.fighters)
+                if fighter is not None and hp[index] > 0]
+
+    def apply_damage(self, damage: Iterable[Tuple["Fighter", int]]) -> list:
+        """
+        Take hit points from several fighters, then check them all for deaths.
+
+        :param damage: (fighter, amount) pairs. A fighter can appear more than once.
+        :returns: A Dying action for each fighter killed
+        """
+        hp = self.columns["hp"]
+        for fighter, amount in damage:
+            if fighter.store is not self:
+                raise ValueError("Error, fighter is not in this store.")
+            hp[fighter.index] -= amount
+        return self.check_deaths()
+
+    def check_deaths(self) -> list:
+        """ Mark fighters that are out of hit points, but not dead yet, as dead. """
+        hp = self.columns["hp"]
+        results = []
+        for index, fighter in enumerate(self.fighters):
+            if fighter is not None and hp[index] <= 0 and not fighter.owner.is_dead:
+                hp[index] = 0
+                fighter.owner.is_dead = True
+                results.append(Dying(fighter.owner))
+        return results
+
+    def snapshot(self) -> Dict[str, array]:
+        """ Copy of every fighter's stats, for restore_snapshot. """
+        return {name: column[:] for name, column in self.columns.items()}
+
+    def restore_snapshot(self, snapshot: Dict[str, array]):
+        """ Put back stats saved by snapshot. The store must have the same slots. """
+        for name, column in self.columns.items():
+            if len(snapshot[name]) != len(column):
+                raise ValueError("Error, snapshot doesn't match this store.")
+            column[:] = snapshot[name]
+
+
+class _Stat:
+    """ Attribute of a Fighter that lives in its store's arrays. """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, fighter, owner=None):
+        if fighter is None:
+            return self
+        return fighter.store.columns[self.name][fighter.index]
+
+    def __set__(self, fighter, value):
+        fighter.store.columns[self.name][fighter.index] = value
 
 
 class Fighter:
     """ Manage fighting player or NPC """
 
-    def __init__(self, hp=0, defense=0, power=0, xp_reward=0, current_xp=0, level=0, ability_points=0):
-        self.max_hp: int = hp
-        self.hp: int = hp
-        self.defense: int = defense
-        self.power: int = power
+    __slots__ = ("store", "index", "owner")
+
+    max_hp = _Stat()
+    hp = _Stat()
+    defense = _Stat()
+    power = _Stat()
+    xp_reward = _Stat()
+    current_xp = _Stat()
+    level = _Stat()
+    ability_points = _Stat()
+
+    def __init__(self, hp=0, defense=0, power=0, xp_reward=0, current_xp=0, level=0, ability_points=0,
+                 store: Optional[FighterStore] = None):
+        """
+        :param store: Where to keep the stats, like the level's store. By
+                      default the fighter gets a store of its own, and can
+                      be moved later with FighterStore.add.
+        """
         self.owner: Optional[Entity] = None
-        self.xp_reward: int = xp_reward
-        self.current_xp: int = current_xp
-        self.level: int = level
-        self.ability_points: int = ability_points
+        if store is None:
+            store = FighterStore()
+        store._attach(self, [hp, hp, defense, power, xp_reward, current_xp, level, ability_points])
 
     def get_dict(self):
         result = {'max_hp': self.max_hp,
@@ -49,7 +192,7 @@ class Fighter:
         if self.hp <= 0:
             self.hp = 0
             self.owner.is_dead = True
-            results.append({"dying": self.owner})
+            results.append(Dying(self.owner))
 
         return results
 
@@ -63,22 +206,18 @@ class Fighter:
 
         # Character will have a level, don't make a noise for the character.
         if self.level == 0:
-            monster_delay_sound = random.randrange(20) * 0.01 + 0.05
-            results.append({"delay": {"time": monster_delay_sound, "action": {"play_sound": "monster_attack"}}})
+            monster_delay_sound = _random.randrange(20) * 0.01 + 0.05
+            results.append(Delay(monster_delay_sound, PlaySound("monster_attack")))
             print("Monster attack queued")
 
         if damage > 0:
             results.append(
-                {
-                    "message": f"{self.owner.name.capitalize()} attacks {target.name} for {damage} hit points."
-                }
+                Message(f"{self.owner.name.capitalize()} attacks {target.name} for {damage} hit points.")
             )
             results.extend(target.fighter.take_damage(damage))
         else:
             results.append(
-                {
-                    "message": f"{self.owner.name.capitalize()} attacks {target.name} but does no damage."
-                }
+                Message(f"{self.owner.name.capitalize()} attacks {target.name} but does no damage.")
             )
 
         print("Returning from attack: ", results)
@@ -1,11 +1,14 @@
 from constants import *
 from themes.current_theme import *
+from actions import EnemyTurn, Message
+from asset_cache import assets
 from entities.item import Item
 from entities.entity import Entity
-from util import char_to_pixel
 
 
 class FireballScroll(Entity):
+    sound = assets.lazy_sound("sounds/explosion2.ogg")
+
     def __init__(self, column: int = 0, row: int = 0):
         self.game_engine = None
 
@@ -18,7 +21,6 @@ class FireballScroll(Entity):
             name="Fireball Scroll",
             item=Item(),
         )
-        self.sound = arcade.load_sound("sounds/explosion2.ogg")
 
 
     def use(self, game_engine: "GameEngine"):
@@ -28,46 +30,39 @@ class FireballScroll(Entity):
         game_engine.grid_select_handlers.append(self.click)
         return None
 
-    def apply_damage(self, grid_x, grid_y, amount, results):
-        pixel_x, pixel_y = char_to_pixel(grid_x, grid_y)
-        sprites = arcade.get_sprites_at_point(
-            (pixel_x, pixel_y), self.game_engine.cur_level.creatures
-        )
+    def add_damage(self, grid_x, grid_y, amount, damage, results):
+        sprites = self.game_engine.cur_level.creatures.at(grid_x, grid_y)
         for sprite in sprites:
             if sprite.fighter and not sprite.is_dead:
-                results.extend(
-                    [
-                        {
-                            "message": f"{sprite.name} was struck by a fireball for {amount} points."
-                        }
-                    ]
-                )
-                result = sprite.fighter.take_damage(amount)
-                if result:
-                    results.extend(result)
+                results.append(Message(f"{sprite.name} was struck by a fireball for {amount} points."))
+                damage.append((sprite.fighter, amount))
 
     def click(self, x, y):
         """
         Process a click with where we should place the fireball
         """
         results = []
-        self.apply_damage(x, y, 10, results)
+        damage = []
+        self.add_damage(x, y, 10, damage, results)
+
+        self.add_damage(x - 1, y - 1, 8, damage, results)
+        self.add_damage(x, y - 1, 8, damage, results)
+        self.add_damage(x + 1, y - 1, 8, damage, results)
 
-        self.apply_damage(x - 1, y - 1, 8, results)
-        self.apply_damage(x, y - 1, 8, results)
-        self.apply_damage(x + 1, y - 1, 8, results)
+        self.add_damage(x - 1, y, 8, damage, results)
+        self.add_damage(x + 1, y, 8, damage, results)
 
-        self.apply_damage(x - 1, y, 8, results)
-        self.apply_damage(x + 1, y, 8, results)
+        self.add_damage(x - 1, y + 1, 8, damage, results)
+        self.add_damage(x, y + 1, 8, damage, results)
+        self.add_damage(x + 1, y + 1, 8, damage, results)
 
-        self.apply_damage(x - 1, y + 1, 8, results)
-        self.apply_damage(x, y + 1, 8, results)
-        self.apply_damage(x + 1, y + 1, 8, results)
+        # Hit everything in the blast at once, then see what died
+        results.extend(self.game_engine.cur_level.fighters.apply_damage(damage))
 
         arcade.play_sound(self.sound)
 
         self.game_engine.player.inventory.remove_item(self)
         self.game_engine.game_state = STATE.NORMAL
 
-        results.extend([{"enemy_turn": True}])
+        results.append(EnemyTurn())
         return results
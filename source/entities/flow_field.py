@@ -0,0 +1,85 @@
+"""
+Distance map ("flow field") toward a single target, shared by every monster.
+
+One breadth-first search from the target gives each walkable grid location
+its number of steps to the target. A monster then only has to step to the
+neighbor with the lowest number, instead of running its own A* search.
+"""
+from array import array
+from collections import deque
+from typing import Optional, Tuple
+
+from constants import FLOW_FIELD_RANGE
+from entities.astar import NEIGHBORS
+from level_grid import LevelGrid
+
+UNREACHABLE = -1
+
+
+class FlowField:
+    """ Steps from every walkable grid location to the target. """
+
+    def __init__(
+        self, grid: LevelGrid, target: Tuple[int, int], max_distance: int = FLOW_FIELD_RANGE
+    ):
+        """
+        :param grid: Flags for the level
+        :param target: Grid location everyone is heading to
+        :param max_distance: Don't search further than this many steps out
+        """
+        self.grid = grid
+        self.target = target
+        self.distances = array("i", [UNREACHABLE]) * (grid.width * grid.height)
+
+        target_x, target_y = target
+        if not grid.in_bounds(target_x, target_y):
+            return
+
+        width = grid.width
+        height = grid.height
+        flags = grid.flags
+        distances = self.distances
+
+        distances[target_y * width + target_x] = 0
+        queue = deque([target])
+        while queue:
+            x, y = queue.popleft()
+            distance = distances[y * width + x] + 1
+            if distance > max_distance:
+                continue
+            for dx, dy, _ in NEIGHBORS:
+                nx = x + dx
+                ny = y + dy
+                if 0 <= nx < width and 0 <= ny < height:
+                    index = ny * width + nx
+                    if distances[index] == UNREACHABLE and flags[index] & LevelGrid.WALKABLE:
+                        distances[index] = distance
+                        queue.append((nx, ny))
+
+    def distance(self, x: int, y: int) -> int:
+        """ Steps from this grid location to the target, or UNREACHABLE. """
+        if self.grid.in_bounds(x, y):
+            return self.distances[y * self.grid.width + x]
+        return UNREACHABLE
+
+    def next_step(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """
+        Return the neighboring grid location that gets closest to the target
+        and isn't occupied, or None if there is no way to get closer.
+        """
+        best_distance = self.distance(x, y)
+        if best_distance == UNREACHABLE:
+            return None
+
+        best = None
+        for dx, dy, _ in NEIGHBORS:
+            nx = x + dx
+            ny = y + dy
+            distance = self.distance(nx, ny)
+            if distance == UNREACHABLE or distance >= best_distance:
+                continue
+            if (nx, ny) != self.target and self.grid.is_blocked(nx, ny):
+                continue
+            best = nx, ny
+            best_distance = distance
+        return best
@@ -1,7 +1,8 @@
 """
 Manage inventory for the character.
 """
-from typing import Optional, List, Dict
+from typing import Optional, List
+from actions import Action, EnemyTurn, Message, PlaySound
 from entities.entity import Entity
 from entities.restore_entity import restore_entity
 
@@ -47,7 +48,7 @@ class Inventory:
                item = restore_entity(item_dict)
                self.items.append(item)
 
-    def add_item(self, item: Entity) -> List[Optional[Dict]]:
+    def add_item(self, item: Entity) -> List[Action]:
         results = []
 
         item_placed = False
@@ -58,19 +59,17 @@ class Inventory:
                 break
 
         if not item_placed:
-            results.append(
-                {"message": "You cannot carry any more, your inventory is full"}
-            )
-            results.append({"play_sound": "error"})
+            results.append(Message("You cannot carry any more, your inventory is full"))
+            results.append(PlaySound("error"))
         else:
-            results.append({"message": f"You pick up the {item.name}!"})
+            results.append(Message(f"You pick up the {item.name}!"))
             if "Potion" in item.name:
-                results.append({"play_sound": "pickup_potion"})
+                results.append(PlaySound("pickup_potion"))
             if "Scroll" in item.name:
-                results.append({"play_sound": "pickup_scroll"})
+                results.append(PlaySound("pickup_scroll"))
 
             item.remove_from_sprite_lists()
-            results.append({"enemy_turn": True})
+            results.append(EnemyTurn())
 
         return results
 
@@ -3,11 +3,15 @@ import math
 from typing import Optional
 from constants import *
 from themes.current_theme import *
+from actions import EnemyTurn, Message
+from asset_cache import assets
 from entities.item import Item
 from entities.entity import Entity
 
 
 class LightningScroll(Entity):
+    sound = assets.lazy_sound("sounds/laser3.ogg")
+
     def __init__(self, column: int = 0, row: int = 0):
         super().__init__(
             column=column,
@@ -18,14 +22,17 @@ class LightningScroll(Entity):
             name="Lightning Scroll",
             item=Item(),
         )
-        self.my_sound = arcade.load_sound("sounds/laser3.ogg")
 
 
     def use(self, game_engine: "GameEngine"):
         # Find the closest enemy
         closest_distance: Optional[float] = None
         closest_entity: Optional[Entity] = None
-        for entity in game_engine.cur_level.creatures:
+        # Anything we can see is inside our field of view
+        nearby = game_engine.cur_level.creatures.in_radius(
+            game_engine.player.x, game_engine.player.y, FOV_RADIUS
+        )
+        for entity in nearby:
             print(f"Entity: {entity.name} {entity.is_visible}")
             if entity.is_visible and entity.fighter and not entity.is_dead:
                 x1 = game_engine.player.x
@@ -39,13 +46,11 @@ class LightningScroll(Entity):
 
         # If we've got a closest enemy, zap them.
         if closest_entity:
-            arcade.play_sound(self.my_sound)
+            arcade.play_sound(self.sound)
             damage = 15
             results = [
-                {"enemy_turn": True},
-                {
-                    "message": f"{closest_entity.name} was struck by lighting for {damage} points."
-                },
+                EnemyTurn(),
+                Message(f"{closest_entity.name} was struck by lighting for {damage} points."),
             ]
             result = closest_entity.fighter.take_damage(damage)
             if result:
@@ -54,4 +59,4 @@ class LightningScroll(Entity):
             game_engine.player.inventory.remove_item(self)
             return results
         else:
-            return [{"message": f"Nothing near-by to cast lightning on."}]
+            return [Message(f"Nothing near-by to cast lightning on.")]
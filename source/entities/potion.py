@@ -1,3 +1,4 @@
+from actions import EnemyTurn, PlaySound
 from entities.entity import Entity
 from themes.current_theme import *
 from entities.item import Item
@@ -21,4 +22,4 @@ class Potion(Entity):
             game_engine.player.fighter.hp = game_engine.player.fighter.max_hp
         game_engine.player.inventory.remove_item(self)
 
-        return [{"enemy_turn": True}, {"play_sound": "heal"}]
+        return [EnemyTurn(), PlaySound("heal")]
@@ -3,9 +3,18 @@ from entities.fireball_scroll import FireballScroll
 from entities.stairs import Stairs
 from entities.lightning_scroll import LightningScroll
 from entities.entity import Entity
+from entities.tile import Door
+from entities.tile import Floor
+from entities.tile import Wall
 
 
-def restore_entity(entity_dict):
+def restore_entity(entity_dict, fighters=None):
+    """
+    Recreate a sprite saved with get_dict.
+
+    :param entity_dict: {class name: get_dict() result}
+    :param fighters: FighterStore for the stats of a restored creature
+    """
     entity_name = list(entity_dict.keys())[0]
 
     if entity_name == 'Entity':
@@ -18,9 +27,19 @@ def restore_entity(entity_dict):
         entity = LightningScroll()
     elif entity_name == 'Stairs':
         entity = Stairs()
+    elif entity_name == 'Wall':
+        entity = Wall()
+    elif entity_name == 'Floor':
+        entity = Floor()
+    elif entity_name == 'Door':
+        entity = Door()
     else:
         raise ValueError(f"Error, don't know how to restore {entity_name}.")
 
-    entity.restore_from_dict(entity_dict[entity_name])
+    if entity_name == 'Entity':
+        # Creatures are saved as plain entities
+        entity.restore_from_dict(entity_dict[entity_name], fighters)
+    else:
+        entity.restore_from_dict(entity_dict[entity_name])
 
     return entity
@@ -0,0 +1,105 @@
+"""
+Lightweight sprites for static terrain
+"""
+from constants import *
+from themes.current_theme import colors
+from themes.current_theme import textures
+from util import char_to_pixel
+
+
+class Tile(arcade.Sprite):
+    """
+    One grid location of walls, floor or doors.
+
+    Terrain never moves, fights or gets picked up, so unlike Entity it has no
+    per-sprite fighter/ai/inventory/item, and its position is set once.
+    Whether it blocks movement or sight is the same for every tile of a kind,
+    so those are class attributes, and the level's grid holds the per-location
+    copy that gameplay code checks.
+    """
+
+    __slots__ = ("_x", "_y", "_texture_id", "is_visible")
+
+    name = None
+    blocks = False
+    block_sight = False
+    visible_color = colors["light_ground"]
+    not_visible_color = colors["dark_ground"]
+
+    # So code looking at any sprite on the level can treat tiles like entities
+    fighter = None
+    ai = None
+    inventory = None
+    item = None
+    is_dead = False
+
+    def __init__(self, column: int = 0, row: int = 0, texture_id: int = 0):
+        super().__init__(scale=SPRITE_SCALE)
+        self._x = column
+        self._y = row
+        self.position = char_to_pixel(column, row)
+        self.texture_id = texture_id
+        self.color = colors["transparent"]
+        self.is_visible = False
+
+    @property
+    def x(self) -> int:
+        return self._x
+
+    @property
+    def y(self) -> int:
+        return self._y
+
+    @property
+    def texture_id(self) -> int:
+        return self._texture_id
+
+    @texture_id.setter
+    def texture_id(self, value: int):
+        self._texture_id = value
+        self.texture = textures[value]
+
+    def get_dict(self):
+        return {
+            'x': self.x,
+            'y': self.y,
+            'texture_id': self.texture_id,
+            'color': self.color,
+            'alpha': self.alpha,
+            'is_visible': self.is_visible,
+        }
+
+    def restore_from_dict(self, result):
+        """ Fill in a tile from get_dict. Call before adding it to any sprite list. """
+        self._x = result['x']
+        self._y = result['y']
+        self.position = char_to_pixel(self._x, self._y)
+        self.texture_id = result['texture_id']
+        self.color = result['color']
+        self.alpha = result['alpha']
+        self.is_visible = result['is_visible']
+
+
+class Wall(Tile):
+    __slots__ = ()
+
+    name = "Wall"
+    blocks = True
+    block_sight = True
+    visible_color = colors["light_wall"]
+    not_visible_color = colors["dark_wall"]
+
+
+class Floor(Tile):
+    __slots__ = ()
+
+    name = "Ground"
+
+
+class Door(Tile):
+    __slots__ = ()
+
+    name = "Door NS Closed"
+    block_sight = True
+    visible_color = colors["light_wall"]
+    not_visible_color = colors["dark_wall"]
@@ -1,18 +1,47 @@
 """
 Define the game engine
 """
-from typing import Optional
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Callable, Dict, List, Optional, Set, Tuple, Type
 
 from constants import *
+from actions import Action
+from actions import Dead
+from actions import Delay
+from actions import DropItem
+from actions import Dying
+from actions import EnemyTurn
+from actions import Message
+from actions import Pickup
+from actions import PlaySound
+from actions import SelectItem
+from actions import UseItem
+from actions import UseStairs
+from asset_cache import assets
 from themes.current_theme import *
 from entities.stairs import Stairs
 from entities.inventory import Inventory
 from entities.entity import Entity
 from entities.fighter import Fighter
+from entities.fighter import FighterStore
+from entities.flow_field import FlowField
 from load_map.game_map import GameMap
+from load_map.room_graph import RoomGraph
 from recalculate_fov import recalculate_fov
-from get_blocking_sprites import get_blocking_sprites
+from recalculate_fov import set_visibility
+from scheduler import ActionScheduler
+from random_streams import rng
+from replay import GRID_CLICK
+from replay import MOVE
+from replay import ReplayRecorder
+from level_grid import LevelGrid
+from indexed_sprite_list import IndexedSpriteList
+from chunked_sprite_list import ChunkedSpriteList
+from get_blocking_sprites import first_blocker
 from dungeon_map_to_sprites import dungeon_map_to_sprites
+from dungeon_map_to_sprites import TerrainFactory
 from dungeon_map_to_sprites import creatures_to_sprites
 from entities.restore_entity import restore_entity
 
@@ -20,10 +49,67 @@ from entities.restore_entity import restore_entity
 class GameLevel:
     def __init__(self):
         """ Initialize level instance. """
-        self.dungeon_sprites: Optional[arcade.SpriteList] = None
-        self.entities: Optional[arcade.SpriteList] = None
-        self.creatures: Optional[arcade.SpriteList] = None
+        self.dungeon_sprites: Optional[ChunkedSpriteList] = None
+        self.entities: Optional[ChunkedSpriteList] = None
+        self.creatures: Optional[IndexedSpriteList] = None
         self.level: int = 0
+        # Grid locations visible as of the last FOV calculation
+        self.visible_cells: Optional[Set[Tuple[int, int]]] = None
+        self.grid: Optional[LevelGrid] = None
+        # Used for long paths across the level. Not available on restored games.
+        self.room_graph: Optional[RoomGraph] = None
+        # Makes terrain sprites as they come into view, if they're made lazily
+        self.terrain_factory: Optional[TerrainFactory] = None
+        # Stats for the level's monsters
+        self.fighters: FighterStore = FighterStore()
+
+    def add_fighters(self):
+        """
+        Move the fighter stats of the level's creatures into the level's store.
+        Only touches stores belonging to this level and its creatures, so it
+        can run on the level loader thread.
+        """
+        self.fighters.extend(sprite.fighter for sprite in self.creatures if sprite.fighter)
+
+    def build_grid(self):
+        """ Create the grid flags from the sprites on this level. """
+        if self.terrain_factory is None:
+            self.grid = LevelGrid.from_sprites(
+                self.dungeon_sprites, list(self.entities) + list(self.creatures)
+            )
+            return
+
+        # Terrain sprites don't exist yet, so take its flags from the map
+        self.grid = self.terrain_factory.make_grid()
+        for sprite in chain(self.entities, self.creatures):
+            self.refresh_cell(sprite.x, sprite.y)
+
+    def make_visible_terrain(self, cells: Set[Tuple[int, int]]):
+        """ Create terrain sprites for grid locations coming into view for the first time. """
+        if self.terrain_factory is not None:
+            self.terrain_factory.make_visible_sprites(cells, self.dungeon_sprites)
+
+    def make_all_terrain(self):
+        """ Create any terrain sprites that haven't been made yet. """
+        if self.terrain_factory is not None:
+            self.terrain_factory.make_all_sprites(self.dungeon_sprites)
+            self.terrain_factory = None
+
+    def sprite_lists(self):
+        """ Every sprite list in the level, for FOV. """
+        return [self.dungeon_sprites, self.entities, self.creatures]
+
+    def refresh_cell(self, x: int, y: int):
+        """
+        Recalculate the grid flags for one location. Call after something there
+        moves, dies, or changes whether it blocks. Terrain changes (like a door
+        opening) need grid.update_cell instead.
+        """
+        if not self.grid.in_bounds(x, y):
+            return
+        self.grid.update_occupants(
+            x, y, chain(self.entities.iter_at(x, y), self.creatures.iter_at(x, y))
+        )
 
 
 class GameEngine:
@@ -46,25 +132,69 @@ class GameEngine:
         self.game_state = STATE.NORMAL
         self.grid_select_handlers = []
 
-        self.walk_sound = arcade.load_sound("sounds/footstep_concrete_002.ogg")
-        self.player_hit_monster_sound = arcade.load_sound("sounds/impactPunch_heavy_004.ogg")
-        self.monster_attack_sound = arcade.load_sound("sounds/impactPunch_heavy_001.ogg")
-        self.get_scroll_sound = arcade.load_sound("sounds/bookFlip2.ogg")
-        self.get_potion_sound = arcade.load_sound("sounds/sinkWater1.ogg")
-        self.level_up_sound = arcade.load_sound("sounds/powerUp1.ogg")
-        self.monster_death = arcade.load_sound("sounds/knifeSlice.ogg")
-        self.monster_walk_sound = arcade.load_sound("sounds/footstep04.ogg")
-        self.pickup_potion_sound = arcade.load_sound("sounds/sinkWater1.ogg")
-        self.pickup_scroll_sound = arcade.load_sound("sounds/bookFlip2.ogg")
-        self.error_sound = arcade.load_sound("sounds/error5.ogg")
-        self.heal_sound = arcade.load_sound("sounds/secret4.ogg")
+        # What to call for each kind of action in the action queue. Each
+        # handler returns any new actions, or None.
+        self.action_handlers: Dict[Type[Action], Callable[[Action], Optional[List[Action]]]] = {
+            EnemyTurn: self.on_enemy_turn,
+            Message: self.on_message,
+            Dying: self.on_dying,
+            Dead: self.on_dead,
+            Delay: self.on_delay,
+            PlaySound: self.on_play_sound,
+            Pickup: self.on_pickup,
+            SelectItem: self.on_select_item,
+            UseItem: self.on_use_item,
+            DropItem: self.on_drop_item,
+            UseStairs: self.on_use_stairs,
+        }
+        # Seconds of play so far, and Delay actions waiting on it
+        self.game_time = 0.0
+        self.scheduler = ActionScheduler()
+
+        # Writes the player's inputs to a replay file, if recording
+        self.recorder: Optional[ReplayRecorder] = None
+
+        # Loads the next level while the current one is played
+        self.level_loader = ThreadPoolExecutor(max_workers=1)
+        self.next_level: Optional[Tuple[int, Future]] = None
+
+        # Placeholders, so the first frame doesn't wait for every sound to decode
+        self.walk_sound = assets.lazy_sound("sounds/footstep_concrete_002.ogg")
+        self.player_hit_monster_sound = assets.lazy_sound("sounds/impactPunch_heavy_004.ogg")
+        self.monster_attack_sound = assets.lazy_sound("sounds/impactPunch_heavy_001.ogg")
+        self.get_scroll_sound = assets.lazy_sound("sounds/bookFlip2.ogg")
+        self.get_potion_sound = assets.lazy_sound("sounds/sinkWater1.ogg")
+        self.level_up_sound = assets.lazy_sound("sounds/powerUp1.ogg")
+        self.monster_death = assets.lazy_sound("sounds/knifeSlice.ogg")
+        self.monster_walk_sound = assets.lazy_sound("sounds/footstep04.ogg")
+        self.pickup_potion_sound = assets.lazy_sound("sounds/sinkWater1.ogg")
+        self.pickup_scroll_sound = assets.lazy_sound("sounds/bookFlip2.ogg")
+        self.error_sound = assets.lazy_sound("sounds/error5.ogg")
+        self.heal_sound = assets.lazy_sound("sounds/secret4.ogg")
+
+        # For PlaySound actions
+        self.sounds = {
+            "monster_walk": self.monster_walk_sound,
+            "monster_attack": self.monster_attack_sound,
+            "pickup_potion": self.pickup_potion_sound,
+            "pickup_scroll": self.pickup_scroll_sound,
+            "heal": self.heal_sound,
+            "error": self.error_sound,
+        }
+        if BACKGROUND_SOUND_LOADING:
+            assets.load_in_background(assets.lazy_sounds)
 
     def setup(self):
         """ Set up the game here. Call this function to restart the game. """
 
         # Set game state
+        # Drop anything still waiting from the last game
+        self.action_queue = []
+        self.scheduler.clear()
+        self.game_time = 0.0
+
         # Create sprite lists
-        self.characters = arcade.SpriteList()
+        self.characters = arcade.SpriteList(lazy=True)
 
         # Create player
         fighter_component = Fighter(hp=30, defense=2, power=5, level=1)
@@ -82,33 +212,96 @@ class GameEngine:
         self.cur_level = self.setup_level(1)
         self.levels.append(self.cur_level)
 
-    def setup_level(self, level_number: int) -> GameLevel:
+    def start_recording(self, filename: str, seed: Optional[int] = None):
         """
+        Record the player's inputs, for replay.play_replay. Restarts the
+        random numbers from a seed, so call this before setup.
 
-        :param level_number:
+        :param filename: Replay file to write
+        :param seed: Master random seed. Picks a new one if None.
         """
-        # --- Load map
+        self.stop_recording()
+        self.recorder = ReplayRecorder(filename, rng.seed(seed))
 
-        level = GameLevel()
+    def stop_recording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
 
-        self.game_map = GameMap(level_number=level_number)
-        self.game_map.make_map(player=self.player, level=level_number)
+    def player_input(self, action: Action):
+        """ Queue an action the player asked for, like picking up an item. """
+        if self.recorder is not None:
+            self.recorder.record_action(self.game_time, action)
+        self.action_queue.append(action)
 
-        level.dungeon_sprites = dungeon_map_to_sprites(self.game_map.dungeon_map)
-        level.entities = dungeon_map_to_sprites(self.game_map.dungeon_map)
-        level.creatures = creatures_to_sprites(self.game_map.dungeon_map)
-        level.level = level_number
+    def setup_level(self, level_number: int) -> GameLevel:
+        """
+        Get a level ready to play, using the one loaded in the background if
+        there is one.
+
+        :param level_number:
+        """
+        if self.next_level and self.next_level[0] == level_number:
+            # Waits for the loader if it isn't done yet
+            level, game_map = self.next_level[1].result()
+        else:
+            level, game_map = self.load_level(level_number)
+        self.next_level = None
+
+        self.game_map = game_map
+        self.game_map.place_player(self.player)
 
         # Set field of view
-        recalculate_fov(
+        level.visible_cells = recalculate_fov(
             self.player.x,
             self.player.y,
             FOV_RADIUS,
-            [level.dungeon_sprites, level.entities, level.creatures],
+            level.sprite_lists(),
+            grid=level.grid,
+            on_enter=level.make_visible_terrain,
         )
 
+        if PREFETCH_NEXT_LEVEL:
+            self.prefetch_level(level_number + 1)
+
         return level
 
+    def load_level(self, level_number: int) -> Tuple[GameLevel, GameMap]:
+        """
+        Load a level's map and build its sprites. Doesn't touch the player or
+        OpenGL, so this can run on the level loader thread. The sprite lists are
+        lazy, and create their OpenGL buffers when first drawn on the main thread.
+
+        :param level_number:
+        """
+        level = GameLevel()
+
+        game_map = GameMap(level_number=level_number)
+        game_map.load_level(level_number)
+
+        # This may run on the level loader thread, so don't share a stream
+        terrain_random = rng.substream("terrain", level_number)
+        if LAZY_TERRAIN_SPRITES:
+            level.dungeon_sprites = ChunkedSpriteList(lazy=True)
+            level.terrain_factory = TerrainFactory(game_map.dungeon_map, terrain_random)
+        else:
+            level.dungeon_sprites = dungeon_map_to_sprites(game_map.dungeon_map, lazy=True, random=terrain_random)
+        level.entities = ChunkedSpriteList(lazy=True)
+        level.creatures = creatures_to_sprites(game_map.dungeon_map, lazy=True)
+        level.level = level_number
+        level.room_graph = game_map.room_graph
+        level.add_fighters()
+        level.build_grid()
+
+        return level, game_map
+
+    def prefetch_level(self, level_number: int):
+        """
+        Start loading a level in the background. If that fails (say, there is
+        no such level) the error comes out of setup_level when it's used.
+        """
+        self.next_level = level_number, self.level_loader.submit(self.load_level, level_number)
+
     def get_dict(self):
         """
         Get a dictionary object for the entire game. Used in serializing
@@ -123,6 +316,8 @@ class GameEngine:
 
         levels_dict = []
         for level in self.levels:
+            # Saved games restore from sprites, so they all need to exist
+            level.make_all_terrain()
 
             dungeon_dict = []
             for sprite in level.dungeon_sprites:
@@ -154,20 +349,20 @@ class GameEngine:
         :param data:
         """
 
+        # A level loading in the background, and actions still waiting,
+        # belong to the game being replaced
+        self.next_level = None
+        self.action_queue = []
+        self.scheduler.clear()
+
         player_dict = data['player']
         self.player.restore_from_dict(player_dict['Entity'])
 
         for level_dict in data['levels']:
             level = GameLevel()
-            level.dungeon_sprites = arcade.SpriteList(
-                use_spatial_hash=True, spatial_hash_cell_size=16
-            )
-            level.entities = arcade.SpriteList(
-                use_spatial_hash=True, spatial_hash_cell_size=16
-            )
-            level.creatures = arcade.SpriteList(
-                use_spatial_hash=True, spatial_hash_cell_size=16
-            )
+            level.dungeon_sprites = ChunkedSpriteList(lazy=True)
+            level.entities = ChunkedSpriteList(lazy=True)
+            level.creatures = IndexedSpriteList(lazy=True)
 
             for entity_dict in level_dict['dungeon']:
                 entity = restore_entity(entity_dict)
@@ -178,15 +373,19 @@ class GameEngine:
                 level.entities.append(entity)
 
             for creature_dict in level_dict['creatures']:
-                creature = restore_entity(creature_dict)
+                creature = restore_entity(creature_dict, level.fighters)
                 level.creatures.append(creature)
 
+            level.add_fighters()
+            level.build_grid()
             self.levels.append(level)
 
         self.cur_level = self.levels[-1]
 
     def grid_click(self, grid_x, grid_y):
         """ Handle a click on the grid """
+        if self.recorder is not None:
+            self.recorder.record(self.game_time, GRID_CLICK, grid_x, grid_y)
 
         # Loop through anyone that has registered a grid-select handler
         for f in self.grid_select_handlers:
@@ -205,54 +404,80 @@ class GameEngine:
         :param cy:
         """
 
+        if self.recorder is not None:
+            self.recorder.record(self.game_time, MOVE, cx, cy)
+
         # See what grid location we'd move to
         nx = self.player.x + cx
         ny = self.player.y + cy
 
         # See if there are walls or blocking entities there
-        blocking_dungeon_sprites = get_blocking_sprites(nx, ny, self.cur_level.dungeon_sprites)
-        blocking_entity_sprites = get_blocking_sprites(nx, ny, self.cur_level.creatures)
-
-        if not blocking_dungeon_sprites and not blocking_entity_sprites:
+        if not self.cur_level.grid.is_blocked(nx, ny):
             # Nothing is blocking us, we can move
-            self.player.x += cx
-            self.player.y += cy
+            self.player.move(cx, cy)
 
             self.walk_sound.play()
 
             # Figure out our field-of-view
-            recalculate_fov(
+            self.cur_level.visible_cells = recalculate_fov(
                 self.player.x,
                 self.player.y,
                 FOV_RADIUS,
                 [self.cur_level.dungeon_sprites, self.cur_level.creatures, self.cur_level.entities],
+                previous_visible=self.cur_level.visible_cells,
+                grid=self.cur_level.grid,
+                on_enter=self.cur_level.make_visible_terrain,
             )
 
             # Let the enemies move
-            results = [{"enemy_turn": True}]
-            self.action_queue.extend(results)
-
-        elif blocking_entity_sprites:
-            # Can't move that way, but there is a monster there.
-            # Attack it.
-            target = blocking_entity_sprites[0]
-            if target.fighter and not target.is_dead:
-                results = self.player.fighter.attack(target)
-                arcade.play_sound(self.player_hit_monster_sound)
-                self.action_queue.extend(results)
-                results = [{"enemy_turn": True}]
-                self.action_queue.extend(results)
+            self.action_queue.append(EnemyTurn())
+
+        else:
+            target = first_blocker(nx, ny, self.cur_level.creatures)
+            if target:
+                # Can't move that way, but there is a monster there.
+                # Attack it.
+                if target.fighter and not target.is_dead:
+                    results = self.player.fighter.attack(target)
+                    arcade.play_sound(self.player_hit_monster_sound)
+                    self.action_queue.extend(results)
+                    self.action_queue.append(EnemyTurn())
 
     def move_enemies(self):
         """ Process enemy movement. """
         full_results = []
-        for creature in self.cur_level.creatures:
+        visible_cells = self.cur_level.visible_cells
+
+        # Every monster is after the player, so share one distance map
+        # between them rather than path-finding for each. Only built once
+        # some monster is actually awake.
+        flow_field = None
+
+        # Dead monsters don't get a turn, so only look at the living ones
+        for fighter in self.cur_level.fighters.living():
+            creature = fighter.owner
             if creature.ai:
+                if flow_field is None and creature.is_visible and not creature.is_dead:
+                    flow_field = FlowField(self.cur_level.grid, (self.player.x, self.player.y))
+
+                old_position = creature.x, creature.y
                 results = creature.ai.take_turn(
                     target=self.player,
-                    sprite_lists=[self.cur_level.dungeon_sprites, self.cur_level.creatures],
+                    grid=self.cur_level.grid,
+                    flow_field=flow_field,
+                    room_graph=self.cur_level.room_graph,
                 )
                 full_results.extend(results)
+
+                new_position = creature.x, creature.y
+                if new_position != old_position:
+                    self.cur_level.refresh_cell(*old_position)
+                    self.cur_level.refresh_cell(*new_position)
+
+                    # FOV only updates grid locations that changed, so keep
+                    # creatures that walked in or out of view in sync here.
+                    if visible_cells is not None:
+                        set_visibility(creature, new_position in visible_cells)
         return full_results
 
     def dying(self, target: Entity) -> list:
@@ -266,38 +491,34 @@ class GameEngine:
         # target.visible_color = colors["dying"]
         target.is_dead = True
         if target is self.player:
-            results = [{"message": "Player has died!"}]
+            results = [Message("Player has died!")]
         else:
             # If a monster dies, set up a message and add a delay
             results = [
-                {"message": f"{target.name} has been killed!"},
-                {"delay": {"time": DEATH_DELAY, "action": {"dead": target}}},
+                Message(f"{target.name} has been killed!"),
+                Delay(DEATH_DELAY, Dead(target)),
             ]
         return results
 
     def use_stairs(self):
         # Get all the entities at this location
-        entities = arcade.get_sprites_at_exact_point(
-            self.player.position, self.cur_level.dungeon_sprites
-        )
+        entities = self.cur_level.dungeon_sprites.at(self.player.x, self.player.y)
         # For each entity
         for entity in entities:
             if isinstance(entity, Stairs):
                 level = self.setup_level(self.cur_level.level + 1)
                 self.cur_level = level
                 self.levels.append(level)
-                return [{"message": "You went down a level."}]
+                return [Message("You went down a level.")]
 
-        return [{"message": "There are no stairs here"}]
+        return [Message("There are no stairs here")]
 
     def pick_up(self):
         """
         Handle a pick-up item entity request.
         """
         # Get all the entities at this location
-        entities = arcade.get_sprites_at_exact_point(
-            self.player.position, self.cur_level.entities
-        )
+        entities = self.cur_level.entities.at(self.player.x, self.player.y)
         print(f"There are {len(entities)} items")
         # For each entity
         for entity in entities:
@@ -323,7 +544,7 @@ class GameEngine:
             if self.player.fighter.current_xp >= xp_to_next_level:
                 self.player.fighter.ability_points += 1
                 self.player.fighter.level += 1
-                self.action_queue.extend([{"message": "Level up!!!"}])
+                self.action_queue.append(Message("Level up!!!"))
                 arcade.play_sound(self.level_up_sound)
 
     def process_action_queue(self, delta_time: float):
@@ -332,94 +553,99 @@ class GameEngine:
 
         :param delta_time:
         """
+        self.game_time += delta_time
+        self.action_queue.extend(self.scheduler.pop_due(self.game_time))
 
         new_action_queue = []
         for action in self.action_queue:
-            if "enemy_turn" in action:
-                new_actions = self.move_enemies()
-                if new_actions:
-                    new_action_queue.extend(new_actions)
-            if "message" in action:
-                print(action["message"])
-                self.messages.append(action["message"])
-            if "dying" in action:
-                target = action["dying"]
-                new_actions = self.dying(target)
-                arcade.play_sound(self.monster_death)
-                if new_actions:
-                    new_action_queue.extend(new_actions)
-            if "dead" in action:
-                target = action["dead"]
-                target.texture_id = DEAD_BODY_TEXTURE_ID
-                target.color = colors["dead_body"]
-                target.visible_color = colors["dead_body"]
-                target.blocks = False
-                if target is not self.player:
-                    self.player.fighter.current_xp += target.fighter.xp_reward
-
-            if "delay" in action:
-                target = action["delay"]
-                target["time"] -= delta_time
-                if target["time"] > 0:
-                    new_action_queue.extend([{"delay": target}])
-                else:
-                    new_action_queue.extend([target["action"]])
-            if "pickup" in action:
-                new_actions = self.pick_up()
-                if new_actions:
-                    new_action_queue.extend(new_actions)
-
-            if "select_item" in action:
-                item_number = action["select_item"]
-                if 1 <= item_number <= self.player.inventory.capacity:
-                    # Fix up for 0 based index
-                    if self.selected_item != item_number - 1:
-                        self.selected_item = item_number - 1
-                        new_action_queue.extend({"enemy_turn": True})
-
-            if "play_sound" in action:
-                target = action["play_sound"]
-                if target == "monster_walk":
-                    arcade.play_sound(self.monster_walk_sound)
-                elif target == "monster_attack":
-                    arcade.play_sound(self.monster_attack_sound)
-                elif target == "pickup_potion":
-                    arcade.play_sound(self.pickup_potion_sound)
-                elif target == "pickup_scroll":
-                    arcade.play_sound(self.pickup_scroll_sound)
-                elif target == "heal":
-                    arcade.play_sound(self.heal_sound)
-                elif target == "error":
-                    arcade.play_sound(self.error_sound)
-                else:
-                    print(f"Warning, unknown sound trigger {target}.")
-
-            if "use_item" in action:
-                item_number = self.selected_item
-                if item_number is not None:
-                    item = self.player.inventory.get_item_number(item_number)
-                    if item:
-                        results = item.use(self)
-                        if results:
-                            new_action_queue.extend(results)
-
-            if "drop_item" in action:
-                item_number = self.selected_item
-                if item_number is not None:
-                    item = self.player.inventory.get_item_number(item_number)
-                    if item:
-                        self.player.inventory.remove_item_number(item_number)
-                        self.entities.append(item)
-                        item.center_x = self.player.center_x
-                        item.center_y = self.player.center_y
-                        new_action_queue.extend(
-                            [{"message": f"You dropped the {item.name}."}]
-                        )
-
-            if "use_stairs" in action:
-                result = self.use_stairs()
-                if result:
-                    new_action_queue.extend(result)
+            handler = self.action_handlers.get(type(action))
+            if handler is None:
+                raise TypeError(f"Error, no handler for action {action}.")
+            new_actions = handler(action)
+            if new_actions:
+                new_action_queue.extend(new_actions)
 
         # Reload the action queue with new items
         self.action_queue = new_action_queue
+
+    def run_until_idle(self, until: Optional[float] = None):
+        """
+        Process actions until there are none left, jumping the game time
+        ahead to each scheduled one rather than waiting for it. For running
+        without a window, where nothing needs to wait for the screen.
+
+        :param until: Stop at this game time, leaving later scheduled actions
+                      waiting. Runs until everything is done if None.
+        """
+        while self.action_queue or self.scheduler:
+            if not self.action_queue:
+                due = self.scheduler.next_due()
+                if until is not None and due > until:
+                    break
+                self.game_time = max(self.game_time, due)
+            self.process_action_queue(0.0)
+            self.check_experience_level()
+        if until is not None:
+            self.game_time = max(self.game_time, until)
+
+    def on_enemy_turn(self, action: EnemyTurn):
+        return self.move_enemies()
+
+    def on_message(self, action: Message):
+        print(action.text)
+        self.messages.append(action.text)
+
+    def on_dying(self, action: Dying):
+        arcade.play_sound(self.monster_death)
+        return self.dying(action.target)
+
+    def on_dead(self, action: Dead):
+        target = action.target
+        target.texture_id = DEAD_BODY_TEXTURE_ID
+        target.color = colors["dead_body"]
+        target.visible_color = colors["dead_body"]
+        target.blocks = False
+        self.cur_level.refresh_cell(target.x, target.y)
+        if target is not self.player:
+            self.player.fighter.current_xp += target.fighter.xp_reward
+
+    def on_delay(self, action: Delay):
+        self.scheduler.schedule(self.game_time + action.time, action.action)
+
+    def on_play_sound(self, action: PlaySound):
+        sound = self.sounds.get(action.sound)
+        if sound is None:
+            print(f"Warning, unknown sound trigger {action.sound}.")
+        else:
+            arcade.play_sound(sound)
+
+    def on_pickup(self, action: Pickup):
+        return self.pick_up()
+
+    def on_select_item(self, action: SelectItem):
+        item_number = action.number
+        if 1 <= item_number <= self.player.inventory.capacity:
+            # Fix up for 0 based index
+            if self.selected_item != item_number - 1:
+                self.selected_item = item_number - 1
+                return [EnemyTurn()]
+
+    def on_use_item(self, action: UseItem):
+        item_number = self.selected_item
+        if item_number is not None:
+            item = self.player.inventory.get_item_number(item_number)
+            if item:
+                return item.use(self)
+
+    def on_drop_item(self, action: DropItem):
+        item_number = self.selected_item
+        if item_number is not None:
+            item = self.player.inventory.get_item_number(item_number)
+            if item:
+                self.player.inventory.remove_item_number(item_number)
+                item.set_cell(self.player.x, self.player.y)
+                self.cur_level.entities.append(item)
+                return [Message(f"You dropped the {item.name}.")]
+
+    def on_use_stairs(self, action: UseStairs):
+        return self.use_stairs()
@@ -8,6 +8,8 @@ import json
 import pyglet.gl as gl
 from pyglet.math import Vec2
 
+import startup_timing
+from actions import DropItem, Message, Pickup, SelectItem, UseItem, UseStairs
 from constants import *
 from entities.entity import Entity
 from status_bar import draw_status_bar
@@ -53,6 +55,8 @@ class MyGame(arcade.Window):
 
         self.mouse_over_text: Optional[str] = None
 
+        self.first_frame_drawn = False
+
         # These are sprites that appear as buttons on the character sheet.
         self.character_sheet_buttons = arcade.SpriteList()
 
@@ -64,6 +68,8 @@ class MyGame(arcade.Window):
     def setup(self):
         """ Set up the game here. Call this function to restart the game. """
 
+        if RECORD_REPLAY:
+            self.game_engine.start_recording(RECORD_REPLAY)
         self.game_engine.setup()
 
         for button_name, y_value in zip(
@@ -219,13 +225,23 @@ class MyGame(arcade.Window):
             arcade.draw_text(message, 300, y, colors["status_panel_text"])
             y -= 20
 
+    def get_visible_grid_rect(self) -> Tuple[int, int, int, int]:
+        """ Left, bottom, right and top grid locations the sprite camera can see. """
+        ax, ay = self.camera_sprites.position
+        left, bottom = pixel_to_char(ax, ay)
+        right, top = pixel_to_char(ax + self.width, ay + self.height)
+        # Pad by one so sprites partly on screen are included
+        return left - 1, bottom - 1, right + 1, top + 1
+
     def draw_sprites_and_status_panel(self):
         # Draw the sprites
         self.scroll_to_player()
         self.camera_sprites.use()
 
-        self.game_engine.cur_level.dungeon_sprites.draw(filter=gl.GL_NEAREST)
-        self.game_engine.cur_level.entities.draw(filter=gl.GL_NEAREST)
+        # Only the parts of the map the camera can see
+        left, bottom, right, top = self.get_visible_grid_rect()
+        self.game_engine.cur_level.dungeon_sprites.draw_in_rect(left, bottom, right, top, filter=gl.GL_NEAREST)
+        self.game_engine.cur_level.entities.draw_in_rect(left, bottom, right, top, filter=gl.GL_NEAREST)
         self.game_engine.cur_level.creatures.draw(filter=gl.GL_NEAREST)
         self.game_engine.characters.draw(filter=gl.GL_NEAREST)
 
@@ -295,6 +311,12 @@ class MyGame(arcade.Window):
         elif self.game_engine.game_state == STATE.CHARACTER_SCREEN:
             self.draw_character_screen()
 
+        if not self.first_frame_drawn:
+            self.first_frame_drawn = True
+            startup_timing.mark("first frame")
+            if STARTUP_REPORT:
+                print(startup_timing.report())
+
     def on_key_press(self, key: int, modifiers: int):
         """
         Manage key-down events
@@ -331,31 +353,31 @@ class MyGame(arcade.Window):
 
         # Item management
         elif key in KEYMAP.PICKUP:
-            self.game_engine.action_queue.extend([{"pickup": True}])
+            self.game_engine.player_input(Pickup())
         elif key in KEYMAP.DROP_ITEM:
-            self.game_engine.action_queue.extend([{"drop_item": True}])
+            self.game_engine.player_input(DropItem())
         elif key in KEYMAP.SELECT_ITEM_1:
-            self.game_engine.action_queue.extend([{"select_item": 1}])
+            self.game_engine.player_input(SelectItem(1))
         elif key in KEYMAP.SELECT_ITEM_2:
-            self.game_engine.action_queue.extend([{"select_item": 2}])
+            self.game_engine.player_input(SelectItem(2))
         elif key in KEYMAP.SELECT_ITEM_3:
-            self.game_engine.action_queue.extend([{"select_item": 3}])
+            self.game_engine.player_input(SelectItem(3))
         elif key in KEYMAP.SELECT_ITEM_4:
-            self.game_engine.action_queue.extend([{"select_item": 4}])
+            self.game_engine.player_input(SelectItem(4))
         elif key in KEYMAP.SELECT_ITEM_5:
-            self.game_engine.action_queue.extend([{"select_item": 5}])
+            self.game_engine.player_input(SelectItem(5))
         elif key in KEYMAP.SELECT_ITEM_6:
-            self.game_engine.action_queue.extend([{"select_item": 6}])
+            self.game_engine.player_input(SelectItem(6))
         elif key in KEYMAP.SELECT_ITEM_7:
-            self.game_engine.action_queue.extend([{"select_item": 7}])
+            self.game_engine.player_input(SelectItem(7))
         elif key in KEYMAP.SELECT_ITEM_8:
-            self.game_engine.action_queue.extend([{"select_item": 8}])
+            self.game_engine.player_input(SelectItem(8))
         elif key in KEYMAP.SELECT_ITEM_9:
-            self.game_engine.action_queue.extend([{"select_item": 9}])
+            self.game_engine.player_input(SelectItem(9))
         elif key in KEYMAP.SELECT_ITEM_0:
-            self.game_engine.action_queue.extend([{"select_item": 0}])
+            self.game_engine.player_input(SelectItem(0))
         elif key in KEYMAP.USE_ITEM:
-            self.game_engine.action_queue.extend([{"use_item": True}])
+            self.game_engine.player_input(UseItem())
 
         # Save/load
         elif key == arcade.key.S:
@@ -364,7 +386,7 @@ class MyGame(arcade.Window):
             self.load()
 
         elif key in KEYMAP.USE_STAIRS:
-            self.game_engine.action_queue.extend([{"use_stairs": True}])
+            self.game_engine.player_input(UseStairs())
 
         self.scroll_to_player()
 
@@ -419,8 +441,7 @@ class MyGame(arcade.Window):
         with open("game_save.json", "w") as write_file:
             json.dump(game_dict, write_file, indent=4, sort_keys=True)
 
-        results = [{"message": "Game has been saved"}]
-        self.game_engine.action_queue.extend(results)
+        self.game_engine.action_queue.append(Message("Game has been saved"))
 
     def load(self):
         """ Load the game from disk. """
@@ -489,6 +510,9 @@ class MyGame(arcade.Window):
 
 def main():
     """ Main method for starting the rogue-like game """
-    window = MyGame(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE)
-    window.setup()
+    startup_timing.mark("modules imported")
+    with startup_timing.timed("window"):
+        window = MyGame(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE)
+    with startup_timing.timed("game setup"):
+        window.setup()
     arcade.run()
@@ -1,23 +1,51 @@
-from typing import Optional
-
-import arcade
-from entities.entity import Entity
-from util import char_to_pixel
-
-
-def get_blocking_sprites(x: int, y: int, sprite_list: arcade.SpriteList) -> Optional[arcade.SpriteList]:
-    """ Given an x,y grid location, return list of sprites that block movement. """
-    px, py = char_to_pixel(x, y)
-    sprite_list = arcade.get_sprites_at_exact_point((px, py), sprite_list)
-    blocking_sprite_list = arcade.SpriteList()
-    for sprite in sprite_list:
-        if isinstance(sprite, Entity):
-            if sprite.blocks:
-                blocking_sprite_list.append(sprite)
-        else:
-            raise TypeError("Sprite is not an instance of Entity.")
-
-    if len(blocking_sprite_list) > 0:
-        return blocking_sprite_list
-    else:
-        return None
+from typing import Iterable, List, Optional, Union
+
+import arcade
+from entities.entity import Entity
+from entities.tile import Tile
+from indexed_sprite_list import IndexedSpriteList
+from chunked_sprite_list import ChunkedSpriteList
+from util import char_to_pixel
+
+
+def _sprites_at(x: int, y: int, sprite_list: arcade.SpriteList) -> Iterable[arcade.Sprite]:
+    """ Sprites at a grid location. Doesn't copy anything for indexed lists. """
+    if isinstance(sprite_list, (IndexedSpriteList, ChunkedSpriteList)):
+        return sprite_list.iter_at(x, y)
+    px, py = char_to_pixel(x, y)
+    return arcade.get_sprites_at_exact_point((px, py), sprite_list)
+
+
+def first_blocker(x: int, y: int, sprite_list: arcade.SpriteList) -> Optional[Union[Entity, Tile]]:
+    """ Given an x,y grid location, return the first sprite that blocks movement. """
+    for sprite in _sprites_at(x, y, sprite_list):
+        if isinstance(sprite, (Entity, Tile)):
+            if sprite.blocks:
+                return sprite
+        else:
+            raise TypeError("Sprite is not an instance of Entity or Tile.")
+    return None
+
+
+def is_blocked(x: int, y: int, sprite_list: arcade.SpriteList) -> bool:
+    """ Given an x,y grid location, return True if any sprite there blocks movement. """
+    return first_blocker(x, y, sprite_list) is not None
+
+
+def get_blocking_sprites(x: int, y: int, sprite_list: arcade.SpriteList) -> Optional[List[Union[Entity, Tile]]]:
+    """
+    Given an x,y grid location, return list of sprites that block movement.
+    Use is_blocked or first_blocker unless every blocking sprite is needed.
+    """
+    blocking_sprite_list = []
+    for sprite in _sprites_at(x, y, sprite_list):
+        if isinstance(sprite, (Entity, Tile)):
+            if sprite.blocks:
+                blocking_sprite_list.append(sprite)
+        else:
+            raise TypeError("Sprite is not an instance of Entity or Tile.")
+
+    if len(blocking_sprite_list) > 0:
+        return blocking_sprite_list
+    else:
+        return None
@@ -0,0 +1,96 @@
+"""
+Sprite list that knows which grid location each sprite is on
+"""
+from typing import Dict, Iterable, List, Tuple
+
+import arcade
+
+Cell = Tuple[int, int]
+
+
+class IndexedSpriteList(arcade.SpriteList):
+    """
+    SpriteList with an index from grid location to the entities there.
+
+    Entities tell every IndexedSpriteList they belong to when they move, so
+    "what is at (x, y)?" is a dict lookup instead of a spatial-hash search
+    over pixel bounding boxes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cells: Dict[Cell, List[arcade.Sprite]] = {}
+        self._sprite_cells: Dict[arcade.Sprite, Cell] = {}
+
+    def append(self, sprite: arcade.Sprite):
+        super().append(sprite)
+        self._add_to_cell(sprite, (sprite.x, sprite.y))
+
+    def insert(self, index: int, sprite: arcade.Sprite):
+        super().insert(index, sprite)
+        self._add_to_cell(sprite, (sprite.x, sprite.y))
+
+    def remove(self, sprite: arcade.Sprite):
+        super().remove(sprite)
+        self._remove_from_cell(sprite, self._sprite_cells.pop(sprite))
+
+    def clear(self, deep: bool = True):
+        super().clear(deep)
+        self._cells = {}
+        self._sprite_cells = {}
+
+    def update_cell(self, sprite: arcade.Sprite):
+        """ Called by an entity in this list after its grid location changes. """
+        old_cell = self._sprite_cells[sprite]
+        new_cell = (sprite.x, sprite.y)
+        if old_cell != new_cell:
+            self._remove_from_cell(sprite, old_cell)
+            self._add_to_cell(sprite, new_cell)
+
+    def _add_to_cell(self, sprite: arcade.Sprite, cell: Cell):
+        self._sprite_cells[sprite] = cell
+        sprites = self._cells.get(cell)
+        if sprites is None:
+            self._cells[cell] = [sprite]
+        else:
+            sprites.append(sprite)
+
+    def _remove_from_cell(self, sprite: arcade.Sprite, cell: Cell):
+        sprites = self._cells[cell]
+        sprites.remove(sprite)
+        if not sprites:
+            del self._cells[cell]
+
+    def at(self, x: int, y: int) -> List[arcade.Sprite]:
+        """ Sprites at a grid location. """
+        return list(self._cells.get((x, y), ()))
+
+    def iter_at(self, x: int, y: int) -> Iterable[arcade.Sprite]:
+        """
+        Sprites at a grid location, without making a copy. Don't add, remove
+        or move sprites in this list while looping over the result.
+        """
+        return self._cells.get((x, y), ())
+
+    def in_rect(self, left: int, bottom: int, right: int, top: int) -> List[arcade.Sprite]:
+        """ Sprites inside a rectangle of grid locations, edges included. """
+        result = []
+        if (right - left + 1) * (top - bottom + 1) <= len(self._cells):
+            for x in range(left, right + 1):
+                for y in range(bottom, top + 1):
+                    result.extend(self._cells.get((x, y), ()))
+        else:
+            for (x, y), sprites in self._cells.items():
+                if left <= x <= right and bottom <= y <= top:
+                    result.extend(sprites)
+        return result
+
+    def in_radius(self, x: int, y: int, radius: float) -> List[arcade.Sprite]:
+        """ Sprites within a distance of a grid location. """
+        reach = int(radius)
+        radius_squared = radius * radius
+        result = []
+        for sprite in self.in_rect(x - reach, y - reach, x + reach, y + reach):
+            if (sprite.x - x) ** 2 + (sprite.y - y) ** 2 <= radius_squared:
+                result.append(sprite)
+        return result
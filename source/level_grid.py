@@ -0,0 +1,167 @@
+"""
+Per-cell flags for a dungeon level
+"""
+from typing import Dict, Iterable, List, Set, Tuple
+
+from entities.entity import Entity
+
+
+class LevelGrid:
+    """
+    Compact flags for every grid location on a level, one byte per cell.
+
+    This lets movement, path-finding and FOV ask "can I walk here?" or
+    "can I see through here?" without searching sprite lists.
+    """
+
+    # Something on this cell blocks movement (walls, creatures)
+    BLOCKS = 1
+    # Something on this cell blocks sight (walls, doors)
+    BLOCK_SIGHT = 2
+    # The terrain on this cell can be walked on, ignoring creatures
+    WALKABLE = 4
+    # The player has seen this cell at some point
+    EXPLORED = 8
+    # The player can see this cell right now
+    VISIBLE = 16
+
+    def __init__(self, width: int = 0, height: int = 0):
+        self.width = width
+        self.height = height
+        self.flags = bytearray(width * height)
+        # Just the BLOCKS, BLOCK_SIGHT and WALKABLE flags from the terrain,
+        # so occupants can be updated without looking at terrain sprites
+        self.terrain = bytearray(width * height)
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        """ Is this grid location on the map? """
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def has_flag(self, x: int, y: int, flag: int) -> bool:
+        """ Is the flag set for this grid location? Off-map cells have no flags. """
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return bool(self.flags[y * self.width + x] & flag)
+        return False
+
+    def set_flag(self, x: int, y: int, flag: int, value: bool = True):
+        """ Set or clear a flag for this grid location. """
+        index = y * self.width + x
+        if value:
+            self.flags[index] |= flag
+        else:
+            self.flags[index] &= ~flag
+
+    def clear_flag(self, flag: int):
+        """ Clear a flag across the entire grid. """
+        mask = ~flag & 0xFF
+        self.flags = bytearray(value & mask for value in self.flags)
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        """ Can't move onto this grid location. Off-map cells are blocked. """
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return bool(self.flags[y * self.width + x] & LevelGrid.BLOCKS)
+        return True
+
+    def blocks_sight(self, x: int, y: int) -> bool:
+        """ Can't see through this grid location. Off-map cells block sight. """
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return bool(self.flags[y * self.width + x] & LevelGrid.BLOCK_SIGHT)
+        return True
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        """ Terrain on this grid location can be walked on. """
+        return self.has_flag(x, y, LevelGrid.WALKABLE)
+
+    def is_explored(self, x: int, y: int) -> bool:
+        return self.has_flag(x, y, LevelGrid.EXPLORED)
+
+    def is_visible(self, x: int, y: int) -> bool:
+        return self.has_flag(x, y, LevelGrid.VISIBLE)
+
+    def update_cell(
+        self, x: int, y: int, terrain: Iterable[Entity], occupants: Iterable[Entity]
+    ):
+        """
+        Recalculate the movement and sight flags for one grid location.
+
+        :param x: Grid column
+        :param y: Grid row
+        :param terrain: Dungeon sprites (walls, floor, doors) at the location
+        :param occupants: Creatures and items at the location
+        """
+        terrain_flags = 0
+        walkable = False
+        for sprite in terrain:
+            walkable = True
+            if sprite.blocks:
+                terrain_flags |= LevelGrid.BLOCKS
+            if sprite.block_sight:
+                terrain_flags |= LevelGrid.BLOCK_SIGHT
+        if walkable and not terrain_flags & LevelGrid.BLOCKS:
+            terrain_flags |= LevelGrid.WALKABLE
+
+        self.terrain[y * self.width + x] = terrain_flags
+        self.update_occupants(x, y, occupants)
+
+    def set_terrain(self, x: int, y: int, terrain_flags: int):
+        """ Set the terrain flags for a grid location with no occupants. """
+        index = y * self.width + x
+        self.terrain[index] = terrain_flags
+        self.flags[index] = self.flags[index] & (LevelGrid.EXPLORED | LevelGrid.VISIBLE) | terrain_flags
+
+    def update_occupants(self, x: int, y: int, occupants: Iterable[Entity]):
+        """
+        Recalculate the flags for one grid location after its occupants change,
+        keeping the terrain flags it already has.
+
+        :param x: Grid column
+        :param y: Grid row
+        :param occupants: Creatures and items at the location
+        """
+        index = y * self.width + x
+        flags = self.flags[index] & (LevelGrid.EXPLORED | LevelGrid.VISIBLE) | self.terrain[index]
+
+        for sprite in occupants:
+            if sprite.blocks:
+                flags |= LevelGrid.BLOCKS
+            if sprite.block_sight:
+                flags |= LevelGrid.BLOCK_SIGHT
+
+        self.flags[index] = flags
+
+    def update_visible(
+        self, visible_cells: Set[Tuple[int, int]], previous_visible: Set[Tuple[int, int]]
+    ):
+        """ Move the visible flag from the previous FOV to the current one. """
+        for x, y in previous_visible - visible_cells:
+            if self.in_bounds(x, y):
+                self.set_flag(x, y, LevelGrid.VISIBLE, False)
+        for x, y in visible_cells - previous_visible:
+            if self.in_bounds(x, y):
+                self.set_flag(x, y, LevelGrid.VISIBLE | LevelGrid.EXPLORED)
+
+    @classmethod
+    def from_sprites(
+        cls, terrain: Iterable[Entity], occupants: Iterable[Entity]
+    ) -> "LevelGrid":
+        """
+        Create a grid sized to fit the terrain, with flags taken from the sprites.
+
+        :param terrain: Dungeon sprites (walls, floor, doors)
+        :param occupants: Creatures and items
+        """
+        cells: Dict[Tuple[int, int], Tuple[List[Entity], List[Entity]]] = {}
+        width = 0
+        height = 0
+        for sprite in terrain:
+            cells.setdefault((sprite.x, sprite.y), ([], []))[0].append(sprite)
+            width = max(width, sprite.x + 1)
+            height = max(height, sprite.y + 1)
+        for sprite in occupants:
+            cells.setdefault((sprite.x, sprite.y), ([], []))[1].append(sprite)
+
+        grid = cls(width, height)
+        for (x, y), (cell_terrain, cell_occupants) in cells.items():
+            if grid.in_bounds(x, y):
+                grid.update_cell(x, y, cell_terrain, cell_occupants)
+        return grid
@@ -2,6 +2,42 @@
 Data objects and JSON loading for dungeon
 """
 import json
+from array import array
+
+# Bitmask fields decoded into their own array
+TILE_FIELDS = (
+    "aperture",
+    "arch",
+    "block",
+    "corridor",
+    "door",
+    "label",
+    "locked",
+    "perimeter",
+    "portcullis",
+    "room",
+    "room_id",
+    "secret",
+    "stair_down",
+    "stair_up",
+    "trapped",
+)
+
+
+def get_shift(mask: int) -> int:
+    """ How far to shift a masked cell right to get the field's value. """
+    if not mask:
+        return 0
+    return (mask & -mask).bit_length() - 1
+
+
+def get_typecode(largest: int) -> str:
+    """ Smallest array typecode that can hold values up to largest. """
+    if largest < 1 << 8:
+        return "B"
+    if largest < 1 << 16:
+        return "H"
+    return "L"
 
 
 class Room:
@@ -11,25 +47,28 @@ class Room:
 
 
 class Tile:
-    def __init__(self):
-        self.cell = 0
-        self.row = 0
-        self.column = 0
-        self.aperture = 0
-        self.arch = 0
-        self.block = 0
-        self.corridor = 0
-        self.door = 0
-        self.label = None
-        self.locked = 0
-        self.perimeter = 0
-        self.portcullis = 0
-        self.room = 0
-        self.room_id = 0
-        self.secret = 0
-        self.stair_down = 0
-        self.stair_up = 0
-        self.trapped = 0
+    """
+    Read-only view of one grid location in a DungeonMap. The data itself
+    lives in the map's field arrays, this just knows where to look.
+    """
+
+    __slots__ = ("dungeon_map", "row", "column", "index")
+
+    def __init__(self, dungeon_map: "DungeonMap", row: int, column: int):
+        self.dungeon_map = dungeon_map
+        self.row = row
+        self.column = column
+        self.index = row * dungeon_map.map_width + column
+
+    @property
+    def cell(self) -> int:
+        return self.dungeon_map.cells[self.index]
+
+    def __getattr__(self, name):
+        # Only called for names that aren't slots, i.e. the bitmask fields
+        if name in TILE_FIELDS:
+            return self.dungeon_map.fields[name][self.index]
+        raise AttributeError(name)
 
     def __str__(self):
         result = f"({self.column}, {self.row}) = {self.cell}"
@@ -44,8 +83,13 @@ class Tile:
 class DungeonMap:
 
     def __init__(self):
-        self.cells = {}
+        # Raw cell values, row-major
+        self.cells = array("L")
         self.bitmask = {}
+        self.shifts = {}
+        self.fields = {}
+        # Texture for each wall, filled in when loading from the level cache
+        self.wall_textures = array("H")
         self.rooms = {}
         self.map_height = 0
         self.map_width = 0
@@ -53,7 +97,7 @@ class DungeonMap:
     def load(self, filename):
         f = open(filename)
         data = json.load(f)
-        self.cells = data['cells']
+        cell_rows = data['cells']
         self.bitmask = data['cell_bit']
         rooms_dict = data['rooms']
         self.rooms = {}
@@ -65,44 +109,42 @@ class DungeonMap:
                     room.room_features = room_dict['contents']['detail']['room_features']
                 self.rooms[room.id] = room
 
-        self.map_height = len(self.cells)
-        self.tiles = []
-        for row_index, row in enumerate(self.cells):
-            tile_row = []
-            self.tiles.append(tile_row)
-            for column_index, cell in enumerate(row):
-                tile = Tile()
-                tile.cell = cell
-                tile.row = row_index
-                tile.column = column_index
-                tile.aperture = self.get_bitmask_value("aperture", cell)
-                tile.arch = self.get_bitmask_value("arch", cell)
-                tile.block = self.get_bitmask_value("block", cell)
-                tile.corridor = self.get_bitmask_value("corridor", cell)
-                tile.door = self.get_bitmask_value("door", cell)
-                tile.label = self.get_bitmask_value("label", cell)
-                tile.locked = self.get_bitmask_value("locked", cell)
-                tile.perimeter = self.get_bitmask_value("perimeter", cell)
-                tile.portcullis = self.get_bitmask_value("portcullis", cell)
-                tile.room = self.get_bitmask_value("room", cell)
-                tile.room_id = self.get_bitmask_value("room_id", cell)
-                tile.secret = self.get_bitmask_value("secret", cell)
-                tile.stair_down = self.get_bitmask_value("stair_down", cell)
-                tile.stair_up = self.get_bitmask_value("stair_up", cell)
-                tile.trapped = self.get_bitmask_value("trapped", cell)
-                tile_row.append(tile)
-        self.map_width = len(self.tiles[0])
+        self.map_height = len(cell_rows)
+        self.map_width = len(cell_rows[0]) if cell_rows else 0
+        self.cells = array("L", [cell for row in cell_rows for cell in row])
+        self.decode_cells()
+
+    def decode_cells(self):
+        """
+        Split every cell into one array per bitmask field, in row-major
+        order, using the smallest item size that fits each field. Each
+        mask's shift is worked out once, instead of once per cell per field.
+        """
+        self.update_shifts()
+        self.fields = {}
+        for key in TILE_FIELDS:
+            mask = self.bitmask.get(key, 0)
+            shift = self.shifts.get(key, 0)
+            self.fields[key] = array(
+                get_typecode(mask >> shift), [(cell & mask) >> shift for cell in self.cells]
+            )
+
+    def update_shifts(self):
+        """ Work out each bitmask field's shift. """
+        self.shifts = {key: get_shift(mask) for key, mask in self.bitmask.items()}
+
+    def index(self, row: int, column: int) -> int:
+        """ Position of a grid location in the field arrays. """
+        return row * self.map_width + column
+
+    def tile(self, row: int, column: int) -> Tile:
+        return Tile(self, row, column)
 
     def get_bitmask_value(self, key, cell):
-        value = self.bitmask[key] & cell
-        temp_mask = self.bitmask[key]
-        if not temp_mask:
+        mask = self.bitmask[key]
+        if not mask:
             return 0
-        shift = 0
-        while temp_mask >> shift << shift == temp_mask:
-            shift += 1
-        value2 = value >> (shift - 1)
-        return value2
+        return (cell & mask) >> self.shifts[key]
 
     def get_room(self, id):
         for room_id in self.rooms:
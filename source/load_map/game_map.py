@@ -1,6 +1,8 @@
 from constants import TILE
 from entities.entity import Entity
 from load_map.dungeon_map import DungeonMap
+from load_map.level_cache import load_dungeon_map
+from load_map.room_graph import RoomGraph
 
 
 class GameMap:
@@ -8,6 +10,7 @@ class GameMap:
         self.map_width = 0
         self.map_height = 0
         self.dungeon_map: DungeonMap = DungeonMap()
+        self.room_graph: RoomGraph = RoomGraph()
         self.level_number = level_number
 
         self.tiles = [
@@ -23,27 +26,33 @@ class GameMap:
     def make_map(
         self, player: Entity, level: int
     ):
-        self.dungeon_map.load(f"levels/level_{level:02}.json")
+        self.load_level(level)
+        self.place_player(player)
+
+    def load_level(self, level: int):
+        """ Load the level's map. Doesn't touch the player, so is safe to run in the background. """
+        self.dungeon_map = load_dungeon_map(f"levels/level_{level:02}.json")
         self.map_width = self.dungeon_map.map_width
         self.map_height = self.dungeon_map.map_height
+        self.room_graph = RoomGraph.from_dungeon_map(self.dungeon_map)
 
+        cells = self.dungeon_map.cells
+        perimeter = self.dungeon_map.fields["perimeter"]
+        corridor = self.dungeon_map.fields["corridor"]
+        room = self.dungeon_map.fields["room"]
         self.tiles = []
         for row in range(self.map_height):
             self.tiles.append([])
-            for column in range(self.map_width):
-                tile = self.dungeon_map.tiles[row][column]
-                if tile.cell == 0 or tile.perimeter:
+            for index in range(row * self.map_width, (row + 1) * self.map_width):
+                if cells[index] == 0 or perimeter[index]:
                     self.tiles[row].append(TILE.WALL)
-                elif tile.corridor:
+                elif corridor[index]:
                     self.tiles[row].append(TILE.FLOOR)
-                elif tile.room:
+                elif room[index]:
                     self.tiles[row].append(TILE.FLOOR)
                 else:
                     self.tiles[row].append(TILE.EMPTY)
 
-        player.x = 10
-        player.y = 11
-
         # self.tiles = [
         #     [TILE.WALL for _ in range(self.map_height)] for _ in range(self.map_width)
         # ]
@@ -53,3 +62,6 @@ class GameMap:
         self.creatures = [
             [TILE.EMPTY for _ in range(self.map_height)] for _ in range(self.map_width)
         ]
+
+    def place_player(self, player: Entity):
+        player.set_cell(10, 11)
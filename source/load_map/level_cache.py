@@ -0,0 +1,194 @@
+"""
+Compiled binary copies of the levels/level_NN.json files.
+
+Parsing the JSON and decoding every cell is the slow part of loading a
+level, so the decoded result is written next to the JSON file the first
+time, and read back with a memory map after that. The cache is rebuilt
+whenever the JSON file's size or modification time changes, the wall
+texture table changes (a different theme, or new autotile rules), or the
+format version below is bumped.
+
+Layout: header, JSON metadata (bitmask, rooms, array typecodes), then the
+raw cell array, one array per bitmask field, and the wall textures.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+from autotile import WALL_TEXTURE_TABLE
+from autotile import get_wall_textures
+from load_map.dungeon_map import DungeonMap
+from load_map.dungeon_map import Room
+from load_map.dungeon_map import TILE_FIELDS
+
+CACHE_MAGIC = b"DLVL"
+CACHE_VERSION = 2
+CACHE_SUFFIX = ".bin"
+
+# Magic, version, width, height, source size, source mtime, wall texture
+# fingerprint, metadata length
+HEADER = struct.Struct("<4sHIIqq8sI")
+
+# The cached wall textures come straight from this table, which is built
+# from the theme's texture ids and the autotile rules
+WALL_TEXTURE_FINGERPRINT = hashlib.blake2b(WALL_TEXTURE_TABLE.tobytes(), digest_size=8).digest()
+
+
+def cache_filename(filename: str) -> str:
+    return os.path.splitext(filename)[0] + CACHE_SUFFIX
+
+
+def load_dungeon_map(filename: str) -> DungeonMap:
+    """
+    Load a level, from its compiled cache if that is up to date. Otherwise
+    parse the JSON and write a new cache.
+    """
+    dungeon_map = read_cache(filename)
+    if dungeon_map is None:
+        dungeon_map = compile_level(filename)
+    return dungeon_map
+
+
+def compile_level(filename: str) -> DungeonMap:
+    """ Parse a level's JSON file and write its compiled cache. """
+    dungeon_map = DungeonMap()
+    dungeon_map.load(filename)
+    dungeon_map.wall_textures = get_wall_textures(dungeon_map)
+    try:
+        write_cache(dungeon_map, filename)
+    except OSError:
+        # Read-only install, etc. The level still loads, just slower.
+        pass
+    return dungeon_map
+
+
+def write_cache(dungeon_map: DungeonMap, filename: str):
+    stat = os.stat(filename)
+    arrays = [dungeon_map.cells]
+    arrays.extend(dungeon_map.fields[key] for key in TILE_FIELDS)
+    arrays.append(dungeon_map.wall_textures)
+
+    metadata = {
+        "byteorder": sys.byteorder,
+        "cell_bit": dungeon_map.bitmask,
+        "rooms": [[room.id, room.room_features] for room in dungeon_map.rooms.values()],
+        "arrays": [[values.typecode, values.itemsize, len(values)] for values in arrays],
+    }
+    metadata_bytes = json.dumps(metadata).encode("utf-8")
+
+    # Write to a temporary file first so a crash never leaves half a cache.
+    # Each writer gets its own, as the level loader thread and the main
+    # thread can compile the same level at once.
+    target = cache_filename(filename)
+    f = tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(target) or ".", prefix=os.path.basename(target) + ".", suffix=".tmp", delete=False
+    )
+    try:
+        with f:
+            f.write(
+                HEADER.pack(
+                    CACHE_MAGIC,
+                    CACHE_VERSION,
+                    dungeon_map.map_width,
+                    dungeon_map.map_height,
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    WALL_TEXTURE_FINGERPRINT,
+                    len(metadata_bytes),
+                )
+            )
+            f.write(metadata_bytes)
+            for values in arrays:
+                values.tofile(f)
+        os.replace(f.name, target)
+    except BaseException:
+        os.remove(f.name)
+        raise
+
+
+def read_cache(filename: str):
+    """ Return the cached DungeonMap for a level, or None if it is missing or out of date. """
+    try:
+        stat = os.stat(filename)
+        f = open(cache_filename(filename), "rb")
+    except OSError:
+        return None
+
+    with f:
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _read_dungeon_map(data, stat)
+
+
+def _read_dungeon_map(data: mmap.mmap, stat: os.stat_result):
+    # A damaged cache is treated like a missing one, so the level recompiles
+    try:
+        return _unpack_dungeon_map(data, stat)
+    except (ValueError, struct.error, KeyError, TypeError, json.JSONDecodeError):
+        return None
+
+
+def _unpack_dungeon_map(data: mmap.mmap, stat: os.stat_result):
+    magic, version, width, height, size, mtime, fingerprint, metadata_length = HEADER.unpack_from(data)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION:
+        return None
+    if fingerprint != WALL_TEXTURE_FINGERPRINT:
+        return None
+    if size != stat.st_size or mtime != stat.st_mtime_ns:
+        return None
+
+    offset = HEADER.size
+    metadata = json.loads(data[offset:offset + metadata_length])
+    offset += metadata_length
+    if metadata["byteorder"] != sys.byteorder:
+        return None
+
+    # Cells, one array per field, and wall textures, each one per cell,
+    # filling the rest of the file exactly
+    layout = metadata["arrays"]
+    if len(layout) != len(TILE_FIELDS) + 2:
+        return None
+    if any(length != width * height for _, _, length in layout):
+        return None
+    if offset + sum(itemsize * length for _, itemsize, length in layout) != len(data):
+        return None
+
+    # Copy each array straight out of the mapped file
+    arrays = []
+    for typecode, itemsize, length in layout:
+        values = array(typecode)
+        if values.itemsize != itemsize:
+            return None
+        end = offset + itemsize * length
+        with memoryview(data)[offset:end] as chunk:
+            values.frombytes(chunk)
+        arrays.append(values)
+        offset = end
+
+    dungeon_map = DungeonMap()
+    dungeon_map.map_width = width
+    dungeon_map.map_height = height
+    dungeon_map.bitmask = metadata["cell_bit"]
+    dungeon_map.update_shifts()
+    for room_id, room_features in metadata["rooms"]:
+        room = Room()
+        room.id = room_id
+        room.room_features = room_features
+        dungeon_map.rooms[room.id] = room
+    dungeon_map.cells = arrays[0]
+    dungeon_map.fields = dict(zip(TILE_FIELDS, arrays[1:-1]))
+    dungeon_map.wall_textures = arrays[-1]
+    return dungeon_map
+
+
+if __name__ == "__main__":
+    # python -m load_map.level_cache levels/*.json
+    for level_filename in sys.argv[1:]:
+        compile_level(level_filename)
+        print(f"{level_filename} -> {cache_filename(level_filename)}")
@@ -0,0 +1,259 @@
+"""
+Abstract graph of rooms and corridors, used to plan long paths.
+"""
+import heapq
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from constants import CORRIDOR_REGION_SIZE
+from entities.astar import NEIGHBORS
+from entities.astar import astar
+from entities.astar import octile_distance
+from level_grid import LevelGrid
+
+Cell = Tuple[int, int]
+
+
+class RoomGraph:
+    """
+    Rooms and the corridors between them, as a graph.
+
+    Every walkable grid location belongs to a region: either a room, or a
+    stretch of connected corridor no bigger than CORRIDOR_REGION_SIZE.
+    Wherever two regions touch there is an entrance, one for each connected
+    stretch of their shared edge. Long paths are planned entrance-to-entrance
+    on this small graph, using walking distances across each region, then A*
+    only has to fill in the short hop to the next entrance.
+    """
+
+    def __init__(self):
+        # Region for each walkable grid location. Rooms use their room id,
+        # corridors get negative ids.
+        self.regions: Dict[Cell, int] = {}
+        # For each region, the (inside, outside) cell pairs leading out of it
+        self.entrances: Dict[int, List[Tuple[Cell, Cell]]] = {}
+        # Cells on the other side of each entrance cell
+        self.exits: Dict[Cell, List[Cell]] = {}
+        # Walking distance from each entrance cell to the other entrance
+        # cells of its region, staying inside the region
+        self.crossings: Dict[Cell, List[Tuple[Cell, float]]] = {}
+
+    @classmethod
+    def from_dungeon_map(cls, dungeon_map) -> "RoomGraph":
+        """ Build the graph from a loaded DungeonMap. """
+        walkable: Set[Cell] = set()
+        rooms: Dict[Cell, int] = {}
+        room = dungeon_map.fields["room"]
+        room_id = dungeon_map.fields["room_id"]
+        corridor = dungeon_map.fields["corridor"]
+        door = dungeon_map.fields["door"]
+        stair_down = dungeon_map.fields["stair_down"]
+        for row in range(dungeon_map.map_height):
+            for column in range(dungeon_map.map_width):
+                index = dungeon_map.index(row, column)
+                if room[index] or corridor[index] or door[index] or stair_down[index]:
+                    # Same row flip as dungeon_map_to_sprites
+                    cell = (column, dungeon_map.map_height - row)
+                    walkable.add(cell)
+                    if room[index] and not door[index]:
+                        rooms[cell] = room_id[index]
+
+        graph = cls()
+        graph.build(walkable, rooms)
+        return graph
+
+    def build(self, walkable: Set[Cell], rooms: Dict[Cell, int], corridor_size: int = CORRIDOR_REGION_SIZE):
+        """
+        Split walkable grid locations into regions and find where they touch.
+
+        :param walkable: Every grid location that can be walked on
+        :param rooms: Room id for the grid locations that are inside rooms
+        :param corridor_size: Most grid locations in one corridor region
+        """
+        self.regions = dict(rooms)
+
+        # Flood-fill whatever is left into corridor regions. Breadth first, so
+        # a corridor too big for one region is cut into compact pieces.
+        next_id = -1
+        for cell in sorted(walkable):
+            if cell in self.regions:
+                continue
+            self.regions[cell] = next_id
+            size = 1
+            queue = deque([cell])
+            while queue and size < corridor_size:
+                x, y = queue.popleft()
+                for dx, dy, _ in NEIGHBORS:
+                    neighbor = (x + dx, y + dy)
+                    if neighbor in walkable and neighbor not in self.regions:
+                        self.regions[neighbor] = next_id
+                        queue.append(neighbor)
+                        size += 1
+                        if size == corridor_size:
+                            break
+            next_id -= 1
+
+        # Every place two regions touch
+        boundaries: Dict[Tuple[int, int], List[Tuple[Cell, Cell]]] = {}
+        for (x, y), region in self.regions.items():
+            for dx, dy, _ in NEIGHBORS:
+                neighbor = (x + dx, y + dy)
+                other = self.regions.get(neighbor)
+                if other is not None and region < other:
+                    boundaries.setdefault((region, other), []).append(((x, y), neighbor))
+
+        # One entrance, both ways, for each connected stretch of boundary
+        self.entrances = {}
+        self.exits = {}
+        for (region, other), pairs in boundaries.items():
+            for inside, outside in _segment_middles(pairs):
+                self.entrances.setdefault(region, []).append((inside, outside))
+                self.entrances.setdefault(other, []).append((outside, inside))
+                self.exits.setdefault(inside, []).append(outside)
+                self.exits.setdefault(outside, []).append(inside)
+
+        self.crossings = {}
+        for region_entrances in self.entrances.values():
+            cells = {inside for inside, _ in region_entrances}
+            for cell in cells:
+                distances = self.distances_in_region(cell, cells)
+                self.crossings[cell] = [(other, distance) for other, distance in distances.items() if other != cell]
+
+    def region_at(self, x: int, y: int) -> Optional[int]:
+        return self.regions.get((x, y))
+
+    def distances_in_region(self, start: Cell, targets: Set[Cell]) -> Dict[Cell, float]:
+        """
+        Walking distance from start to each target in the same region,
+        without leaving the region.
+        """
+        region = self.regions[start]
+        remaining = set(targets)
+        distances: Dict[Cell, float] = {}
+        g_score: Dict[Cell, float] = {start: 0}
+        open_heap = [(0.0, start)]
+        while open_heap and remaining:
+            distance, current = heapq.heappop(open_heap)
+            if current in distances:
+                continue
+            distances[current] = distance
+            remaining.discard(current)
+            x, y = current
+            for dx, dy, cost in NEIGHBORS:
+                neighbor = (x + dx, y + dy)
+                if self.regions.get(neighbor) != region or neighbor in distances:
+                    continue
+                neighbor_distance = distance + cost
+                if neighbor_distance < g_score.get(neighbor, float("inf")):
+                    g_score[neighbor] = neighbor_distance
+                    heapq.heappush(open_heap, (neighbor_distance, neighbor))
+        return {cell: distances[cell] for cell in targets if cell in distances}
+
+    def plan(self, start: Cell, end: Cell) -> Optional[List[Cell]]:
+        """
+        Return the entrances to pass through on the way from start to end,
+        followed by the end itself. None if there is no way there.
+        """
+        start_region = self.regions.get(start)
+        end_region = self.regions.get(end)
+        if start_region is None or end_region is None:
+            return None
+        if start_region == end_region:
+            return [end]
+
+        # Ways out of the start's region, and into the end from its region
+        start_crossings = self.distances_in_region(
+            start, {inside for inside, _ in self.entrances.get(start_region, [])}
+        )
+        end_crossings = self.distances_in_region(
+            end, {inside for inside, _ in self.entrances.get(end_region, [])}
+        )
+
+        # A* over entrance cells
+        g_score: Dict[Cell, float] = {start: 0}
+        parents: Dict[Cell, Optional[Cell]] = {start: None}
+        closed = set()
+        open_heap = [(octile_distance(start, end), start)]
+
+        while open_heap:
+            _, current = heapq.heappop(open_heap)
+            if current in closed:
+                continue
+            if current == end:
+                waypoints = []
+                while current != start:
+                    waypoints.append(current)
+                    current = parents[current]
+                return waypoints[::-1]
+            closed.add(current)
+
+            # Either cross the region to another entrance, step out through
+            # the entrance we're standing on, or walk to the end
+            if current == start:
+                candidates = list(start_crossings.items())
+            else:
+                candidates = list(self.crossings.get(current, []))
+            candidates.extend((outside, octile_distance(current, outside)) for outside in self.exits.get(current, []))
+            if current in end_crossings:
+                candidates.append((end, end_crossings[current]))
+
+            for child, cost in candidates:
+                if child in closed:
+                    continue
+                child_g = g_score[current] + cost
+                if child_g >= g_score.get(child, float("inf")):
+                    continue
+                g_score[child] = child_g
+                parents[child] = current
+                heapq.heappush(open_heap, (child_g + octile_distance(child, end), child))
+
+        return None
+
+    def find_path(
+        self, grid: LevelGrid, start: Cell, end: Cell, legs: Optional[int] = None
+    ) -> Optional[List[Cell]]:
+        """
+        Plan a path on the room graph, then fill it in with A*.
+
+        :param grid: Flags for the level, used to see what is blocked
+        :param start: Starting grid location
+        :param end: Grid location to get to
+        :param legs: Only fill in this many hops between entrances. A monster
+                     only needs the first one to know where to step next.
+        :return: List of grid locations starting with start, or None
+        """
+        waypoints = self.plan(start, end)
+        if waypoints is None:
+            return None
+        if legs is not None:
+            waypoints = waypoints[:legs]
+
+        path = [start]
+        for waypoint in waypoints:
+            leg = astar(grid, path[-1], waypoint)
+            if leg is None:
+                return None
+            path.extend(leg[1:])
+        return path
+
+
+def _segment_middles(pairs: List[Tuple[Cell, Cell]]) -> List[Tuple[Cell, Cell]]:
+    """
+    Split the (inside, outside) pairs along two regions' shared edge into
+    connected stretches, and pick the pair in the middle of each.
+    """
+    def touching(a: Tuple[Cell, Cell], b: Tuple[Cell, Cell]) -> bool:
+        return any(max(abs(p[0] - q[0]), abs(p[1] - q[1])) <= 1 for p, q in zip(a, b))
+
+    middles = []
+    remaining = sorted(pairs)
+    while remaining:
+        segment = [remaining.pop(0)]
+        for pair in segment:
+            connected = [other for other in remaining if touching(pair, other)]
+            for other in connected:
+                remaining.remove(other)
+            segment.extend(connected)
+        segment.sort()
+        middles.append(segment[len(segment) // 2])
+    return middles
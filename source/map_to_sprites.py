@@ -1,7 +1,5 @@
 from typing import List
 
-import arcade
-
 from constants import *
 from themes.current_theme import *
 
@@ -12,11 +10,12 @@ from entities.potion import Potion
 from entities.stairs import Stairs
 from entities.creature_factory import get_random_monster_by_challenge
 from entities.creature_factory import make_monster_sprite
+from indexed_sprite_list import IndexedSpriteList
 
 
-def map_to_sprites(game_map: List[List[int]]) -> arcade.SpriteList:
+def map_to_sprites(game_map: List[List[int]]) -> IndexedSpriteList:
     """ Take a grid of numbers and convert to sprites. """
-    sprite_list = arcade.SpriteList(use_spatial_hash=True, spatial_hash_cell_size=16)
+    sprite_list = IndexedSpriteList()
 
     # Take the tiles and make sprites out of them
     for y in range(len(game_map[0])):
@@ -60,9 +59,9 @@ def map_to_sprites(game_map: List[List[int]]) -> arcade.SpriteList:
     return sprite_list
 
 
-def creatures_to_sprites(game_map: List[List[int]]) -> arcade.SpriteList:
+def creatures_to_sprites(game_map: List[List[int]]) -> IndexedSpriteList:
     """ Take a grid of numbers and convert to sprites. """
-    sprite_list = arcade.SpriteList(use_spatial_hash=True, spatial_hash_cell_size=16)
+    sprite_list = IndexedSpriteList()
 
     # Take the tiles and make sprites out of them
     for y in range(len(game_map[0])):
@@ -71,8 +70,7 @@ def creatures_to_sprites(game_map: List[List[int]]) -> arcade.SpriteList:
             if game_map[x][y]:
                 m = get_random_monster_by_challenge(game_map[x][y])
                 sprite = make_monster_sprite(m)
-                sprite.x = x
-                sprite.y = y
+                sprite.set_cell(x, y)
                 # sprite.alpha = 0
                 sprite.visible_color = colors['monster']
 
@@ -1,6 +1,9 @@
-from random import randint
-from random import choice
 from constants import TILE
+from random_streams import rng
+
+_random = rng.stream("map_generation")
+randint = _random.randint
+choice = _random.choice
 
 
 # Some variables for the rooms in the map
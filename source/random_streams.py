@@ -0,0 +1,59 @@
+"""
+Seeded random numbers for the game, one stream per subsystem
+"""
+import random
+from typing import Dict, Optional
+
+
+class RandomStreams:
+    """
+    One master seed, and a separate random.Random for each part of the game
+    that needs random numbers. Each stream's seed comes from the master seed
+    and the stream's name, so one part of the game using more or fewer
+    numbers doesn't change what another part gets. The same master seed
+    gives the same game.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.master_seed = 0
+        self.streams: Dict[str, random.Random] = {}
+        self.seed(seed)
+
+    def seed(self, seed: Optional[int] = None) -> int:
+        """
+        Restart every stream from a master seed.
+
+        :param seed: Master seed. Picks a new one at random if None.
+        :returns: The master seed, so it can be recorded
+        """
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        self.master_seed = seed
+        # Keep the same objects, so modules can hold on to their stream
+        for name, stream in self.streams.items():
+            stream.seed(self._stream_seed(name))
+        return seed
+
+    def stream(self, name: str) -> random.Random:
+        """ The stream for a subsystem. Always the same object for a name. """
+        stream = self.streams.get(name)
+        if stream is None:
+            stream = random.Random(self._stream_seed(name))
+            self.streams[name] = stream
+        return stream
+
+    def substream(self, name: str, key) -> random.Random:
+        """
+        A new stream for one use of a subsystem, such as one dungeon level.
+        Safe to use on another thread, as nothing else shares it.
+        """
+        return random.Random(self._stream_seed(f"{name}:{key}"))
+
+    def _stream_seed(self, name: str) -> str:
+        # random.Random hashes string seeds with SHA-512, so this is the
+        # same on every run, unlike hash()
+        return f"{self.master_seed}:{name}"
+
+
+# Shared by the whole game
+rng = RandomStreams()
@@ -1,24 +1,127 @@
 """
 Calculate Field Of Vision (FOV)
 """
-from typing import List
+from typing import Callable, List, Optional, Set, Tuple, Union
 
 import arcade
 import math
 
 from constants import *
 from entities.entity import Entity
-from util import char_to_pixel
+from indexed_sprite_list import IndexedSpriteList
+from chunked_sprite_list import ChunkedSpriteList
+from level_grid import LevelGrid
+from shadowcasting import compute_fov
 
 
-def recalculate_fov(char_x: int, char_y: int, radius: int, sprite_lists: List[arcade.SpriteList]):
-    for sprite_list in sprite_lists:
-        for sprite in sprite_list:
-            if sprite.is_visible:
-                sprite.is_visible = False
-                sprite.color = sprite.not_visible_color
-                if len(sprite.color) == 4:
-                    sprite.alpha = sprite.not_visible_color[3]
+def recalculate_fov(
+    char_x: int,
+    char_y: int,
+    radius: int,
+    sprite_lists: List[Union[IndexedSpriteList, ChunkedSpriteList]],
+    algorithm: str = FOV_ALGORITHM,
+    previous_visible: Optional[Set[Tuple[int, int]]] = None,
+    grid: Optional[LevelGrid] = None,
+    on_enter: Optional[Callable[[Set[Tuple[int, int]]], None]] = None,
+) -> Set[Tuple[int, int]]:
+    """
+    Update which sprites are visible from the given grid location.
+
+    If the visible set from the last call is passed in, only sprites in grid
+    locations that came into or went out of view are touched. Otherwise every
+    sprite is reset first.
+
+    If the level's grid is passed in, sight is checked against its flags
+    and its visible/explored flags are kept up to date.
+
+    :param char_x: Grid column of the viewer
+    :param char_y: Grid row of the viewer
+    :param radius: How far the viewer can see
+    :param sprite_lists: Sprite lists to update
+    :param algorithm: "shadowcasting" or "raycasting"
+    :param previous_visible: Visible grid locations returned by the last call
+    :param grid: Flags for the level being looked at
+    :param on_enter: Called with the grid locations coming into view, before
+                     their sprites are shown. Used to create sprites on demand.
+    :return: Set of visible grid locations
+    """
+    get_cell = _make_cell_lookup(sprite_lists)
+
+    if grid is not None:
+        is_opaque = grid.blocks_sight
+    else:
+
+        def is_opaque(x: int, y: int) -> bool:
+            for sprite in get_cell(x, y):
+                if sprite.block_sight:
+                    return True
+            return False
+
+    if algorithm == "shadowcasting":
+        visible_cells = compute_fov(char_x, char_y, radius, is_opaque)
+    elif algorithm == "raycasting":
+        visible_cells = raycast_fov(char_x, char_y, radius, is_opaque)
+    else:
+        raise ValueError(f"Error, unknown FOV algorithm {algorithm}.")
+
+    if grid is not None:
+        if previous_visible is None:
+            grid.clear_flag(LevelGrid.VISIBLE)
+        grid.update_visible(visible_cells, previous_visible or set())
+
+    if previous_visible is None:
+        for sprite_list in sprite_lists:
+            for sprite in sprite_list:
+                if sprite.is_visible:
+                    set_visibility(sprite, False)
+        entering_cells = visible_cells
+    else:
+        for x, y in previous_visible - visible_cells:
+            for sprite in get_cell(x, y):
+                set_visibility(sprite, False)
+        entering_cells = visible_cells - previous_visible
+
+    if on_enter is not None:
+        on_enter(entering_cells)
+
+    for x, y in entering_cells:
+        for sprite in get_cell(x, y):
+            set_visibility(sprite, True)
+
+    return visible_cells
+
+
+def set_visibility(sprite: Entity, is_visible: bool):
+    """ Show a sprite in its visible or not-visible color. """
+    sprite.is_visible = is_visible
+    if is_visible:
+        color = sprite.visible_color
+    else:
+        color = sprite.not_visible_color
+    sprite.color = color
+    if len(color) == 4:
+        sprite.alpha = color[3]
+
+
+def _make_cell_lookup(
+    sprite_lists: List[Union[IndexedSpriteList, ChunkedSpriteList]],
+) -> Callable[[int, int], List[Entity]]:
+    """ Return a function listing sprites at a grid location across all the lists. """
+
+    def get_cell(x: int, y: int) -> List[Entity]:
+        sprites = []
+        for sprite_list in sprite_lists:
+            sprites.extend(sprite_list.at(x, y))
+        return sprites
+
+    return get_cell
+
+
+def raycast_fov(
+    char_x: int, char_y: int, radius: int, is_opaque: Callable[[int, int], bool]
+) -> Set[Tuple[int, int]]:
+    """ Find visible grid locations by casting rays out from the character. """
+    visible_cells = set()
 
     resolution = 12
     circumference = 2 * math.pi * radius
@@ -38,27 +141,9 @@ def recalculate_fov(char_x: int, char_y: int, radius: int, sprite_lists: List[ar
             x2, y2 = arcade.lerp_vec(v1, v2, j / raychecks)
             x2 = round(x2)
             y2 = round(y2)
+            visible_cells.add((x2, y2))
 
-            pixel_point = char_to_pixel(x2, y2)
-
-            blocks = False
-            for sprite_list in sprite_lists:
-                sprites_at_point = arcade.get_sprites_at_exact_point(
-                    pixel_point, sprite_list
-                )
-                # checks += 1
-                sprite: Entity
-                for sprite in sprites_at_point:
-                    sprite.is_visible = True
-                    if sprite.block_sight:
-                        blocks = True
-
-            if blocks:
+            if is_opaque(x2, y2):
                 break
 
-    for sprite_list in sprite_lists:
-        for sprite in sprite_list:
-            if sprite.is_visible:
-                sprite.color = sprite.visible_color
-                if len(sprite.color) == 4:
-                    sprite.alpha = sprite.visible_color[3]
+    return visible_cells
@@ -0,0 +1,122 @@
+"""
+Record the player's inputs to a file, and play them back.
+
+A replay is the master random seed followed by one fixed-size record per
+input: the game time it happened at, what kind of input it was, and up
+to two numbers (a move's direction, a clicked grid location, or an item
+slot). Playing it back with the same seed gives the same game, and can
+be done headless as fast as the engine runs.
+"""
+import struct
+from typing import BinaryIO, Iterator, Tuple
+
+from actions import Action
+from actions import DropItem
+from actions import Pickup
+from actions import SelectItem
+from actions import UseItem
+from actions import UseStairs
+from random_streams import rng
+
+REPLAY_MAGIC = b"DCRP"
+REPLAY_VERSION = 1
+
+# Magic, version, master seed
+HEADER = struct.Struct("<4sHQ")
+
+# Game time, input kind, two arguments
+RECORD = struct.Struct("<dBhh")
+
+MOVE = 1
+GRID_CLICK = 2
+PICKUP = 3
+DROP_ITEM = 4
+SELECT_ITEM = 5
+USE_ITEM = 6
+USE_STAIRS = 7
+
+ACTION_KINDS = {
+    Pickup: PICKUP,
+    DropItem: DROP_ITEM,
+    SelectItem: SELECT_ITEM,
+    UseItem: USE_ITEM,
+    UseStairs: USE_STAIRS,
+}
+INPUT_ACTIONS = {kind: action_class for action_class, kind in ACTION_KINDS.items()}
+
+Record = Tuple[float, int, int, int]
+
+
+class ReplayRecorder:
+    """ Writes player inputs to a replay file as they happen. """
+
+    def __init__(self, filename: str, seed: int):
+        if not 0 <= seed < 2 ** 64:
+            raise ValueError(f"Error, replay seeds must be from 0 to {2 ** 64 - 1}, not {seed}.")
+        self.file: BinaryIO = open(filename, "wb")
+        self.file.write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, seed))
+
+    def record(self, game_time: float, kind: int, a: int = 0, b: int = 0):
+        self.file.write(RECORD.pack(game_time, kind, a, b))
+        # Inputs come slowly when a person plays, and the replay should
+        # survive the game being killed
+        self.file.flush()
+
+    def record_action(self, game_time: float, action: Action):
+        kind = ACTION_KINDS.get(type(action))
+        if kind is None:
+            raise TypeError(f"Error, {action} is not a player input.")
+        self.record(game_time, kind, action.number if kind == SELECT_ITEM else 0)
+
+    def close(self):
+        self.file.close()
+
+
+def read_replay(filename: str) -> Tuple[int, Iterator[Record]]:
+    """
+    Read a replay file.
+
+    :returns: The master seed, and the (game time, kind, a, b) records
+    """
+    with open(filename, "rb") as f:
+        data = f.read()
+
+    magic, version, seed = HEADER.unpack_from(data)
+    if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+        raise ValueError(f"Error, {filename} is not a version {REPLAY_VERSION} replay.")
+    if (len(data) - HEADER.size) % RECORD.size:
+        raise ValueError(f"Error, {filename} ends part way through a record.")
+
+    return seed, RECORD.iter_unpack(memoryview(data)[HEADER.size:])
+
+
+def play_replay(game_engine, filename: str) -> int:
+    """
+    Start a new game with a replay's seed and feed it the recorded inputs.
+    Waits are skipped, so this runs as fast as the engine can go.
+
+    :param game_engine: A GameEngine that hasn't been set up yet
+    :returns: How many inputs were played
+    """
+    seed, records = read_replay(filename)
+    rng.seed(seed)
+    game_engine.setup()
+
+    count = 0
+    for game_time, kind, a, b in records:
+        # Let anything that was due before this input happen first
+        game_engine.run_until_idle(game_time)
+        if kind == MOVE:
+            game_engine.move_player(a, b)
+        elif kind == GRID_CLICK:
+            game_engine.grid_click(a, b)
+        elif kind == SELECT_ITEM:
+            game_engine.player_input(SelectItem(a))
+        elif kind in INPUT_ACTIONS:
+            game_engine.player_input(INPUT_ACTIONS[kind]())
+        else:
+            raise ValueError(f"Error, unknown input kind {kind} in replay.")
+        count += 1
+
+    game_engine.run_until_idle()
+    return count
@@ -0,0 +1,40 @@
+"""
+Actions waiting for their time to come
+"""
+import heapq
+from itertools import count
+from typing import List, Tuple
+
+from actions import Action
+
+
+class ActionScheduler:
+    """
+    Heap of actions keyed by the game time they are due. Waiting actions
+    cost nothing until they are due. Ones due at the same time come out in
+    the order they were scheduled.
+    """
+
+    def __init__(self):
+        self.heap: List[Tuple[float, int, Action]] = []
+        self.counter = count()
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def schedule(self, due_time: float, action: Action):
+        heapq.heappush(self.heap, (due_time, next(self.counter), action))
+
+    def next_due(self) -> float:
+        """ Game time the next action is due. The scheduler must not be empty. """
+        return self.heap[0][0]
+
+    def pop_due(self, now: float) -> List[Action]:
+        """ Remove and return every action due at or before now. """
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            due.append(heapq.heappop(self.heap)[2])
+        return due
+
+    def clear(self):
+        self.heap = []
@@ -0,0 +1,78 @@
+"""
+Recursive symmetric shadowcasting for Field Of Vision (FOV).
+
+Walks the grid one row at a time in each of the four quadrants around the
+viewer, only visiting cells that can actually be seen. Slopes are kept as
+integer fractions so the rounding stays exact.
+"""
+from typing import Callable, Set, Tuple
+
+# (row, column) -> (dx, dy) multipliers for the four quadrants
+_QUADRANTS = [
+    ((0, 1), (1, 0)),  # North
+    ((0, -1), (1, 0)),  # South
+    ((1, 0), (0, 1)),  # East
+    ((-1, 0), (0, 1)),  # West
+]
+
+
+def compute_fov(
+    origin_x: int,
+    origin_y: int,
+    radius: int,
+    is_opaque: Callable[[int, int], bool],
+) -> Set[Tuple[int, int]]:
+    """
+    Return the set of (x, y) grid locations visible from the origin.
+
+    :param origin_x: Grid column of the viewer
+    :param origin_y: Grid row of the viewer
+    :param radius: How far the viewer can see
+    :param is_opaque: Callback returning True if a grid location blocks sight
+    """
+    visible = {(origin_x, origin_y)}
+    radius_squared = radius * radius
+
+    for (row_dx, row_dy), (col_dx, col_dy) in _QUADRANTS:
+
+        def transform(depth, col):
+            return (
+                origin_x + depth * row_dx + col * col_dx,
+                origin_y + depth * row_dy + col * col_dy,
+            )
+
+        def scan(depth, start_num, start_den, end_num, end_den):
+            if depth > radius:
+                return
+
+            # Columns covered by this row, rounding ties toward the centre
+            min_col = (2 * depth * start_num + start_den) // (2 * start_den)
+            max_col = -((-(2 * depth * end_num - end_den)) // (2 * end_den))
+
+            prev_opaque = None
+            for col in range(min_col, max_col + 1):
+                x, y = transform(depth, col)
+                opaque = is_opaque(x, y)
+
+                # Walls are always revealed, floors only if symmetric
+                if depth * depth + col * col <= radius_squared and (
+                    opaque
+                    or (
+                        col * start_den >= depth * start_num
+                        and col * end_den <= depth * end_num
+                    )
+                ):
+                    visible.add((x, y))
+
+                if prev_opaque and not opaque:
+                    start_num, start_den = 2 * col - 1, 2 * depth
+                if prev_opaque is False and opaque:
+                    scan(depth + 1, start_num, start_den, 2 * col - 1, 2 * depth)
+                prev_opaque = opaque
+
+            if prev_opaque is False:
+                scan(depth + 1, start_num, start_den, end_num, end_den)
+
+        scan(1, -1, 1, 1, 1)
+
+    return visible
@@ -0,0 +1,81 @@
+"""
+Play the game with no window, sound or OpenGL, for balancing and
+regression runs. The player either wanders at random until it dies or
+runs out of turns, or repeats the inputs from a replay file.
+
+    python simulate.py --turns 10000 --seed 1 --record session.bin
+    python simulate.py --replay session.bin
+"""
+import argparse
+import os
+import random
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from game_engine import GameEngine
+
+DIRECTIONS = [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]
+
+
+def simulate(game_engine: "GameEngine", turns: int, walker: random.Random) -> int:
+    """
+    Move the player at random for a number of turns, processing every
+    action each turn causes.
+
+    :param walker: Where to get the moves from. A stream of its own, so the
+                   moves don't change what the game's random numbers are.
+    :returns: How many turns were played
+    """
+    for turn in range(turns):
+        if game_engine.player.is_dead:
+            return turn
+        dx, dy = walker.choice(DIRECTIONS)
+        game_engine.move_player(dx, dy)
+        game_engine.run_until_idle()
+    return turns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play the game headless, moving at random or from a replay.")
+    parser.add_argument("--turns", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--record", help="Write the moves to this replay file")
+    parser.add_argument("--replay", help="Play the inputs from this replay file instead of moving at random")
+    args = parser.parse_args()
+
+    # Only when run as a program, so importing simulate doesn't change the
+    # environment. Has to be set before the asset cache is imported.
+    os.environ.setdefault("DUNGEON_CRAWLER_HEADLESS", "1")
+    from game_engine import GameEngine
+    from random_streams import rng
+    from replay import play_replay
+
+    game_engine = GameEngine()
+    start = time.perf_counter()
+    if args.replay:
+        turns = play_replay(game_engine, args.replay)
+    else:
+        if args.record:
+            try:
+                game_engine.start_recording(args.record, args.seed)
+            except ValueError as e:
+                parser.error(str(e))
+        else:
+            rng.seed(args.seed)
+        game_engine.setup()
+        start = time.perf_counter()
+        # From the master seed, so --seed with the printed seed repeats the run
+        turns = simulate(game_engine, args.turns, rng.stream("walker"))
+        game_engine.stop_recording()
+    seconds = time.perf_counter() - start
+
+    player = game_engine.player
+    print(f"{turns} turns in {seconds:.2f} s ({turns / max(seconds, 1e-9):,.0f} turns/s), seed {rng.master_seed}")
+    print(f"Player at ({player.x}, {player.y}) on level {game_engine.cur_level.level}, "
+          f"HP {player.fighter.hp}/{player.fighter.max_hp}, XP {player.fighter.current_xp}, "
+          f"{'dead' if player.is_dead else 'alive'}")
+
+
+if __name__ == "__main__":
+    main()
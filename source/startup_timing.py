@@ -0,0 +1,46 @@
+"""
+Where the time goes while the game starts up
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+# Close enough to when the game started, as this is imported first
+START_TIME = time.perf_counter()
+
+# (label, seconds, thread name), for each step that was timed
+timings: List[Tuple[str, float, str]] = []
+
+# (label, seconds since start)
+milestones: List[Tuple[str, float]] = []
+
+
+def record(label: str, seconds: float):
+    timings.append((label, seconds, threading.current_thread().name))
+
+
+@contextmanager
+def timed(label: str):
+    """ Record how long the code in the with block takes. """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(label, time.perf_counter() - start)
+
+
+def mark(label: str):
+    """ Record how long it has been since the game started. """
+    milestones.append((label, time.perf_counter() - START_TIME))
+
+
+def report() -> str:
+    lines = ["Startup timing:"]
+    main_thread = threading.main_thread().name
+    for label, seconds, thread_name in timings:
+        where = "" if thread_name == main_thread else f" ({thread_name})"
+        lines.append(f"  {seconds * 1000:8.1f} ms  {label}{where}")
+    for label, seconds in milestones:
+        lines.append(f"  {seconds * 1000:8.1f} ms  since start: {label}")
+    return "\n".join(lines)
@@ -1,6 +1,6 @@
 import pathlib
 
-from arcade import load_texture
+from asset_cache import assets
 from themes.current_theme import *
 
 assets_path = pathlib.Path(__file__).resolve().parent / "tiny_dungeon"
@@ -48,4 +48,6 @@ filenames = [
 ]
 
 # Load  the textures our sprites use on game start-up.
-textures = [load_texture(str(assets_path / filename)) for filename in filenames]
+texture_paths = [assets_path / filename for filename in filenames]
+assets.preload("custom_1", textures=texture_paths)
+textures = [assets.texture(path) for path in texture_paths]
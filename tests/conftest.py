@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from level_grid import LevelGrid
+from load_map.dungeon_map import DungeonMap
+
+CELL_BIT = {
+    "nothing": 0,
+    "block": 1,
+    "room": 2,
+    "corridor": 4,
+    "perimeter": 16,
+    "aperture": 32,
+    "room_id": 65472,
+    "arch": 65536,
+    "door": 131072,
+    "locked": 262144,
+    "trapped": 524288,
+    "secret": 1048576,
+    "portcullis": 2097152,
+    "stair_down": 4194304,
+    "stair_up": 8388608,
+    "label": 4278190080,
+}
+
+
+@pytest.fixture
+def cell_bit():
+    """ The bitmask from a real levels/level_NN.json file. """
+    return dict(CELL_BIT)
+
+
+@pytest.fixture
+def make_dungeon_map():
+    """ Builds a random mix of room, corridor, door and solid rock. """
+
+    def make(width=12, height=9, seed=3):
+        rng = random.Random(seed)
+        dungeon_map = DungeonMap()
+        dungeon_map.bitmask = dict(CELL_BIT)
+        dungeon_map.map_width = width
+        dungeon_map.map_height = height
+        dungeon_map.cells.extend(rng.choice([0, 0, 2, 4, 4 | 131072]) for _ in range(width * height))
+        dungeon_map.decode_cells()
+        return dungeon_map
+
+    return make
+
+
+@pytest.fixture
+def grid():
+    """ A 10x10 room with a wall down the middle, open at the top. """
+    grid = LevelGrid(10, 10)
+    for x in range(10):
+        for y in range(10):
+            if x in (0, 9) or y in (0, 9) or (x == 5 and y < 7):
+                grid.set_flag(x, y, LevelGrid.BLOCKS)
+            else:
+                grid.set_flag(x, y, LevelGrid.WALKABLE)
+    return grid
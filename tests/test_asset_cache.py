@@ -0,0 +1,82 @@
+import pytest
+
+from asset_cache import AssetCache
+
+
+@pytest.fixture
+def cache(mocker):
+    mocker.patch("asset_cache.arcade.load_sound", side_effect=lambda path: ("sound", path))
+    mocker.patch("asset_cache.arcade.load_texture", side_effect=lambda path: ("texture", path))
+    return AssetCache()
+
+
+def test_loads_once(cache):
+    first = cache.sound("a.ogg")
+
+    assert cache.sound("a.ogg") is first
+    assert cache.texture("a.png") is cache.texture("a.png")
+
+
+def test_groups_share_assets(cache):
+    cache.preload("one", sounds=["a.ogg"], textures=["a.png", "b.png"])
+    cache.preload("two", textures=["b.png"])
+    b = cache.texture("b.png")
+
+    assert cache.ref_counts == {"a.ogg": 1, "a.png": 1, "b.png": 2}
+
+    cache.unload("one")
+    assert set(cache.textures) == {"b.png"}
+    assert cache.sounds == {}
+    assert cache.texture("b.png") is b
+
+    cache.unload("two")
+    assert cache.textures == {}
+
+
+def test_group_errors(cache):
+    cache.preload("one", sounds=["a.ogg"])
+
+    with pytest.raises(ValueError):
+        cache.preload("one")
+    with pytest.raises(ValueError):
+        cache.unload("two")
+
+
+def test_lazy_sound_loads_on_first_play(cache, mocker):
+    sound = mocker.Mock()
+    load_sound = mocker.patch("asset_cache.arcade.load_sound", return_value=sound)
+
+    lazy = cache.lazy_sound("a.ogg")
+    assert cache.lazy_sounds == {"a.ogg"}
+    load_sound.assert_not_called()
+
+    lazy.play(0.5)
+    lazy.play(0.5)
+    load_sound.assert_called_once_with("a.ogg")
+    assert sound.play.call_count == 2
+
+
+def test_load_in_background(cache):
+    cache.load_in_background(["a.ogg", "b.ogg"])
+    cache.load_in_background(["a.ogg"])
+
+    assert set(cache.pending) == {"a.ogg", "b.ogg"}
+    assert cache.sound("a.ogg") == ("sound", "a.ogg")
+    assert set(cache.pending) == {"b.ogg"}
+    assert cache.sound("a.ogg") is cache.sounds["a.ogg"]
+
+
+def test_headless_loads_nothing(mocker):
+    load_sound = mocker.patch("asset_cache.arcade.load_sound")
+    load_texture = mocker.patch("asset_cache.arcade.load_texture")
+    cache = AssetCache(headless=True)
+
+    cache.preload("one", sounds=["a.ogg"], textures=["a.png"])
+    cache.load_in_background(["b.ogg"])
+    cache.lazy_sound("b.ogg").play()
+
+    assert cache.sound("a.ogg") is cache.null_sound
+    assert cache.texture("a.png") is cache.null_texture
+    load_sound.assert_not_called()
+    load_texture.assert_not_called()
+    assert cache.pending == {}
@@ -0,0 +1,35 @@
+import pytest
+
+from entities.astar import astar, octile_distance
+from level_grid import LevelGrid
+
+
+def test_octile_distance():
+    assert octile_distance((0, 0), (3, 0)) == 3
+    assert octile_distance((0, 0), (2, 2)) == pytest.approx(2 * 2 ** 0.5)
+
+
+def test_straight_path(grid):
+    assert astar(grid, (1, 1), (4, 1)) == [(1, 1), (2, 1), (3, 1), (4, 1)]
+
+
+def test_path_goes_around_wall(grid):
+    path = astar(grid, (3, 2), (7, 2))
+
+    assert path[0] == (3, 2)
+    assert path[-1] == (7, 2)
+    assert (5, 7) in path
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+        assert max(abs(x1 - x2), abs(y1 - y2)) == 1
+        assert not grid.is_blocked(x2, y2)
+
+
+def test_no_path(grid):
+    grid.set_flag(5, 7, LevelGrid.BLOCKS)
+    grid.set_flag(5, 8, LevelGrid.BLOCKS)
+
+    assert astar(grid, (3, 2), (7, 2)) is None
+
+
+def test_gives_up_after_node_budget(grid):
+    assert astar(grid, (3, 2), (7, 2), max_nodes=5) is None
@@ -0,0 +1,146 @@
+from array import array
+
+import pytest
+
+from autotile import ABOVE, BELOW, LEFT, NE, NW, RIGHT, SE, SW
+from autotile import WALL_TEXTURE_TABLE
+from autotile import choose_wall_texture
+from autotile import get_empty_cells
+from autotile import get_neighbor_masks
+from autotile import get_wall_textures
+from themes.current_theme import *
+
+NEIGHBORS = {
+    LEFT: (0, -1),
+    RIGHT: (0, 1),
+    ABOVE: (-1, 0),
+    BELOW: (1, 0),
+    NW: (-1, -1),
+    NE: (-1, 1),
+    SW: (1, -1),
+    SE: (1, 1),
+}
+
+
+def test_table_matches_chain():
+    assert len(WALL_TEXTURE_TABLE) == 256
+    for mask in range(256):
+        assert WALL_TEXTURE_TABLE[mask] == choose_wall_texture(mask)
+
+
+def test_neighbor_masks(make_dungeon_map):
+    dungeon_map = make_dungeon_map(9, 7, seed=1)
+    empty = get_empty_cells(dungeon_map)
+    padded_width = dungeon_map.map_width + 2
+
+    masks = get_neighbor_masks(empty, padded_width)
+
+    for row in range(1, dungeon_map.map_height + 1):
+        for column in range(1, dungeon_map.map_width + 1):
+            expected = 0
+            for bit, (d_row, d_column) in NEIGHBORS.items():
+                if empty[(row + d_row) * padded_width + column + d_column]:
+                    expected |= bit
+            assert masks[row * padded_width + column] == expected
+
+
+def is_open(game_map, row, column):
+    if 0 <= row < game_map.map_height and 0 <= column < game_map.map_width:
+        tile = game_map.tile(row, column)
+        return bool((tile.corridor or tile.room) and not tile.door)
+    return False
+
+
+def baseline_wall_texture(game_map, row, column):
+    """ The wall chain as dungeon_map_to_sprites had it before the table, for comparison. """
+    left_empty = is_open(game_map, row, column - 1)
+    right_empty = is_open(game_map, row, column + 1)
+    below_empty = is_open(game_map, row + 1, column)
+    above_empty = is_open(game_map, row - 1, column)
+    nw_empty = is_open(game_map, row - 1, column - 1)
+    ne_empty = is_open(game_map, row - 1, column + 1)
+    sw_empty = is_open(game_map, row + 1, column - 1)
+    se_empty = is_open(game_map, row + 1, column + 1)
+
+    texture_id = WALL_TEXTURE_ID
+    if not left_empty and not right_empty and not above_empty and sw_empty and se_empty and ne_empty and nw_empty:
+        texture_id = CENTER_WALL_CROSS
+    elif not below_empty and left_empty and right_empty and sw_empty and se_empty and above_empty:
+        texture_id = TOP_CAP
+    elif nw_empty and ne_empty and not above_empty and right_empty and not left_empty and below_empty:
+        texture_id = WALL_RIGHT_CORNER
+    elif left_empty and not right_empty and above_empty and below_empty:
+        texture_id = LEFT_SHORT_WALL
+    elif below_empty and not right_empty and not left_empty and above_empty:
+        texture_id = WALL_SHORT
+    elif not below_empty and above_empty and sw_empty and se_empty and not right_empty and not left_empty:
+        texture_id = WALL_SHORT
+    elif below_empty and not right_empty and left_empty and not above_empty and ne_empty:
+        texture_id = BOTTOM_LEFT_CORNER_HOLLOW
+    elif not right_empty and left_empty and nw_empty and ne_empty and not above_empty and se_empty:
+        texture_id = BOTTOM_LEFT_CORNER_HOLLOW
+    elif below_empty and right_empty and not left_empty and above_empty:
+        texture_id = WALL_SHORT_RIGHT
+    elif not below_empty and not above_empty and left_empty and right_empty:
+        texture_id = WALL_MID_ID
+    elif not below_empty and not above_empty and not left_empty and right_empty and nw_empty and sw_empty:
+        texture_id = WALL_RIGHT_CORNER
+    elif left_empty and above_empty and se_empty:
+        texture_id = LEFT_SHORT_WALL
+    elif not left_empty and above_empty and right_empty and (below_empty or sw_empty):
+        texture_id = WALL_SHORT_RIGHT
+    elif left_empty and right_empty and not above_empty and below_empty and ne_empty and nw_empty:
+        texture_id = BOTTOM_END_CAP
+    elif above_empty and not below_empty and not left_empty and not right_empty and not se_empty and not sw_empty:
+        texture_id = TOP_WALL
+    elif above_empty and not below_empty and not left_empty and right_empty:
+        texture_id = TOP_WALL_RIGHT_CORNER
+    elif above_empty and not below_empty and left_empty and not right_empty:
+        texture_id = TOP_WALL_LEFT_CORNER
+    elif not above_empty and not right_empty and left_empty:
+        texture_id = LEFT_EDGE_WALL
+    elif not left_empty and not right_empty and nw_empty and not ne_empty and sw_empty:
+        texture_id = LEFT_EDGE_WALL
+    elif not above_empty and right_empty and not left_empty:
+        texture_id = RIGHT_EDGE_WALL
+    elif not above_empty and ne_empty and not right_empty and se_empty and not left_empty:
+        texture_id = RIGHT_EDGE_WALL
+    return texture_id
+
+
+def test_empty_cells(make_dungeon_map):
+    dungeon_map = make_dungeon_map(9, 7, seed=4)
+    empty = get_empty_cells(dungeon_map)
+    padded_width = dungeon_map.map_width + 2
+
+    assert len(empty) == padded_width * (dungeon_map.map_height + 2)
+    for row in range(-1, dungeon_map.map_height + 1):
+        for column in range(-1, dungeon_map.map_width + 1):
+            assert empty[(row + 1) * padded_width + column + 1] == is_open(dungeon_map, row, column)
+
+
+@pytest.mark.parametrize("seed", [2, 5, 6])
+def test_wall_textures_match_baseline(make_dungeon_map, seed):
+    dungeon_map = make_dungeon_map(20, 15, seed=seed)
+
+    wall_textures = get_wall_textures(dungeon_map)
+
+    assert len(wall_textures) == dungeon_map.map_width * dungeon_map.map_height
+    for row in range(dungeon_map.map_height):
+        for column in range(dungeon_map.map_width):
+            tile = dungeon_map.tile(row, column)
+            if is_open(dungeon_map, row, column) or tile.door:
+                expected = 0
+            else:
+                expected = baseline_wall_texture(dungeon_map, row, column)
+            assert wall_textures[dungeon_map.index(row, column)] == expected
+
+
+def test_wide_texture_ids(make_dungeon_map, mocker):
+    # Themes with more than 256 textures still fit
+    mocker.patch("autotile.WALL_TEXTURE_TABLE", array("H", [300 + mask for mask in range(256)]))
+    dungeon_map = make_dungeon_map(6, 5, seed=1)
+
+    wall_textures = get_wall_textures(dungeon_map)
+
+    assert any(texture >= 300 for texture in wall_textures)
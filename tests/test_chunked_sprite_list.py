@@ -0,0 +1,89 @@
+import pytest
+
+from chunked_sprite_list import ChunkedSpriteList, _ChunkSpriteList
+from entities.entity import Entity
+
+
+@pytest.fixture
+def sprite_list():
+    sprite_list = ChunkedSpriteList(chunk_size=4)
+    for x in range(10):
+        for y in range(6):
+            sprite_list.append(Entity(column=x, row=y))
+    return sprite_list
+
+
+def test_chunks(sprite_list):
+    assert len(sprite_list) == 60
+    assert len(sprite_list.chunks) == 6
+    assert len(sprite_list.chunks[(0, 0)]) == 16
+    assert len(sprite_list.chunks[(2, 1)]) == 4
+
+
+def test_lookups(sprite_list):
+    assert [(s.x, s.y) for s in sprite_list.at(5, 3)] == [(5, 3)]
+    assert sprite_list.at(20, 20) == []
+    assert len(sprite_list.in_rect(3, 3, 4, 4)) == 4
+    assert len(sprite_list.in_radius(4, 4, 1)) == 5
+    assert len(sprite_list.chunks_in_rect(3, 3, 4, 4)) == 4
+
+
+def test_move_between_chunks(sprite_list):
+    sprite = sprite_list.at(1, 1)[0]
+
+    sprite.x = 9
+
+    assert sprite in sprite_list
+    assert sprite in sprite_list.chunks[(2, 0)].sprite_list
+    assert sprite not in sprite_list.chunks[(0, 0)].sprite_list
+    assert sprite in sprite_list.at(9, 1)
+    assert sprite not in sprite_list.at(1, 1)
+    assert len(sprite_list) == 60
+
+
+def test_remove(sprite_list):
+    sprite = sprite_list.at(6, 2)[0]
+    sprite.x = 2
+
+    sprite.remove_from_sprite_lists()
+
+    assert sprite not in sprite_list
+    assert sprite_list.at(2, 2) != [sprite]
+    assert len(sprite_list) == 59
+
+    with pytest.raises(ValueError):
+        sprite_list.remove(sprite)
+
+
+@pytest.fixture
+def drawn(mocker):
+    """ Keys of the chunks drawn, in order, without needing OpenGL. """
+    keys = []
+    mocker.patch.object(_ChunkSpriteList, "draw", autospec=True,
+                        side_effect=lambda chunk, **kwargs: keys.append(chunk.key))
+    return keys
+
+
+@pytest.mark.parametrize("rect, expected", [
+    # Inside one chunk
+    ((1, 1, 2, 2), [(0, 0)]),
+    # Just over the edge of the first chunk on both axes
+    ((3, 3, 4, 4), [(0, 0), (0, 1), (1, 0), (1, 1)]),
+    # Partly off the map: only chunks that exist
+    ((7, -5, 20, 1), [(1, 0), (2, 0)]),
+    # Nowhere near the sprites
+    ((40, 40, 50, 50), []),
+    # Empty rectangle
+    ((5, 5, 4, 4), []),
+])
+def test_draw_in_rect(sprite_list, drawn, rect, expected):
+    assert [chunk.key for chunk in sprite_list.chunks_in_rect(*rect)] == expected
+
+    sprite_list.draw_in_rect(*rect, pixelated=True)
+
+    assert drawn == expected
+
+
+def test_draw(sprite_list, drawn):
+    sprite_list.draw()
+    assert sorted(drawn) == sorted(sprite_list.chunks)
@@ -0,0 +1,62 @@
+import pytest
+
+from entities.creature_factory import bucket_by_challenge
+from entities.creature_factory import get_random_monster_by_challenge
+from entities.creature_factory import load_creatures
+from entities.creature_factory import make_monster_sprite
+from entities.fighter import FighterStore
+from random_streams import rng
+from themes.current_theme import textures
+
+
+@pytest.fixture
+def templates(tmp_path):
+    path = tmp_path / "creatures.tsv"
+    path.write_text(
+        "Name\tAttack\tDefense\tHP\tXP\tChallenge\tTexture\tWeight\n"
+        "Orc\t3\t0\t10\t35\t1\torc.png\t3\n"
+        "Rat\t3\t0\t1\t10\t1\trat.png\t\n"
+        "Troll\t4\t1\t16\t100\t2\ttroll.png\t1\n"
+    )
+    return load_creatures(path)
+
+
+def test_templates_are_parsed(templates):
+    orc, rat, troll = templates
+
+    assert (orc.name, orc.attack, orc.defense, orc.hp, orc.xp) == ("Orc", 3, 0, 10, 35)
+    assert (troll.challenge, troll.texture) == (2, "troll.png")
+    assert orc.weight == 3
+    assert rat.weight == 1
+
+
+def test_buckets_are_weighted(templates):
+    buckets = bucket_by_challenge(templates)
+
+    assert [template.name for template in buckets[1].templates] == ["Orc", "Rat"]
+    assert buckets[1].cumulative_weights == [3, 4]
+
+    rng.seed(1)
+    names = [buckets[1].choose().name for _ in range(400)]
+    assert 250 < names.count("Orc") < 350
+    assert buckets[2].choose().name == "Troll"
+
+
+def test_unknown_challenge():
+    with pytest.raises(ValueError):
+        get_random_monster_by_challenge(99)
+
+
+def test_make_monster_sprite(templates, mocker):
+    texture = mocker.patch("entities.creature_factory.assets.texture", return_value=textures[0])
+    store = FighterStore()
+
+    sprite = make_monster_sprite(templates[2], store=store)
+
+    texture.assert_called_once_with("troll.png")
+    assert sprite.name == "Troll"
+    assert sprite.blocks
+    assert sprite.ai.owner is sprite
+    assert sprite.fighter in store
+    assert (sprite.fighter.hp, sprite.fighter.max_hp, sprite.fighter.power) == (16, 16, 4)
+    assert sprite.fighter.xp_reward == 100
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from load_map.dungeon_map import DungeonMap, TILE_FIELDS
+
+
+@pytest.fixture
+def dungeon_map(tmp_path, cell_bit):
+    room_3 = 2 | (3 << 6)
+    cells = [
+        [16, 16, 16],
+        [16, room_3, 4 | 131072],
+        [16, room_3 | (ord("A") << 24), 4194304],
+    ]
+    data = {"cells": cells, "cell_bit": cell_bit, "rooms": [None, {"id": 3, "contents": {}}]}
+    filename = tmp_path / "level_01.json"
+    filename.write_text(json.dumps(data))
+
+    dungeon_map = DungeonMap()
+    dungeon_map.load(filename)
+    return dungeon_map
+
+
+def test_size(dungeon_map):
+    assert dungeon_map.map_height == 3
+    assert dungeon_map.map_width == 3
+
+
+def test_fields_match_get_bitmask_value(dungeon_map):
+    for row in range(dungeon_map.map_height):
+        for column in range(dungeon_map.map_width):
+            tile = dungeon_map.tile(row, column)
+            for key in TILE_FIELDS:
+                assert getattr(tile, key) == dungeon_map.get_bitmask_value(key, tile.cell)
+
+
+def test_decoded_values(dungeon_map):
+    assert dungeon_map.tile(1, 1).room == 1
+    assert dungeon_map.tile(1, 1).room_id == 3
+    assert dungeon_map.tile(2, 1).label == ord("A")
+    assert dungeon_map.tile(1, 2).corridor == 1
+    assert dungeon_map.tile(1, 2).door == 1
+    assert dungeon_map.tile(2, 2).stair_down == 1
+    assert dungeon_map.tile(0, 0).perimeter == 1
+    assert dungeon_map.get_room(3).id == 3
+
+
+def test_fields_are_compact(dungeon_map):
+    assert dungeon_map.fields["room"].itemsize == 1
+    assert dungeon_map.fields["room_id"].itemsize == 2
+
+
+def test_tile_is_read_only(dungeon_map):
+    tile = dungeon_map.tile(1, 1)
+
+    with pytest.raises(AttributeError):
+        tile.room = 0
@@ -0,0 +1,48 @@
+import arcade
+
+from chunked_sprite_list import ChunkedSpriteList
+from entities.entity import Entity
+from indexed_sprite_list import IndexedSpriteList
+from util import char_to_pixel
+
+
+def test_set_cell_moves_in_every_list(mocker):
+    sprite = Entity(1, 1)
+    creatures = IndexedSpriteList()
+    everything = IndexedSpriteList()
+    chunked = ChunkedSpriteList(chunk_size=4)
+    plain = arcade.SpriteList()
+    for sprite_list in (creatures, everything, chunked, plain):
+        sprite_list.append(sprite)
+    spy = mocker.spy(IndexedSpriteList, "update_cell")
+
+    sprite.set_cell(2, 3)
+
+    assert (sprite._x, sprite._y) == (sprite.x, sprite.y) == (2, 3)
+    assert sprite.position == char_to_pixel(2, 3)
+    # Once per indexed list, not once for x and again for y
+    assert spy.call_count == 3
+    for sprite_list in (creatures, everything, chunked):
+        assert sprite_list.at(2, 3) == [sprite]
+        assert sprite_list.at(1, 1) == []
+    assert sprite in plain
+
+
+def test_setters_move_between_chunks():
+    sprite = Entity(1, 1)
+    creatures = IndexedSpriteList()
+    chunked = ChunkedSpriteList(chunk_size=4)
+    creatures.append(sprite)
+    chunked.append(sprite)
+
+    sprite.x = 5
+    assert sprite in chunked.chunks[(1, 0)].sprite_list
+    assert sprite not in chunked.chunks[(0, 0)].sprite_list
+
+    sprite.y = 9
+    assert sprite.position == char_to_pixel(5, 9)
+    assert sprite in chunked.chunks[(1, 2)].sprite_list
+    assert chunked.at(5, 9) == [sprite]
+    assert creatures.at(5, 9) == [sprite]
+    assert chunked.at(5, 1) == [] and creatures.at(5, 1) == []
+    assert len(chunked) == 1
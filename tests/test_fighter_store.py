@@ -0,0 +1,95 @@
+import gc
+import weakref
+
+import pytest
+
+from actions import Dying
+from entities.entity import Entity
+from entities.fighter import Fighter
+from entities.fighter import FighterStore
+
+
+def make_monster(hp, store=None):
+    return Entity(fighter=Fighter(hp=hp, defense=1, power=3, store=store))
+
+
+def test_fighter_is_a_view_of_its_store():
+    store = FighterStore()
+    monster = make_monster(10, store)
+
+    assert monster.fighter in store
+    assert store.columns["hp"][monster.fighter.index] == 10
+
+    monster.fighter.hp -= 4
+    assert store.columns["hp"][monster.fighter.index] == 6
+    assert monster.fighter.get_dict()["max_hp"] == 10
+
+
+def test_add_and_remove_keep_stats():
+    store = FighterStore()
+    monster = make_monster(10)
+    monster.fighter.power = 7
+
+    store.add(monster.fighter)
+    assert len(store) == 1
+    assert monster.fighter.power == 7
+
+    store.remove(monster.fighter)
+    assert len(store) == 0
+    assert monster.fighter not in store
+    assert monster.fighter.power == 7
+
+    # The freed slot gets used again
+    other = make_monster(5, store)
+    assert other.fighter.index == 0
+
+    with pytest.raises(ValueError):
+        store.remove(monster.fighter)
+
+
+def test_standalone_fighters_are_not_kept():
+    monster = make_monster(3)
+    other = make_monster(3)
+    assert monster.fighter.store is not other.fighter.store
+
+    monster_ref = weakref.ref(monster)
+    store_ref = weakref.ref(monster.fighter.store)
+    del monster
+    gc.collect()
+
+    assert monster_ref() is None
+    assert store_ref() is None
+
+
+def test_apply_damage():
+    store = FighterStore()
+    monsters = [make_monster(hp, store) for hp in (5, 10, 20)]
+
+    results = store.apply_damage([(monster.fighter, 8) for monster in monsters]
+                                 + [(monsters[0].fighter, 8)])
+
+    assert [type(result) for result in results] == [Dying]
+    assert results[0].target is monsters[0]
+    assert monsters[0].is_dead
+    assert monsters[0].fighter.hp == 0
+    assert [monster.fighter.hp for monster in monsters[1:]] == [2, 12]
+    assert store.living() == [monsters[1].fighter, monsters[2].fighter]
+
+    # Already dead, so only the new death is reported
+    results = store.apply_damage([(monsters[1].fighter, 2)])
+    assert [result.target for result in results] == [monsters[1]]
+
+
+def test_snapshot():
+    store = FighterStore()
+    monsters = [make_monster(hp, store) for hp in (5, 10)]
+    snapshot = store.snapshot()
+
+    store.apply_damage([(monster.fighter, 3) for monster in monsters])
+    store.restore_snapshot(snapshot)
+
+    assert [monster.fighter.hp for monster in monsters] == [5, 10]
+
+    make_monster(1, store)
+    with pytest.raises(ValueError):
+        store.restore_snapshot(snapshot)
@@ -0,0 +1,43 @@
+from entities.flow_field import FlowField, UNREACHABLE
+from level_grid import LevelGrid
+
+
+def test_distances(grid):
+    flow_field = FlowField(grid, (3, 2))
+
+    assert flow_field.distance(3, 2) == 0
+    assert flow_field.distance(4, 3) == 1
+    assert flow_field.distance(1, 1) == 2
+    assert flow_field.distance(5, 2) == UNREACHABLE
+    assert flow_field.distance(6, 2) == 10
+
+
+def test_next_step_follows_distances_around_wall(grid):
+    flow_field = FlowField(grid, (3, 2))
+
+    x, y = 7, 2
+    steps = 0
+    while (x, y) != (3, 2):
+        x, y = flow_field.next_step(x, y)
+        steps += 1
+
+    assert steps == flow_field.distance(7, 2)
+
+
+def test_next_step_avoids_occupied_cells(grid):
+    flow_field = FlowField(grid, (1, 1))
+    grid.set_flag(2, 1, LevelGrid.BLOCKS)
+
+    assert flow_field.next_step(3, 1) == (2, 2)
+
+    grid.set_flag(2, 2, LevelGrid.BLOCKS)
+
+    assert flow_field.next_step(3, 1) is None
+
+
+def test_max_distance(grid):
+    flow_field = FlowField(grid, (1, 1), max_distance=3)
+
+    assert flow_field.distance(4, 4) == 3
+    assert flow_field.distance(5, 8) == UNREACHABLE
+    assert flow_field.next_step(5, 8) is None
@@ -0,0 +1,221 @@
+import random
+import re
+from concurrent.futures import Future
+
+import pytest
+
+import actions
+from actions import Action, Delay, Dying, EnemyTurn, Message, Pickup, SelectItem
+from asset_cache import assets
+from chunked_sprite_list import ChunkedSpriteList
+from constants import DEATH_DELAY
+from entities.ai import BasicMonster
+from entities.entity import Entity
+from entities.fighter import Fighter
+from entities.inventory import Inventory
+from entities.tile import Floor, Wall
+from game_engine import GameEngine, GameLevel
+from indexed_sprite_list import IndexedSpriteList
+from simulate import simulate
+
+WIDTH = 8
+HEIGHT = 6
+
+
+def make_level(level_number=1):
+    """ A walled room with one monster in it. """
+    level = GameLevel()
+    level.level = level_number
+    level.dungeon_sprites = ChunkedSpriteList()
+    for x in range(WIDTH):
+        for y in range(HEIGHT):
+            if x in (0, WIDTH - 1) or y in (0, HEIGHT - 1):
+                level.dungeon_sprites.append(Wall(x, y))
+            else:
+                level.dungeon_sprites.append(Floor(x, y))
+    level.entities = ChunkedSpriteList()
+    level.creatures = IndexedSpriteList()
+    monster = Entity(5, 3, name="Orc", blocks=True, ai=BasicMonster(),
+                     fighter=Fighter(hp=10, defense=0, power=3, xp_reward=35))
+    level.creatures.append(monster)
+    level.add_fighters()
+    level.build_grid()
+    return level
+
+
+@pytest.fixture
+def engine(mocker, monkeypatch):
+    """ Game engine with no sound or textures, playing make_level. """
+    monkeypatch.setenv("DUNGEON_CRAWLER_HEADLESS", "1")
+    # The shared cache was made when first imported, so switch it over too
+    mocker.patch.object(assets, "headless", True)
+
+    engine = GameEngine()
+    engine.player = Entity(2, 2, name="Player", inventory=Inventory(capacity=5),
+                           fighter=Fighter(hp=30, defense=2, power=5, level=1))
+    engine.cur_level = make_level()
+    engine.levels.append(engine.cur_level)
+    yield engine
+    engine.level_loader.shutdown()
+
+
+def monster_of(engine):
+    return engine.cur_level.creatures[0]
+
+
+def test_every_action_has_its_handler(engine):
+    action_classes = {value for value in vars(actions).values()
+                      if isinstance(value, type) and issubclass(value, Action) and value is not Action}
+    assert set(engine.action_handlers) == action_classes
+
+    for action_class, handler in engine.action_handlers.items():
+        name = "on_" + re.sub(r"(?<!^)([A-Z])", r"_\1", action_class.__name__).lower()
+        assert handler.__func__ is getattr(GameEngine, name)
+
+
+def test_actions_reach_their_handler(engine, mocker):
+    queued = [EnemyTurn(), Message("Hello"), Pickup(), SelectItem(2)]
+    handlers = {}
+    for action in queued:
+        handlers[type(action)] = engine.action_handlers[type(action)] = mocker.Mock(return_value=None)
+    handlers[Message].return_value = [Message("Again")]
+    engine.action_queue.extend(queued)
+
+    engine.process_action_queue(0.0)
+
+    for action in queued:
+        handlers[type(action)].assert_called_once_with(action)
+    # What the handlers returned is queued for the next pass
+    assert [action.text for action in engine.action_queue] == ["Again"]
+
+
+def test_unknown_action(engine):
+    class Unknown(Action):
+        __slots__ = ()
+
+    engine.action_queue.append(Unknown())
+    with pytest.raises(TypeError):
+        engine.process_action_queue(0.0)
+
+
+def test_dying_goes_through_the_scheduler(engine):
+    monster = monster_of(engine)
+    engine.action_queue.append(Dying(monster))
+
+    engine.process_action_queue(0.0)
+    assert [type(action) for action in engine.action_queue] == [Message, Delay]
+
+    engine.process_action_queue(0.0)
+    assert engine.messages == ["Orc has been killed!"]
+    assert engine.action_queue == []
+    assert len(engine.scheduler) == 1
+    assert engine.scheduler.next_due() == DEATH_DELAY
+
+    # Not due yet
+    engine.process_action_queue(DEATH_DELAY / 2)
+    assert monster.blocks
+
+    engine.process_action_queue(DEATH_DELAY / 2)
+    assert len(engine.scheduler) == 0
+    assert not monster.blocks
+    assert not engine.cur_level.grid.is_blocked(monster.x, monster.y)
+    assert engine.player.fighter.current_xp == 35
+
+
+def test_run_until_idle(engine):
+    handled_at = []
+
+    def on_message(action):
+        handled_at.append((action.text, engine.game_time))
+
+    engine.action_handlers[Message] = on_message
+    engine.action_queue.extend([Delay(3.0, Message("late")), Delay(1.0, Message("early"))])
+
+    # Jumps straight to the first one, and stops before the second
+    engine.run_until_idle(2.0)
+    assert handled_at == [("early", 1.0)]
+    assert engine.game_time == 2.0
+    assert len(engine.scheduler) == 1
+    assert engine.action_queue == []
+
+    engine.run_until_idle()
+    assert handled_at == [("early", 1.0), ("late", 3.0)]
+    assert engine.game_time == 3.0
+    assert len(engine.scheduler) == 0
+    assert engine.action_queue == []
+
+
+def test_simulate(engine):
+    assert simulate(engine, 50, random.Random(1)) == 50
+    assert engine.action_queue == []
+    assert len(engine.scheduler) == 0
+    assert engine.cur_level.grid.in_bounds(engine.player.x, engine.player.y)
+    assert not isinstance(engine.cur_level.dungeon_sprites.at(engine.player.x, engine.player.y)[0], Wall)
+
+
+@pytest.fixture
+def load_level(engine, mocker):
+    """ Replaces GameEngine.load_level with one making make_level levels. """
+    mocker.patch("game_engine.PREFETCH_NEXT_LEVEL", False)
+    game_map = mocker.Mock()
+    game_map.place_player.side_effect = lambda player: player.set_cell(3, 3)
+    return mocker.patch.object(engine, "load_level", side_effect=lambda number: (make_level(number), game_map))
+
+
+def test_setup_level_uses_prefetched_level(engine, load_level):
+    engine.prefetch_level(2)
+    level = engine.setup_level(2)
+
+    assert level.level == 2
+    load_level.assert_called_once_with(2)
+    assert engine.next_level is None
+    assert (engine.player.x, engine.player.y) == (3, 3)
+    assert (3, 3) in level.visible_cells
+
+
+def test_setup_level_ignores_other_levels(engine, load_level):
+    future = Future()
+    future.set_result((make_level(3), None))
+    engine.next_level = 3, future
+
+    assert engine.setup_level(2).level == 2
+    load_level.assert_called_once_with(2)
+    assert engine.next_level is None
+
+
+def test_setup_level_raises_prefetch_error(engine, load_level):
+    future = Future()
+    future.set_exception(FileNotFoundError("level_02.json"))
+    engine.next_level = 2, future
+
+    with pytest.raises(FileNotFoundError):
+        engine.setup_level(2)
+    load_level.assert_not_called()
+
+
+def test_restore_drops_prefetched_level(engine):
+    data = engine.get_dict()
+    future = Future()
+    future.set_result((make_level(2), None))
+    engine.next_level = 2, future
+
+    engine.restore_from_dict(data)
+
+    assert engine.next_level is None
+    assert engine.cur_level.creatures[0].name == "Orc"
+
+
+def test_restore_drops_waiting_actions(engine):
+    data = engine.get_dict()
+    engine.action_queue.append(Dying(monster_of(engine)))
+    engine.process_action_queue(0.0)
+    engine.process_action_queue(0.0)
+    assert len(engine.scheduler) == 1
+    engine.action_queue.append(Message("Old game"))
+
+    engine.restore_from_dict(data)
+    engine.run_until_idle()
+
+    # The old monster's Dead action doesn't land on the restored game
+    assert engine.player.fighter.current_xp == 0
+    assert engine.messages == ["Orc has been killed!"]
@@ -368,11 +368,12 @@ class TestMyGame:
 
         window.draw_sprites_and_status_panel()
 
-        mock_engine.return_value.cur_level.dungeon_sprites.draw.assert_called_once_with(
-            filter=mock_gl.GL_NEAREST
+        visible_rect = window.get_visible_grid_rect()
+        mock_engine.return_value.cur_level.dungeon_sprites.draw_in_rect.assert_called_once_with(
+            *visible_rect, filter=mock_gl.GL_NEAREST
         )
-        mock_engine.return_value.cur_level.entities.draw.assert_called_once_with(
-            filter=mock_gl.GL_NEAREST
+        mock_engine.return_value.cur_level.entities.draw_in_rect.assert_called_once_with(
+            *visible_rect, filter=mock_gl.GL_NEAREST
         )
         mock_engine.return_value.cur_level.creatures.draw.assert_called_once_with(
             filter=mock_gl.GL_NEAREST
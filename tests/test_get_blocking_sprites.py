@@ -0,0 +1,49 @@
+import arcade
+import pytest
+
+from chunked_sprite_list import ChunkedSpriteList
+from entities.entity import Entity
+from entities.tile import Floor, Wall
+from get_blocking_sprites import first_blocker, get_blocking_sprites, is_blocked
+from indexed_sprite_list import IndexedSpriteList
+from util import char_to_pixel
+
+
+def fill(sprite_list):
+    """ Floor, a floor with a monster on it, and a wall. """
+    monster = Entity(2, 1, blocks=True)
+    wall = Wall(3, 1)
+    for sprite in [Floor(1, 1), Floor(2, 1), Entity(2, 1), monster, wall]:
+        sprite_list.append(sprite)
+    return monster, wall
+
+
+@pytest.mark.parametrize("list_class", [IndexedSpriteList, ChunkedSpriteList, arcade.SpriteList])
+def test_blockers(list_class):
+    sprite_list = list_class()
+    monster, wall = fill(sprite_list)
+
+    assert first_blocker(1, 1, sprite_list) is None
+    assert first_blocker(2, 1, sprite_list) is monster
+    assert first_blocker(3, 1, sprite_list) is wall
+    assert first_blocker(8, 8, sprite_list) is None
+
+    assert not is_blocked(1, 1, sprite_list)
+    assert is_blocked(2, 1, sprite_list)
+    assert is_blocked(3, 1, sprite_list)
+    assert get_blocking_sprites(2, 1, sprite_list) == [monster]
+    assert get_blocking_sprites(1, 1, sprite_list) is None
+
+
+@pytest.mark.parametrize("list_class", [IndexedSpriteList, arcade.SpriteList])
+def test_other_sprites_rejected(list_class):
+    sprite = arcade.Sprite()
+    sprite.x, sprite.y = 1, 1
+    sprite.position = char_to_pixel(1, 1)
+    sprite_list = list_class()
+    sprite_list.append(sprite)
+
+    with pytest.raises(TypeError):
+        first_blocker(1, 1, sprite_list)
+    with pytest.raises(TypeError):
+        is_blocked(1, 1, sprite_list)
@@ -0,0 +1,108 @@
+import pytest
+
+from entities.entity import Entity
+from indexed_sprite_list import IndexedSpriteList
+
+
+def cells_of(sprite_list):
+    """ Where the index thinks each sprite is. Must match where they are. """
+    index = {}
+    for (x, y), sprites in sprite_list._cells.items():
+        assert sprites, "empty cells should be dropped"
+        for sprite in sprites:
+            assert (sprite.x, sprite.y) == (x, y)
+            index[sprite] = (x, y)
+    assert index == sprite_list._sprite_cells
+    assert set(index) == set(sprite_list)
+    return index
+
+
+@pytest.fixture
+def sprite_list():
+    sprite_list = IndexedSpriteList()
+    for x, y in [(1, 1), (1, 1), (2, 5), (4, 3), (9, 9)]:
+        sprite_list.append(Entity(x, y))
+    return sprite_list
+
+
+def test_append_and_at(sprite_list):
+    cells_of(sprite_list)
+    assert len(sprite_list.at(1, 1)) == 2
+    assert sprite_list.at(0, 0) == []
+    assert list(sprite_list.iter_at(4, 3)) == sprite_list.at(4, 3)
+
+
+def test_insert_remove_pop(sprite_list):
+    sprite = Entity(4, 3)
+    sprite_list.insert(0, sprite)
+    assert sprite in sprite_list.at(4, 3)
+    assert len(sprite_list.at(4, 3)) == 2
+
+    sprite_list.remove(sprite)
+    assert sprite not in sprite_list.at(4, 3)
+    cells_of(sprite_list)
+
+    last = sprite_list.pop()
+    assert last.x == 9
+    assert sprite_list.at(9, 9) == []
+    cells_of(sprite_list)
+
+
+def test_remove_from_sprite_lists(sprite_list):
+    other = IndexedSpriteList()
+    sprite = sprite_list.at(2, 5)[0]
+    other.append(sprite)
+
+    sprite.remove_from_sprite_lists()
+
+    assert sprite_list.at(2, 5) == []
+    assert other.at(2, 5) == []
+    cells_of(sprite_list)
+    cells_of(other)
+
+
+def test_clear(sprite_list):
+    sprite_list.clear()
+    assert sprite_list.at(1, 1) == []
+    assert cells_of(sprite_list) == {}
+
+    sprite_list.append(Entity(3, 3))
+    assert len(sprite_list.at(3, 3)) == 1
+
+
+def test_moves_update_the_index(sprite_list):
+    sprite = sprite_list.at(4, 3)[0]
+
+    sprite.set_cell(6, 7)
+    assert sprite_list.at(4, 3) == []
+    assert sprite_list.at(6, 7) == [sprite]
+
+    sprite.move(-1, 0)
+    sprite.y = 0
+    assert sprite_list.at(5, 0) == [sprite]
+    cells_of(sprite_list)
+
+
+@pytest.mark.parametrize("rect", [
+    # Fewer grid locations than occupied cells: looks up each location
+    (1, 1, 2, 2),
+    (4, 3, 4, 3),
+    # More: scans the occupied cells instead
+    (0, 0, 4, 5),
+    (-10, -10, 20, 20),
+    (5, 5, 8, 8),
+])
+def test_in_rect(sprite_list, rect):
+    left, bottom, right, top = rect
+    expected = [sprite for sprite in sprite_list
+                if left <= sprite.x <= right and bottom <= sprite.y <= top]
+
+    assert sorted(sprite_list.in_rect(*rect), key=id) == sorted(expected, key=id)
+
+
+def test_in_radius(sprite_list):
+    near = sprite_list.in_radius(2, 2, 3)
+    assert sorted((sprite.x, sprite.y) for sprite in near) == [(1, 1), (1, 1), (2, 5), (4, 3)]
+
+    # (4, 3) is just over 2 away
+    assert sorted((sprite.x, sprite.y) for sprite in sprite_list.in_radius(2, 2, 2)) == [(1, 1), (1, 1)]
@@ -0,0 +1,88 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from load_map.dungeon_map import TILE_FIELDS
+from load_map.level_cache import cache_filename, compile_level, load_dungeon_map, read_cache, write_cache
+
+
+@pytest.fixture
+def level_filename(tmp_path, cell_bit):
+    cells = [
+        [16, 16, 16, 16],
+        [16, 2 | (3 << 6), 2 | (3 << 6), 16],
+        [16, 4 | 131072, 4194304, 16],
+        [16, 16, 16, 16],
+    ]
+    rooms = [None, {"id": 3, "contents": {"detail": {"room_features": "A fountain"}}}]
+    filename = tmp_path / "level_01.json"
+    filename.write_text(json.dumps({"cells": cells, "cell_bit": cell_bit, "rooms": rooms}))
+    return str(filename)
+
+
+def test_missing_cache(level_filename):
+    assert read_cache(level_filename) is None
+
+
+def test_round_trip(level_filename):
+    compiled = compile_level(level_filename)
+    assert os.path.exists(cache_filename(level_filename))
+
+    cached = read_cache(level_filename)
+
+    assert cached.map_width == compiled.map_width
+    assert cached.map_height == compiled.map_height
+    assert cached.cells == compiled.cells
+    for key in TILE_FIELDS:
+        assert cached.fields[key] == compiled.fields[key]
+    assert cached.wall_textures == compiled.wall_textures
+    assert cached.get_room(3).room_features == "A fountain"
+    assert cached.tile(1, 1).room_id == 3
+    assert cached.get_bitmask_value("room_id", cached.tile(1, 1).cell) == 3
+
+
+def test_stale_cache(level_filename):
+    compile_level(level_filename)
+    stat = os.stat(level_filename)
+    os.utime(level_filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert read_cache(level_filename) is None
+    assert load_dungeon_map(level_filename).map_width == 4
+    assert read_cache(level_filename) is not None
+
+
+@pytest.mark.parametrize("keep", [-500, -1, 40])
+def test_truncated_cache(level_filename, keep):
+    compile_level(level_filename)
+    with open(cache_filename(level_filename), "rb") as f:
+        data = f.read()
+    # Cut off the end, or everything after the header and a little metadata
+    with open(cache_filename(level_filename), "wb") as f:
+        f.write(data[:keep])
+
+    assert read_cache(level_filename) is None
+    dungeon_map = load_dungeon_map(level_filename)
+    assert len(dungeon_map.wall_textures) == dungeon_map.map_width * dungeon_map.map_height
+    assert read_cache(level_filename) is not None
+
+
+def test_wall_textures_changed(level_filename, mocker):
+    compile_level(level_filename)
+    # Like switching to a theme with different wall texture ids
+    mocker.patch("load_map.level_cache.WALL_TEXTURE_FINGERPRINT", b"\0" * 8)
+
+    assert read_cache(level_filename) is None
+    load_dungeon_map(level_filename)
+    assert read_cache(level_filename) is not None
+
+
+def test_writers_use_their_own_temp_file(level_filename):
+    dungeon_map = compile_level(level_filename)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for future in [executor.submit(write_cache, dungeon_map, level_filename) for _ in range(8)]:
+            future.result()
+
+    assert read_cache(level_filename).wall_textures == dungeon_map.wall_textures
+    assert [name for name in os.listdir(os.path.dirname(level_filename)) if name.endswith(".tmp")] == []
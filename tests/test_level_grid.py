@@ -0,0 +1,95 @@
+from entities.entity import Entity
+from entities.tile import Door, Floor, Wall
+from level_grid import LevelGrid
+
+
+def make_grid():
+    """ A 3x2 level: wall, floor, door on the top row, floor below. """
+    terrain = [Wall(0, 0), Floor(1, 0), Door(2, 0), Floor(0, 1), Floor(1, 1), Floor(2, 1)]
+    return LevelGrid.from_sprites(terrain, [Entity(1, 1, blocks=True)])
+
+
+def test_from_sprites():
+    grid = make_grid()
+
+    assert (grid.width, grid.height) == (3, 2)
+    assert grid.is_blocked(0, 0) and grid.blocks_sight(0, 0) and not grid.is_walkable(0, 0)
+    assert not grid.is_blocked(1, 0) and not grid.blocks_sight(1, 0) and grid.is_walkable(1, 0)
+    assert not grid.is_blocked(2, 0) and grid.blocks_sight(2, 0) and grid.is_walkable(2, 0)
+    # The creature blocks its cell, but the floor under it is still walkable
+    assert grid.is_blocked(1, 1) and grid.is_walkable(1, 1)
+
+
+def test_off_map_blocks():
+    grid = make_grid()
+    for x, y in [(-1, 0), (3, 0), (0, -1), (0, 2)]:
+        assert grid.is_blocked(x, y)
+        assert grid.blocks_sight(x, y)
+        assert not grid.is_walkable(x, y)
+
+
+def test_occupants_kept_apart_from_terrain():
+    grid = make_grid()
+    creature = Entity(1, 1, blocks=True)
+    crate = Entity(1, 1)
+    crate.block_sight = True
+
+    grid.update_occupants(1, 1, [creature, crate])
+    assert grid.is_blocked(1, 1) and grid.blocks_sight(1, 1)
+
+    # Leaving the cell restores the terrain's own flags
+    grid.update_occupants(1, 1, [])
+    assert not grid.is_blocked(1, 1) and not grid.blocks_sight(1, 1)
+    assert grid.is_walkable(1, 1)
+
+    # Creatures standing on a wall don't make it walkable when they leave
+    grid.update_occupants(0, 0, [creature])
+    grid.update_occupants(0, 0, [])
+    assert grid.is_blocked(0, 0) and not grid.is_walkable(0, 0)
+
+
+def test_update_cell_replaces_terrain():
+    grid = make_grid()
+
+    grid.update_cell(0, 0, [Floor(0, 0)], [])
+    assert not grid.is_blocked(0, 0) and grid.is_walkable(0, 0)
+    assert grid.terrain[0] == LevelGrid.WALKABLE
+
+    # No terrain at all is rock: not walkable, but nothing to bump into either
+    grid.update_cell(0, 0, [], [])
+    assert grid.terrain[0] == 0 and not grid.is_walkable(0, 0)
+
+
+def test_set_terrain_keeps_seen_flags():
+    grid = make_grid()
+    grid.set_flag(1, 0, LevelGrid.EXPLORED | LevelGrid.VISIBLE)
+
+    grid.set_terrain(1, 0, LevelGrid.BLOCKS | LevelGrid.BLOCK_SIGHT)
+
+    assert grid.is_blocked(1, 0) and grid.blocks_sight(1, 0) and not grid.is_walkable(1, 0)
+    assert grid.is_explored(1, 0) and grid.is_visible(1, 0)
+    assert grid.terrain[1] == LevelGrid.BLOCKS | LevelGrid.BLOCK_SIGHT
+
+
+def test_update_visible():
+    grid = make_grid()
+
+    grid.update_visible({(0, 0), (1, 0), (5, 5)}, set())
+    assert grid.is_visible(0, 0) and grid.is_explored(0, 0)
+    assert grid.is_visible(1, 0)
+
+    grid.update_visible({(1, 0), (1, 1)}, {(0, 0), (1, 0), (5, 5)})
+    assert not grid.is_visible(0, 0) and grid.is_explored(0, 0)
+    assert grid.is_visible(1, 0) and grid.is_visible(1, 1)
+    assert not grid.is_explored(2, 1)
+
+
+def test_clear_flag():
+    grid = make_grid()
+    grid.update_visible({(0, 0), (1, 1)}, set())
+
+    grid.clear_flag(LevelGrid.VISIBLE)
+
+    assert not any(value & LevelGrid.VISIBLE for value in grid.flags)
+    assert grid.is_explored(0, 0) and grid.is_explored(1, 1)
+    assert grid.is_blocked(0, 0) and grid.is_blocked(1, 1)
@@ -0,0 +1,55 @@
+import recalculate_fov as fov_module
+from entities.tile import Floor, Wall
+from indexed_sprite_list import IndexedSpriteList
+from level_grid import LevelGrid
+from recalculate_fov import recalculate_fov
+
+WIDTH = 16
+HEIGHT = 9
+
+
+def make_level():
+    """ An open room with a short wall in the middle. """
+    sprite_list = IndexedSpriteList()
+    for x in range(WIDTH):
+        for y in range(HEIGHT):
+            if x == 7 and 2 <= y <= 6:
+                sprite_list.append(Wall(x, y))
+            else:
+                sprite_list.append(Floor(x, y))
+    return sprite_list, LevelGrid.from_sprites(sprite_list, [])
+
+
+def test_incremental_matches_full(mocker):
+    sprite_list, grid = make_level()
+    full_list, full_grid = make_level()
+
+    visible = recalculate_fov(3, 4, 5, [sprite_list], previous_visible=None, grid=grid)
+    recalculate_fov(3, 4, 5, [full_list], previous_visible=None, grid=full_grid)
+
+    spy = mocker.spy(fov_module, "set_visibility")
+    entered = []
+    moved = recalculate_fov(
+        5, 4, 5, [sprite_list], previous_visible=visible, grid=grid, on_enter=entered.append
+    )
+
+    # Only sprites in cells coming into or going out of view are touched
+    changed = {cell for cell in visible ^ moved if grid.in_bounds(*cell)}
+    assert changed
+    touched = {(call.args[0].x, call.args[0].y) for call in spy.call_args_list}
+    assert touched == changed
+    assert entered == [moved - visible]
+    for call in spy.call_args_list:
+        sprite, is_visible = call.args
+        assert is_visible == ((sprite.x, sprite.y) in moved)
+
+    # Same result as starting from scratch at the new location
+    recalculate_fov(5, 4, 5, [full_list], previous_visible=None, grid=full_grid)
+    assert grid.flags == full_grid.flags
+    for sprite, full_sprite in zip(sprite_list, full_list):
+        assert sprite.is_visible == full_sprite.is_visible == ((sprite.x, sprite.y) in moved)
+        assert sprite.color == full_sprite.color
+    # Cells that went out of view stay explored
+    left = {cell for cell in visible - moved if grid.in_bounds(*cell)}
+    assert left
+    assert all(grid.is_explored(x, y) and not grid.is_visible(x, y) for x, y in left)
@@ -0,0 +1,57 @@
+import pytest
+
+from entities.entity import Entity
+from entities.fighter import Fighter, FighterStore
+from entities.restore_entity import restore_entity
+from entities.tile import Door, Floor, Tile, Wall
+from util import char_to_pixel
+
+
+def save(sprite):
+    """ Same wrapping as GameEngine.get_dict. """
+    return {sprite.__class__.__name__: sprite.get_dict()}
+
+
+@pytest.mark.parametrize("tile_class", [Wall, Floor, Door])
+def test_tile_round_trip(tile_class):
+    tile = tile_class(4, 7, texture_id=3)
+    tile.color = tile.visible_color
+    tile.is_visible = True
+
+    restored = restore_entity(save(tile))
+
+    assert type(restored) is tile_class
+    assert (restored.x, restored.y) == (4, 7)
+    assert restored.position == char_to_pixel(4, 7)
+    assert restored.texture_id == 3
+    assert restored.color == tile.color
+    assert restored.alpha == tile.alpha
+    assert restored.is_visible
+    assert (restored.blocks, restored.block_sight) == (tile.blocks, tile.block_sight)
+    assert restored.get_dict() == tile.get_dict()
+
+
+def test_restore_from_dict():
+    tile = Tile()
+    tile.restore_from_dict(Floor(2, 3, texture_id=5).get_dict())
+
+    assert (tile.x, tile.y) == (2, 3)
+    assert tile.texture_id == 5
+    assert not tile.is_visible
+
+
+def test_unknown_entity():
+    with pytest.raises(ValueError):
+        restore_entity({"Dragon": {}})
+
+
+def test_creature_fighter_goes_in_the_given_store():
+    store = FighterStore()
+    monster = Entity(3, 4, name="Orc", fighter=Fighter(hp=7, power=2))
+    monster.fighter.hp = 5
+
+    restored = restore_entity(save(monster), store)
+
+    assert restored.fighter in store
+    assert (restored.fighter.hp, restored.fighter.max_hp, restored.fighter.power) == (5, 7, 2)
+    assert restore_entity(save(monster)).fighter not in store
@@ -0,0 +1,176 @@
+import pytest
+
+from constants import CORRIDOR_REGION_SIZE
+from entities.astar import astar
+from level_grid import LevelGrid
+from load_map.room_graph import RoomGraph
+
+
+@pytest.fixture
+def level():
+    """
+    Two rooms joined by a corridor that bends:
+
+        AAA.....
+        AAA.....
+        AAA-----
+        ......|.
+        .....BBB
+        .....BBB
+    """
+    rooms = {}
+    for x in range(3):
+        for y in range(3, 6):
+            rooms[(x, y)] = 1
+    for x in range(5, 8):
+        for y in range(0, 2):
+            rooms[(x, y)] = 2
+    corridor = {(x, 3) for x in range(3, 8)} | {(6, 2)}
+    walkable = set(rooms) | corridor
+
+    graph = RoomGraph()
+    graph.build(walkable, rooms)
+
+    grid = LevelGrid(8, 6)
+    for x in range(8):
+        for y in range(6):
+            if (x, y) in walkable:
+                grid.set_flag(x, y, LevelGrid.WALKABLE)
+            else:
+                grid.set_flag(x, y, LevelGrid.BLOCKS)
+    return graph, grid
+
+
+def test_regions(level):
+    graph, _ = level
+
+    assert graph.region_at(0, 3) == 1
+    assert graph.region_at(7, 0) == 2
+    assert graph.region_at(4, 3) < 0
+    assert graph.region_at(6, 2) == graph.region_at(4, 3)
+    assert graph.region_at(0, 0) is None
+
+
+def test_plan_in_same_region(level):
+    graph, _ = level
+
+    assert graph.plan((0, 3), (2, 5)) == [(2, 5)]
+
+
+def test_plan_across_regions(level):
+    graph, _ = level
+
+    waypoints = graph.plan((0, 5), (7, 0))
+
+    assert waypoints[-1] == (7, 0)
+    regions = [graph.region_at(*cell) for cell in waypoints]
+    assert regions[0] == 1
+    assert graph.region_at(4, 3) in regions
+    assert regions[-1] == 2
+
+
+def test_find_path(level):
+    graph, grid = level
+
+    path = graph.find_path(grid, (0, 5), (7, 0))
+
+    assert path[0] == (0, 5)
+    assert path[-1] == (7, 0)
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+        assert max(abs(x1 - x2), abs(y1 - y2)) == 1
+        assert not grid.is_blocked(x2, y2)
+
+
+def test_find_path_first_leg_only(level):
+    graph, grid = level
+
+    path = graph.find_path(grid, (0, 5), (7, 0), legs=1)
+
+    assert path[0] == (0, 5)
+    assert graph.region_at(*path[-1]) == 1
+
+
+def test_no_path_off_the_map(level):
+    graph, grid = level
+
+    assert graph.find_path(grid, (0, 5), (0, 0)) is None
+
+
+@pytest.fixture
+def winding_level():
+    """
+    Two rooms joined by a long winding corridor over the top, and a shorter
+    one that goes further out of the way in a straight line.
+    """
+    rows = [
+        "...###.###.....",
+        "...#.#.#.#.#...",
+        "...#.#.#.#.#...",
+        "...#.#.#.#.#...",
+        "...#.#.#.#.#...",
+        "...#.#.#.#.#...",
+        "...#.#.#.#.#...",
+        "...#.#.#.#.#...",
+        "...#.###.###...",
+        "AAA#.......#BBB",
+        "AAA.........BBB",
+        "AAA.........BBB",
+        ".#...........#.",
+        ".#...........#.",
+        ".#...........#.",
+        ".#...........#.",
+        ".#...........#.",
+        ".#############.",
+    ]
+    rooms = {}
+    walkable = set()
+    for y, row in enumerate(rows):
+        for x, char in enumerate(row):
+            if char != ".":
+                walkable.add((x, y))
+            if char == "A":
+                rooms[(x, y)] = 1
+            elif char == "B":
+                rooms[(x, y)] = 2
+
+    graph = RoomGraph()
+    graph.build(walkable, rooms)
+
+    grid = LevelGrid(len(rows[0]), len(rows))
+    for x in range(grid.width):
+        for y in range(grid.height):
+            grid.set_flag(x, y, LevelGrid.WALKABLE if (x, y) in walkable else LevelGrid.BLOCKS)
+    return graph, grid
+
+
+def test_corridor_regions_are_bounded(winding_level):
+    graph, _ = winding_level
+
+    sizes = {}
+    for region in graph.regions.values():
+        sizes[region] = sizes.get(region, 0) + 1
+
+    assert all(size <= CORRIDOR_REGION_SIZE for region, size in sizes.items() if region < 0)
+    assert graph.region_at(3, 9) != graph.region_at(11, 9)
+
+
+def test_plan_uses_walking_distance(winding_level):
+    graph, grid = winding_level
+
+    waypoints = graph.plan((1, 10), (13, 10))
+
+    assert graph.region_at(7, 17) in [graph.region_at(*cell) for cell in waypoints]
+    path = graph.find_path(grid, (1, 10), (13, 10))
+    assert len(path) == len(astar(grid, (1, 10), (13, 10), max_nodes=10 ** 6))
+
+
+def test_entrance_for_each_stretch_of_boundary():
+    # A room whose two ends both open onto the same corridor
+    rooms = {(x, y): 1 for x in range(3) for y in range(5)}
+    corridor = {(3, 0), (3, 4)} | {(4, y) for y in range(5)}
+    graph = RoomGraph()
+    graph.build(set(rooms) | corridor, rooms)
+
+    outsides = sorted(outside for _, outside in graph.entrances[1])
+
+    assert outsides == [(3, 0), (3, 4)]
@@ -0,0 +1,19 @@
+from actions import Message
+from scheduler import ActionScheduler
+
+
+def test_pop_due_in_time_order():
+    scheduler = ActionScheduler()
+    late = Message("late")
+    first = Message("first")
+    second = Message("second")
+    scheduler.schedule(2.0, late)
+    scheduler.schedule(0.5, first)
+    scheduler.schedule(0.5, second)
+
+    assert scheduler.next_due() == 0.5
+    assert scheduler.pop_due(0.4) == []
+    assert scheduler.pop_due(0.5) == [first, second]
+    assert len(scheduler) == 1
+    assert scheduler.pop_due(10.0) == [late]
+    assert len(scheduler) == 0
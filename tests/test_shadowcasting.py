@@ -0,0 +1,35 @@
+from shadowcasting import compute_fov
+
+
+def make_is_opaque(walls):
+    return lambda x, y: (x, y) in walls
+
+
+def test_open_floor_is_visible_within_radius():
+    visible = compute_fov(0, 0, 3, make_is_opaque(set()))
+
+    assert (0, 0) in visible
+    assert (3, 0) in visible
+    assert (0, -3) in visible
+    assert (2, 2) in visible
+    assert (4, 0) not in visible
+    assert (3, 3) not in visible
+
+
+def test_wall_is_visible_but_hides_what_is_behind_it():
+    visible = compute_fov(0, 0, 5, make_is_opaque({(2, 0)}))
+
+    assert (1, 0) in visible
+    assert (2, 0) in visible
+    assert (3, 0) not in visible
+    assert (4, 0) not in visible
+
+
+def test_visibility_is_symmetric():
+    walls = {(1, 1), (2, -1), (-2, 2), (3, 0), (0, 3), (-1, -2)}
+    is_opaque = make_is_opaque(walls)
+
+    visible = compute_fov(0, 0, 6, is_opaque)
+
+    for x, y in visible - walls:
+        assert (0, 0) in compute_fov(x, y, 6, is_opaque)
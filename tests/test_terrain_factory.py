@@ -0,0 +1,29 @@
+from chunked_sprite_list import ChunkedSpriteList
+from dungeon_map_to_sprites import TerrainFactory, dungeon_map_to_sprites
+from level_grid import LevelGrid
+
+
+def test_grid_matches_sprites(make_dungeon_map):
+    dungeon_map = make_dungeon_map()
+
+    from_sprites = LevelGrid.from_sprites(dungeon_map_to_sprites(dungeon_map), [])
+    from_map = TerrainFactory(dungeon_map).make_grid()
+
+    assert (from_map.width, from_map.height) == (from_sprites.width, from_sprites.height)
+    assert from_map.flags == from_sprites.flags
+    assert from_map.terrain == from_sprites.terrain
+
+
+def test_make_visible_sprites(make_dungeon_map):
+    dungeon_map = make_dungeon_map()
+    factory = TerrainFactory(dungeon_map)
+    sprite_list = ChunkedSpriteList()
+
+    factory.make_visible_sprites({(1, 1), (2, 1), (50, 50)}, sprite_list)
+    factory.make_visible_sprites({(1, 1)}, sprite_list)
+
+    assert sorted((sprite.x, sprite.y) for sprite in sprite_list) == [(1, 1), (2, 1)]
+
+    factory.make_all_sprites(sprite_list)
+
+    assert len(sprite_list) == dungeon_map.map_width * dungeon_map.map_height